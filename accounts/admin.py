@@ -4,7 +4,9 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
 from accounts.models.custom_user import CustomUser
+from accounts.models.email_outbox import EmailOutbox
 from accounts.models.user_token import UserToken
+from accounts.utils.user_agent import token_device
 
 
 @admin.register(CustomUser)
@@ -54,7 +56,24 @@ class CustomUserAdmin(UserAdmin):
 class UserTokenAdmin(admin.ModelAdmin):
     """User token admin."""
 
-    list_display = ("user", "device_type", "is_valid", "created_at", "expires_at")
-    list_filter = ("is_valid", "device_type")
-    search_fields = ("user__email", "device_type")
-    readonly_fields = ("created_at", "last_used_at")
+    list_display = ("user", "device", "is_valid", "created_at", "expires_at")
+    list_select_related = ("user", "device")
+    list_filter = ("is_valid", "device__device_type")
+    search_fields = ("user__email", "device__device_type")
+    readonly_fields = ("token_digest", "user_agent", "created_at", "last_used_at")
+
+    @admin.display(description="device")
+    def device(self, obj: UserToken) -> str:
+        """Device, OS and browser, parsed now if stored lazily."""
+        device = token_device(obj)
+        return f"{device.device_type} / {device.device_os} / {device.device_browser}"
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    """Email outbox admin."""
+
+    list_display = ("recipient", "subject", "status", "attempts", "next_attempt_at")
+    list_filter = ("status",)
+    search_fields = ("recipient", "message_id")
+    readonly_fields = ("message_id", "created_at", "sent_at")
@@ -19,6 +19,7 @@ from rest_framework.request import Request
 from accounts.models.mfa_verification import MFAVerification
 from accounts.models.user_mfa import UserMFA
 from accounts.serializers.user_mfa import UserMFASerializer
+from accounts.utils.backup_codes import generate_backup_codes
 from accounts.utils.email import generate_verification_code
 from utils.custom_response import CustomResponse
 from utils.custom_response import ResponseConfig
@@ -82,11 +83,13 @@ def post_mfa_config(request: Request) -> CustomResponse:
 
     # Configurar según el método
     if method.name == "otp":
+        # Los códigos de respaldo solo se muestran al generarlos
+        backup_codes = []
         if not mfa_config.otp_secret:
             # Generar nuevo secreto OTP si no existe
             mfa_config.otp_secret = pyotp_random_base32()
             # Generar códigos de respaldo
-            mfa_config.backup_codes = [pyotp_random_base32()[:8] for _ in range(5)]
+            backup_codes = generate_backup_codes(request.user)
 
         totp = TOTP(mfa_config.otp_secret)
         provisioning_uri = totp.provisioning_uri(request.user.email, issuer_name="app")
@@ -116,7 +119,7 @@ def post_mfa_config(request: Request) -> CustomResponse:
             "secret": mfa_config.otp_secret,
             "provisioning_uri": provisioning_uri,
             "qr_code": f"data:image/png;base64,{qr_base64}",
-            "backup_codes": mfa_config.backup_codes,
+            "backup_codes": backup_codes,
         }
     else:  # email
         # Generar y enviar código de verificación
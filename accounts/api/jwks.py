@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from django.conf import settings
+from rest_framework.decorators import api_view
+from rest_framework.decorators import authentication_classes
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from accounts.utils.jwt_keys import get_key_ring
+
+
+@api_view(["GET"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def get(request: Request) -> Response:
+    """Publish the public signing keys as a JWK set.
+
+    The body follows RFC 7517 instead of the CustomResponse envelope so that
+    standard JWT libraries can consume it directly.
+    """
+    return Response(
+        get_key_ring().jwks(),
+        headers={
+            "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}",
+        },
+    )
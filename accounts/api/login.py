@@ -6,17 +6,20 @@ from typing import Any
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 from rest_framework.decorators import api_view
 from rest_framework.decorators import permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 
+from accounts.auth.password_bulkhead import HashingBulkheadFullError
 from accounts.models.custom_user import CustomUser
 from accounts.models.mfa_verification import MFAVerification
 from accounts.models.user_mfa import UserMFA
 from accounts.serializers.login import Login as LoginSerializer
 from accounts.serializers.user import User as UserSerializer
+from accounts.utils.email import deliver_verification_code
 from accounts.utils.email import generate_verification_code
 from accounts.utils.email import send_verification_email
 from accounts.utils.generate_token_for_user import generate_token_for_user
@@ -50,10 +53,17 @@ def authenticate_user(
     password: str,
 ) -> Result[CustomUser]:
     """Authenticate user with provided credentials."""
-    user = authenticate(
-        username=email or username,
-        password=password,
-    )
+    try:
+        user = authenticate(
+            username=email or username,
+            password=password,
+        )
+    except HashingBulkheadFullError:
+        return Result.fail(
+            code="service_overloaded",
+            message="Service overloaded, please retry",
+            details={"error": "Service overloaded, please retry"},
+        )
     if not user:
         return Result.fail(
             code="invalid_credentials",
@@ -131,15 +141,8 @@ def create_mfa_verification(
             details={"error": str(e)},
         )
 
-    result_verification = send_verification_email(
-        user=user,
-        code_type="mfa",
-    )
-    if result_verification.is_error:
-        return Result.fail(
-            "error_sending_mfa_email",
-            "Error sending MFA email",
-        )
+    # El correo lleva el mismo código que valida verify_mfa
+    deliver_verification_code(user, code.value)
 
     verification_data = {}
     if settings.SEND_VERIFICATION_CODE_IN_RESPONSE:
@@ -228,13 +231,15 @@ def generate_final_token(
             "Error generating final token",
         )
 
-    return Result.ok(
-        {
-            "user": UserSerializer(user).data,
-            "token": result_token.value["token"],
-            "requires_verification": False,
-        }
-    )
+    response_data = {
+        "user": UserSerializer(user).data,
+        "token": result_token.value["token"],
+        "requires_verification": False,
+    }
+    if "refresh_token" in result_token.value:
+        response_data["refresh_token"] = result_token.value["refresh_token"]
+
+    return Result.ok(response_data)
 
 
 def create_response_from_result(
@@ -294,18 +299,32 @@ def post(
                 message=result_auth_error.message,
                 errors=result_auth_error.details,
                 code=result_auth_error.code,
-                status=401,
+                status=(503 if result_auth_error.code == "service_overloaded" else 401),
             )
         )
 
+    # Todas las escrituras del login se confirman juntas, o ninguna
+    with transaction.atomic():
+        return complete_login(result_auth.value, request)
+
+
+def complete_login(
+    user: CustomUser,
+    request: Request,
+) -> CustomResponse:
+    """Issue the tokens and codes for an authenticated user.
+
+    Runs inside the login transaction, which is rolled back when a step
+    fails. Emails are only sent once it commits.
+    """
     # Handle unverified user
-    user = result_auth.value
     if not user.is_verified:
         result_unverified = handle_unverified_user(
             user=user,
             request=request,
         )
         if result_unverified.is_error:
+            transaction.set_rollback(True)
             result_unverified_error = result_unverified.error
             return CustomResponse(
                 ResponseConfig(
@@ -331,6 +350,7 @@ def post(
         request=request,
     )
     if result_mfa.is_error:
+        transaction.set_rollback(True)
         result_mfa_error = result_mfa.error
         return CustomResponse(
             ResponseConfig(
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from django.utils import timezone
 from rest_framework.decorators import api_view
 from rest_framework.decorators import permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 
+from accounts.auth.invalidation_bus import invalidation_bus
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.revocation_filter import revocation_key
+from accounts.auth.token_cache import CachedToken
+from accounts.auth.token_cache import token_cache
 from accounts.models.user_token import UserToken
+from accounts.utils.hash_token import hash_token
 from utils.custom_response import CustomResponse
 from utils.custom_response import ResponseConfig
 from utils.decorators.log_api import log_api
@@ -40,12 +47,32 @@ def post(
             ),
         )
 
-    UserToken.objects.filter(
-        user=request.user,
-        token=request.auth,
-        is_valid=True,
-    ).update(
-        is_valid=False,
+    if request.token_payload.get("token_type") == "access":
+        # Revoke the refresh tokens of the session
+        UserToken.objects.filter(
+            user=request.user,
+            family=request.token_payload["sid"],
+            is_valid=True,
+        ).update(
+            is_valid=False,
+        )
+    else:
+        UserToken.objects.filter(
+            user=request.user,
+            token_digest=hash_token(request.auth),
+            is_valid=True,
+        ).update(
+            is_valid=False,
+        )
+
+    # Let every worker of the node reject the token right away
+    digest = hash_token(request.auth)
+    revocation_filter.revoke(revocation_key(request.token_payload, digest))
+    invalidation_bus.publish("token", digest)
+    token_cache.set(
+        digest,
+        CachedToken(is_valid=False),
+        expires_in=request.token_payload["exp"] - timezone.now().timestamp(),
     )
 
     return CustomResponse(
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from rest_framework.decorators import api_view
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+
+from accounts.auth.token_cache import token_cache
+from accounts.utils.user_agent import user_agent_cache
+from utils.custom_response import CustomResponse
+from utils.custom_response import ResponseConfig
+from utils.metrics import metrics
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get(request: Request) -> CustomResponse:
+    """Return the metrics of the worker serving the request."""
+    return CustomResponse(
+        ResponseConfig(
+            data={
+                "token_cache": token_cache.stats(),
+                "user_agent_cache": user_agent_cache.stats(),
+                **metrics.snapshot(),
+            },
+        ),
+    )
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import transaction
+from jwt import InvalidTokenError as jwt_InvalidTokenError
+from rest_framework.decorators import api_view
+from rest_framework.decorators import authentication_classes
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.revocation_filter import session_key
+from accounts.models.user_token import UserToken
+from accounts.serializers.refresh_token import RefreshToken as RefreshTokenSerializer
+from accounts.utils.generate_token_for_user import generate_token_for_user
+from accounts.utils.hash_token import hash_token
+from accounts.utils.jwt_tokens import decode_token
+from utils.custom_response import CustomResponse
+from utils.custom_response import ResponseConfig
+from utils.decorators.log_api import log_api
+from utils.logger import logger
+from utils.result_as_values import Result
+from utils.result_as_values import handle_result
+
+
+@handle_result
+def rotate_refresh_token(
+    refresh_token: str,
+    request: Request,
+) -> Result[dict[str, Any]]:
+    """Exchange a refresh token for a new access and refresh token pair.
+
+    Every refresh token can be used once. Presenting one that was already
+    rotated means it leaked, so the whole session is revoked.
+    """
+    try:
+        payload = decode_token(refresh_token)
+    except jwt_InvalidTokenError:
+        return Result.fail(
+            code="invalid_refresh_token",
+            message="Invalid refresh token",
+        )
+
+    if payload.get("token_type") != "refresh":
+        return Result.fail(
+            code="invalid_refresh_token",
+            message="Invalid refresh token",
+        )
+
+    with transaction.atomic():
+        user_token = (
+            UserToken.objects.select_for_update()
+            .select_related("user")
+            .filter(token_digest=hash_token(refresh_token))
+            .first()
+        )
+        if user_token is None:
+            return Result.fail(
+                code="invalid_refresh_token",
+                message="Invalid refresh token",
+            )
+
+        if not user_token.is_valid:
+            UserToken.objects.filter(
+                family=user_token.family,
+                is_valid=True,
+            ).update(is_valid=False)
+            revocation_filter.revoke(session_key(user_token.family))
+            logger.warning(
+                "Refresh token reuse detected",
+                extra={
+                    "user_id": user_token.user_id,
+                    "family": user_token.family,
+                },
+            )
+            return Result.fail(
+                code="refresh_token_reused",
+                message="Refresh token already used",
+            )
+
+        user_token.is_valid = False
+        user_token.save(update_fields=["is_valid"])
+
+        result_token = generate_token_for_user(
+            user=user_token.user,
+            request=request,
+            family=user_token.family,
+        )
+
+    return Result.ok(
+        {
+            "token": result_token.value["token"],
+            "refresh_token": result_token.value["refresh_token"],
+        }
+    )
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@log_api
+def post(
+    request: Request,
+) -> CustomResponse:
+    """Refresh the access token."""
+    serializer = RefreshTokenSerializer(data=request.data)
+    if not serializer.is_valid():
+        return CustomResponse(
+            ResponseConfig(
+                errors=serializer.errors.__dict__,
+                status=400,
+            ),
+        )
+
+    result_rotate = rotate_refresh_token(
+        serializer.validated_data["refresh_token"],
+        request,
+    )
+    if result_rotate.is_error:
+        result_rotate_error = result_rotate.error
+        return CustomResponse(
+            ResponseConfig(
+                message=result_rotate_error.message,
+                code=result_rotate_error.code,
+                status=401,
+            ),
+        )
+
+    return CustomResponse(
+        ResponseConfig(
+            message="Token refreshed",
+            data=result_rotate.value,
+        ),
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from rest_framework.decorators import api_view
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+
+from accounts.models.user_mfa import UserMFA
+from accounts.utils.backup_codes import generate_backup_codes
+from utils.custom_response import CustomResponse
+from utils.custom_response import ResponseConfig
+from utils.decorators.log_api import log_api
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@log_api
+def post(
+    request: Request,
+) -> CustomResponse:
+    """Replace the user's MFA backup codes with a new set."""
+    if request.token_payload.get("is_temporary", False):
+        return CustomResponse(
+            ResponseConfig(
+                errors={"error": "Invalid token type"},
+                status=400,
+                code="invalid_token",
+            ),
+        )
+
+    if not UserMFA.objects.filter(
+        user=request.user,
+        otp_secret__isnull=False,
+    ).exists():
+        return CustomResponse(
+            ResponseConfig(
+                errors={"error": "OTP not configured"},
+                status=400,
+                code="otp_not_configured",
+            ),
+        )
+
+    # Los anteriores dejan de servir; los nuevos solo se muestran ahora
+    backup_codes = generate_backup_codes(request.user)
+
+    return CustomResponse(
+        ResponseConfig(
+            data={"backup_codes": backup_codes},
+            message="Backup codes regenerated",
+        ),
+    )
@@ -6,6 +6,7 @@ from rest_framework.decorators import permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 
+from accounts.auth.password_bulkhead import HashingBulkheadFullError
 from accounts.serializers.user import User as UserSerializer
 from accounts.utils.email import send_verification_email
 from accounts.utils.generate_token_for_user import generate_token_for_user
@@ -30,7 +31,16 @@ def post(
             ),
         )
 
-    user = serializer.save()
+    try:
+        user = serializer.save()
+    except HashingBulkheadFullError:
+        return CustomResponse(
+            ResponseConfig(
+                message="Service overloaded, please retry",
+                code="service_overloaded",
+                status=503,
+            ),
+        )
 
     result_generate_token_for_user = generate_token_for_user(
         user=user,
@@ -6,8 +6,7 @@ from rest_framework.decorators import permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 
-from accounts.models.verification_code import VerificationCode
-from accounts.utils.email import send_verification_email
+from accounts.utils.email import resend_verification_email
 from utils.custom_response import CustomResponse
 from utils.custom_response import ResponseConfig
 from utils.decorators.log_api import log_api
@@ -29,32 +28,32 @@ def post(
             ),
         )
 
-    # Verificar el tipo de código requerido
-    code_type = (
-        VerificationCode.objects.filter(user=request.user, is_used=False)
-        .order_by("-created_at")
-        .first()
-    )
+    # Reutiliza el código pendiente si se envió hace poco
+    result_resend_verification_email = resend_verification_email(request.user)
 
-    if not code_type:
+    if result_resend_verification_email.is_error:
         return CustomResponse(
             ResponseConfig(
-                errors={"error": "No pending verification found"},
+                errors={"error": result_resend_verification_email.error.message},
                 status=400,
             ),
         )
 
-    # Generar y enviar nuevo código
-    result_send_verification_email = send_verification_email(
-        request.user,
-        code_type.type,
-    )
-
-    data_verify_email = result_send_verification_email.value
+    data_resend = result_resend_verification_email.value
+    data_verify_email = {
+        "code": data_resend["code"],
+        "expires_at": data_resend["expires_at"],
+    }
 
     response_data = {
         "verification": None,
-        "message": "New verification code sent successfully",
+        "resent": data_resend["resent"],
+        "next_resend_at": data_resend["next_resend_at"],
+        "message": (
+            "New verification code sent successfully"
+            if data_resend["resent"]
+            else "Verification code already sent, try again later"
+        ),
     }
 
     # Solo incluir el código en entorno local
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from rest_framework.decorators import api_view
+from rest_framework.decorators import permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+
+from accounts.auth.token_introspection import introspect_tokens
+from accounts.serializers.token_introspection import (
+    TokenIntrospection as TokenIntrospectionSerializer,
+)
+from utils.custom_response import CustomResponse
+from utils.custom_response import ResponseConfig
+from utils.decorators.log_api import log_api
+
+
+@api_view(["POST"])
+@permission_classes([IsAdminUser])
+@log_api
+def post(
+    request: Request,
+) -> CustomResponse:
+    """Introspect a batch of tokens for trusted services."""
+    serializer = TokenIntrospectionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return CustomResponse(
+            ResponseConfig(
+                errors=serializer.errors,
+                status=400,
+            ),
+        )
+
+    return CustomResponse(
+        ResponseConfig(
+            data={
+                "results": introspect_tokens(serializer.validated_data["tokens"]),
+            },
+        ),
+    )
@@ -6,13 +6,18 @@ from rest_framework.decorators import permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 
+from accounts.auth.invalidation_bus import invalidation_bus
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.revocation_filter import token_key
 from accounts.models.user_token import UserToken
 from accounts.models.verification_code import VerificationCode
 from accounts.serializers.user import User as UserSerializer
 from accounts.serializers.verification_code import (
     VerificationCode as VerificationCodeSerializer,
 )
+from accounts.utils.consume_once import consume_once
 from accounts.utils.generate_token_for_user import generate_token_for_user
+from accounts.utils.hash_token import hash_token
 from utils.custom_response import CustomResponse
 from utils.custom_response import ResponseConfig
 from utils.decorators.log_api import log_api
@@ -53,15 +58,14 @@ def post(
     code = request.data.get("code")
 
     user = request.user
-    verification = (
+    # Marca el código como usado en la misma consulta que lo busca
+    verification = consume_once(
         VerificationCode.objects.filter(
             user=user,
             code=code,
-            is_used=False,
             expires_at__gt=timezone.now(),
-        )
-        .order_by("-created_at")
-        .first()
+        ).order_by("-created_at"),
+        "is_used",
     )
 
     if not verification:
@@ -73,10 +77,6 @@ def post(
             ),
         )
 
-    # Mark code as used
-    verification.is_used = True
-    verification.save()
-
     # Handle registration verification
     if verification.type == "registration":
         user.is_verified = True
@@ -99,9 +99,14 @@ def post(
         )
 
     # Invalidate temporary token
-    UserToken.objects.filter(user=user, token=request.auth, is_valid=True).update(
-        is_valid=False
-    )
+    digest = hash_token(request.auth)
+    UserToken.objects.filter(
+        user=user,
+        token_digest=digest,
+        is_valid=True,
+    ).update(is_valid=False)
+    revocation_filter.revoke(token_key(digest))
+    invalidation_bus.publish("token", digest)
 
     if not user.is_verified:
         user.is_verified = True
@@ -112,12 +117,18 @@ def post(
 
     token = result_generate_token_for_user.value["token"]
 
+    response_data = {
+        "token": token,
+        "user": UserSerializer(user).data,
+    }
+    if "refresh_token" in result_generate_token_for_user.value:
+        response_data["refresh_token"] = result_generate_token_for_user.value[
+            "refresh_token"
+        ]
+
     return CustomResponse(
         ResponseConfig(
             message="Verification successful",
-            data={
-                "token": token,
-                "user": UserSerializer(user).data,
-            },
+            data=response_data,
         ),
     )
@@ -16,6 +16,8 @@ from accounts.models.user_mfa import UserMFA
 from accounts.serializers.mfa_verification import (
     MFAVerification as MFAVerificationSerializer,
 )
+from accounts.utils.backup_codes import consume_backup_code
+from accounts.utils.consume_once import consume_once
 from accounts.utils.generate_token_for_user import generate_token_for_user
 from utils.custom_response import CustomResponse
 from utils.custom_response import ResponseConfig
@@ -87,9 +89,15 @@ def post(
 
         token = result_generate_token_for_user.value["token"]
 
+        response_data = {"token": token}
+        if "refresh_token" in result_generate_token_for_user.value:
+            response_data["refresh_token"] = result_generate_token_for_user.value[
+                "refresh_token"
+            ]
+
         return CustomResponse(
             ResponseConfig(
-                data={"token": token},
+                data=response_data,
                 message="MFA verification successful",
             ),
         )
@@ -115,11 +123,9 @@ def _verify_otp(
     Returns:
         bool: True if verification succeeds, False otherwise
     """
-    backup_codes = mfa_config.backup_codes or []
-    if len(code) == TypeCodes.backup.value and code in backup_codes:
-        backup_codes.remove(code)
-        mfa_config.backup_codes = backup_codes
-        mfa_config.save()
+    if len(code) == TypeCodes.backup.value and consume_backup_code(
+        mfa_config.user, code
+    ):
         return True, None
 
     if len(code) == TypeCodes.otp.value and mfa_config.otp_secret:
@@ -145,18 +151,17 @@ def _verify_email(
         Union[Response, bool]: Either a Response object with an error,
         or True if verification succeeds
     """
-    verification = MFAVerification.objects.filter(
-        user=user,
-        method=method,
-        code=code,
-        is_verified=False,
-        expires_at__gt=timezone.now(),
-    ).first()
+    verification = consume_once(
+        MFAVerification.objects.filter(
+            user=user,
+            method=method,
+            code=code,
+            expires_at__gt=timezone.now(),
+        ),
+        "is_verified",
+        verified_at=timezone.now(),
+    )
 
     if not verification:
         return False, "Invalid or expired code"
-
-    verification.is_verified = True
-    verification.verified_at = timezone.now()
-    verification.save()
     return True, None
@@ -11,5 +11,4 @@ class AccountsConfig(AppConfig):
 
     def ready(self):
         """Override this to put in."""
-        # import accounts.signals
-        pass
+        from accounts import signals  # noqa: F401
@@ -2,10 +2,36 @@ from __future__ import annotations
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser
+from django.db.models import Case
 from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.utils.crypto import get_random_string
 from rest_framework.request import Request
 
+from accounts.auth.password_bulkhead import HashingBulkheadFullError
+from accounts.auth.password_bulkhead import password_bulkhead
+from utils.metrics import metrics
+
+# Hash de una contraseña aleatoria por algoritmo, rehecho si cambia el coste
+_dummy_password_hashes: dict[str, str] = {}
+
+
+def dummy_password_hash() -> str:
+    """Return a hash of a random password made with the preferred hasher.
+
+    Checking a password against it costs the same as checking a real one.
+    """
+    hasher = get_hasher()
+    encoded = _dummy_password_hashes.get(hasher.algorithm)
+    if encoded is None or hasher.must_update(encoded):
+        encoded = make_password(get_random_string(32), hasher=hasher)
+        _dummy_password_hashes[hasher.algorithm] = encoded
+    return encoded
+
 
 class EmailBackend(ModelBackend):
     """Custom authentication backend to allow login with email."""
@@ -17,15 +43,70 @@ class EmailBackend(ModelBackend):
         password: str | None = None,
         **kwargs: dict,
     ) -> AbstractUser | None:
-        """Authenticate user by email or username."""
-        user_model = get_user_model()
-        try:
-            user = user_model.objects.get(Q(username=username) | Q(email=username))
-            if not password:
-                return None
-
-            if not user.check_password(password):
-                return None
-            return user
-        except user_model.DoesNotExist:
+        """Authenticate user by email or username.
+
+        The user is resolved with one indexed, case-insensitive lookup and
+        exactly one password hash is checked per attempt, also for unknown
+        users, so both cases take the same time.
+        """
+        if not username or not password:
+            return None
+
+        user = self.get_user_by_identifier(username)
+        if user is None:
+            password_bulkhead.check_password(
+                password,
+                dummy_password_hash(),
+            )
             return None
+
+        # El hash se calcula en el pool acotado, fuera del hilo de la petición
+        is_correct, must_update = password_bulkhead.check_password(
+            password,
+            user.password,
+        )
+        if not is_correct:
+            return None
+        if must_update:
+            self.upgrade_password(user, password)
+        return user
+
+    def upgrade_password(self, user: AbstractUser, password: str) -> None:
+        """Rehash a verified password with the preferred hasher.
+
+        Best effort: with the hashing pool full the login goes ahead and the
+        hash is upgraded on a later login.
+        """
+        try:
+            user.password = password_bulkhead.make_password(password)
+        except HashingBulkheadFullError:
+            metrics.increment("password_hashing.rehash_skipped")
+            return
+        user.save(update_fields=["password"])
+
+    def get_user_by_identifier(self, identifier: str) -> AbstractUser | None:
+        """Return the user whose email or username matches, ignoring case.
+
+        Identifiers without "@" can only be usernames. An exact match wins
+        over users that only differ in case. The MFA configuration is loaded
+        in the same query.
+        """
+        user_model = get_user_model()
+        lookup = Q(username__iexact=identifier)
+        if "@" in identifier:
+            lookup |= Q(email__iexact=identifier)
+
+        return (
+            user_model.objects.filter(lookup)
+            # El login consulta la configuración MFA justo después
+            .select_related("mfa_config__default_method")
+            .order_by(
+                Case(
+                    When(email=identifier, then=Value(0)),
+                    When(username=identifier, then=Value(0)),
+                    default=Value(1),
+                ),
+                "pk",
+            )
+            .first()
+        )
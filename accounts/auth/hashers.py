@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.hashers import ScryptPasswordHasher
+
+
+class CalibratedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count from settings."""
+
+    @property
+    def iterations(self) -> int:
+        """Iterations for new hashes."""
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class CalibratedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with the work factor from settings."""
+
+    # Límite de OpenSSL, no una reserva: el valor por defecto (32 MiB) no
+    # alcanza para verificar hashes hechos con un work factor mayor
+    maxmem = 1024 * 1024 * 1024
+
+    @property
+    def work_factor(self) -> int:
+        """CPU/memory cost ``N`` for new hashes, a power of two."""
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self) -> int:
+        """Block size ``r`` for new hashes."""
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self) -> int:
+        """Parallelism ``p`` for new hashes."""
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+
+class CalibratedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with the cost from settings.
+
+    Optional: needs the ``argon2-cffi`` package, which is only imported when
+    a hash is made or checked.
+    """
+
+    @property
+    def time_cost(self) -> int:
+        """Number of passes for new hashes."""
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        """Memory in KiB for new hashes."""
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        """Lanes for new hashes."""
+        return settings.PASSWORD_ARGON2_PARALLELISM
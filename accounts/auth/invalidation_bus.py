@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from json import dumps as json_dumps
+from json import loads as json_loads
+from re import fullmatch as re_fullmatch
+from select import select as select_select
+from threading import Event
+from threading import Lock
+from threading import Thread
+from time import perf_counter
+from time import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.dispatch import receiver
+from psycopg2 import Error as psycopg2_Error
+
+from utils.logger import logger
+from utils.metrics import metrics
+
+# NOTIFY rechaza payloads de 8000 bytes o más
+MAX_PAYLOAD_SIZE = 7900
+
+Handler = Callable[[str], None]
+
+
+class LocalTransport:
+    """In-memory transport that loops messages back inside the process.
+
+    Every bus listening on the same instance receives what any of them sends,
+    which lets tests stand in for several workers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the transport without listeners."""
+        self._listeners: dict[str, list[Handler]] = {}
+        self._lock = Lock()
+
+    def send(self, channel: str, message: str) -> None:
+        """Deliver the message to every listener of the channel."""
+        with self._lock:
+            listeners = list(self._listeners.get(channel, ()))
+        for listener in listeners:
+            listener(message)
+
+    def listen(
+        self,
+        channel: str,
+        callback: Handler,
+        on_connect: Callable[[], None],
+    ) -> None:
+        """Register the callback for the channel."""
+        with self._lock:
+            self._listeners.setdefault(channel, []).append(callback)
+        on_connect()
+
+    def stop(self) -> None:
+        """Drop every listener."""
+        with self._lock:
+            self._listeners.clear()
+
+
+class PostgresTransport:
+    """Transport over PostgreSQL LISTEN/NOTIFY.
+
+    Messages are sent with ``pg_notify`` on the connection of the current
+    request, so they are delivered when its transaction commits. Each process
+    listens on a dedicated autocommit connection owned by a daemon thread.
+    """
+
+    def __init__(
+        self,
+        using: str = "default",
+        poll_timeout: float = 5.0,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        """Initialize the transport for the given database alias."""
+        self.using = using
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def send(self, channel: str, message: str) -> None:
+        """Queue a notification on the channel."""
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [channel, message])
+
+    def listen(
+        self,
+        channel: str,
+        callback: Handler,
+        on_connect: Callable[[], None],
+    ) -> None:
+        """Start the listener thread for the channel."""
+        if not re_fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"Invalid channel name: {channel}")
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run,
+            args=(channel, callback, on_connect),
+            name=f"invalidation-listener-{channel}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the listener thread to stop and wait for it."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(self.poll_timeout + 1)
+            self._thread = None
+
+    def _run(
+        self,
+        channel: str,
+        callback: Handler,
+        on_connect: Callable[[], None],
+    ) -> None:
+        """Listen on the channel, reconnecting until the transport stops."""
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                wrapper = connections[self.using]
+                connection = wrapper.get_new_connection(wrapper.get_connection_params())
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {channel}")
+                # Lo publicado mientras no escuchábamos se perdió
+                on_connect()
+
+                while not self._stopped.is_set():
+                    readable, _, _ = select_select(
+                        [connection], [], [], self.poll_timeout
+                    )
+                    if not readable:
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        callback(connection.notifies.pop(0).payload)
+            except (psycopg2_Error, OSError):
+                metrics.increment("invalidation_bus.listener_errors")
+                logger.error(
+                    "Invalidation listener disconnected",
+                    extra={"traceback": True},
+                )
+                self._stopped.wait(self.reconnect_delay)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+TRANSPORTS: dict[str, Callable[[], LocalTransport | PostgresTransport]] = {
+    "local": LocalTransport,
+    "postgres": PostgresTransport,
+}
+
+
+class InvalidationBus:
+    """Broadcast cache invalidations to every process.
+
+    Writers publish ``(kind, value)`` keys; every process evicts them through
+    the handlers registered for the kind. The publishing process applies them
+    right away and skips its own messages when they come back.
+    """
+
+    def __init__(
+        self,
+        transport: LocalTransport | PostgresTransport | None = None,
+        channel: str | None = None,
+    ) -> None:
+        """Initialize the bus, falling back to settings for each option."""
+        self._transport = transport
+        self._channel = channel
+        self._handlers: dict[str, list[Handler]] = {}
+        self._reset_handlers: list[Callable[[], None]] = []
+        self.origin = uuid4().hex
+
+    @property
+    def transport(self) -> LocalTransport | PostgresTransport:
+        """Transport carrying the messages between processes."""
+        if self._transport is None:
+            self._transport = TRANSPORTS[settings.AUTH_INVALIDATION_TRANSPORT]()
+        return self._transport
+
+    @property
+    def channel(self) -> str:
+        """Channel the messages are published on."""
+        if self._channel is not None:
+            return self._channel
+        return settings.AUTH_INVALIDATION_CHANNEL
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Call the handler with the value of every key of the given kind."""
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def register_reset(self, handler: Callable[[], None]) -> None:
+        """Call the handler when messages may have been missed."""
+        self._reset_handlers.append(handler)
+
+    def publish(self, kind: str, *values: object) -> None:
+        """Evict the keys locally and broadcast them to the other processes."""
+        values = [str(value) for value in values]
+        if not values:
+            return
+        self.dispatch(kind, values)
+
+        started = perf_counter()
+        for chunk in self._chunks(values):
+            self.transport.send(
+                self.channel,
+                json_dumps(
+                    {
+                        "origin": self.origin,
+                        "kind": kind,
+                        "values": chunk,
+                        "sent_at": time(),
+                    },
+                    separators=(",", ":"),
+                ),
+            )
+            metrics.increment("invalidation_bus.published")
+        metrics.observe("invalidation_bus.publish_seconds", perf_counter() - started)
+
+    def receive(self, message: str) -> None:
+        """Apply a message sent by another process."""
+        try:
+            data = json_loads(message)
+        except ValueError:
+            metrics.increment("invalidation_bus.malformed")
+            return
+        if data.get("origin") == self.origin:
+            return
+
+        metrics.increment("invalidation_bus.received")
+        metrics.observe(
+            "invalidation_bus.lag_seconds",
+            max(time() - data.get("sent_at", time()), 0.0),
+        )
+        self.dispatch(data.get("kind", ""), data.get("values", []))
+
+    def dispatch(self, kind: str, values: list[str]) -> None:
+        """Call the handlers of the kind with each value."""
+        for handler in self._handlers.get(kind, ()):
+            for value in values:
+                handler(value)
+
+    def reset(self) -> None:
+        """Drop every cached entry, used after (re)connecting the listener."""
+        for handler in self._reset_handlers:
+            handler()
+
+    def start(self) -> None:
+        """Start receiving messages from the other processes."""
+        self.transport.listen(self.channel, self.receive, self.reset)
+
+    def stop(self) -> None:
+        """Stop receiving messages."""
+        if self._transport is not None:
+            self._transport.stop()
+
+    def _chunks(self, values: list[str]) -> list[list[str]]:
+        """Split the values so every message fits in a notification."""
+        chunks: list[list[str]] = [[]]
+        size = 0
+        for value in values:
+            # Margen para las comillas, la coma y el resto del mensaje
+            value_size = len(value.encode()) + 3
+            if chunks[-1] and size + value_size > MAX_PAYLOAD_SIZE - 200:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(value)
+            size += value_size
+        return chunks
+
+
+invalidation_bus = InvalidationBus()
+
+
+@receiver(setting_changed)
+def reset_invalidation_transport(setting: str, **kwargs: dict) -> None:
+    """Pick the transport again when the settings change (tests)."""
+    if setting in {"AUTH_INVALIDATION_TRANSPORT", "AUTH_INVALIDATION_CHANNEL"}:
+        invalidation_bus.stop()
+        invalidation_bus._transport = None
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+from typing import Any
+
 from django.conf import settings
 from django.utils import timezone
 from jwt import ExpiredSignatureError as jwt_ExpiredSignatureError
 from jwt import InvalidTokenError as jwt_InvalidTokenError
-from jwt import decode as jwt_decode
 from rest_framework import authentication
 from rest_framework import exceptions
 from rest_framework.request import Request
 
+from accounts.auth.last_used_buffer import last_used_buffer
+from accounts.auth.revocation_filter import RevocationStatus
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.revocation_filter import revocation_key
+from accounts.auth.revocation_filter import session_key
+from accounts.auth.token_cache import USER_SNAPSHOT_FIELDS
+from accounts.auth.token_cache import CachedToken
+from accounts.auth.token_cache import snapshot_user
+from accounts.auth.token_cache import token_cache
 from accounts.models.custom_user import CustomUser
 from accounts.models.user_token import UserToken
+from accounts.utils.hash_token import hash_token
+from accounts.utils.jwt_tokens import decode_token
 
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -25,32 +37,147 @@ class JWTAuthentication(authentication.BaseAuthentication):
         if not auth_header.startswith("Bearer "):
             return None
 
-        try:
-            token = auth_header.split(" ")[1]
+        token = auth_header.split(" ")[1]
+        digest = hash_token(token)
 
-            # Decode token
-            payload = jwt_decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        # Reuse the verified token state if this worker has seen it recently
+        cached_token = token_cache.get(digest)
+        if cached_token is not None and cached_token.is_valid:
+            cached_token = self.check_revocation(cached_token, digest)
+        if cached_token is None:
+            cached_token = self.verify_token(token, digest)
 
-            # Verify token in database
-            token_obj = UserToken.objects.get(
-                token=token, is_valid=True, expires_at__gt=timezone.now()
-            )
+        if not cached_token.is_valid:
+            raise exceptions.AuthenticationFailed("Token not found")
+
+        # Add payload to request for later use
+        request.token_payload = cached_token.payload
 
-            # Add payload to request for later use
-            request.token_payload = payload
+        # Update last used (buffered, persisted in bulk)
+        now = timezone.now()
+        if cached_token.token_id is not None and last_used_buffer.touch(
+            cached_token.token_id,
+            cached_token.last_used_at,
+            now=now,
+        ):
+            cached_token.last_used_at = now
 
-            # Update last used
-            token_obj.last_used_at = timezone.now()
-            token_obj.save()
+        return cached_token.build_user(), token
 
-            return token_obj.user, token
+    def check_revocation(
+        self,
+        cached_token: CachedToken,
+        digest: str,
+    ) -> CachedToken | None:
+        """Check a cached token against revocations from every worker.
 
+        Returns:
+            CachedToken | None: The cached token if still valid, an invalid
+            verdict if revoked, or None if it has to be verified again
+        """
+        status = revocation_filter.check(revocation_key(cached_token.payload, digest))
+        if status is RevocationStatus.valid:
+            return cached_token
+
+        token_cache.invalidate(digest)
+        if status is RevocationStatus.revoked:
+            return CachedToken(is_valid=False)
+        return None
+
+    def verify_token(self, token: str, digest: str) -> CachedToken:
+        """Decode the token, check it in the database and cache the verdict."""
+        try:
+            # Decode token
+            payload = decode_token(token)
         except jwt_ExpiredSignatureError as err:
             raise exceptions.AuthenticationFailed("Token expired") from err
         except jwt_InvalidTokenError as err:
             raise exceptions.AuthenticationFailed("Invalid token") from err
-        except UserToken.DoesNotExist as err:
-            raise exceptions.AuthenticationFailed("Token not found") from err
+
+        token_type = payload.get("token_type")
+        if token_type == "refresh":
+            raise exceptions.AuthenticationFailed("Invalid token type")
+
+        if token_type == "access" and settings.JWT_STATELESS_ACCESS_TOKENS:
+            return self.verify_access_token(payload, digest)
+
+        try:
+            # Verify token and load its owner in a single joined query
+            now = timezone.now()
+            token_obj = (
+                UserToken.objects.select_related("user")
+                .only(
+                    "id",
+                    "expires_at",
+                    "last_used_at",
+                    "user",
+                    *(f"user__{name}" for name in USER_SNAPSHOT_FIELDS),
+                )
+                .get(
+                    token_digest=digest,
+                    is_valid=True,
+                    expires_at__gt=now,
+                )
+            )
+        except UserToken.DoesNotExist:
+            # Revoked tokens stay revoked, remember the verdict
+            token_cache.set(digest, CachedToken(is_valid=False))
+            return CachedToken(is_valid=False)
+
+        cached_token = CachedToken(
+            is_valid=True,
+            payload=payload,
+            token_id=token_obj.pk,
+            last_used_at=token_obj.last_used_at,
+            user_snapshot=snapshot_user(token_obj.user),
+        )
+        token_cache.set(
+            digest,
+            cached_token,
+            expires_in=(token_obj.expires_at - now).total_seconds(),
+        )
+        return cached_token
+
+    def verify_access_token(
+        self,
+        payload: dict[str, Any],
+        digest: str,
+    ) -> CachedToken:
+        """Trust an access token on its signature and expiry alone.
+
+        No database read happens: the user is built from the token claims and
+        any other column is loaded lazily on first access. Revoked sessions
+        are found in the shared revocation filter, the database is only read
+        when the filter cannot give an exact answer.
+        """
+        status = revocation_filter.check(session_key(payload["sid"]))
+        if status is RevocationStatus.unknown:
+            status = (
+                RevocationStatus.valid
+                if UserToken.objects.filter(
+                    family=payload["sid"],
+                    is_valid=True,
+                ).exists()
+                else RevocationStatus.revoked
+            )
+        if status is RevocationStatus.revoked:
+            return CachedToken(is_valid=False)
+
+        cached_token = CachedToken(
+            is_valid=True,
+            payload=payload,
+            user_snapshot={
+                "id": payload["user_id"],
+                "email": payload["email"],
+                "username": payload["username"],
+            },
+        )
+        token_cache.set(
+            digest,
+            cached_token,
+            expires_in=payload["exp"] - timezone.now().timestamp(),
+        )
+        return cached_token
 
     def authenticate_header(self, request: Request) -> str:
         """Return the authentication header."""
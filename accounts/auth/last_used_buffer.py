@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from atexit import register as atexit_register
+from datetime import datetime
+from datetime import timedelta
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.utils import timezone
+
+from accounts.models.user_token import UserToken
+from utils.logger import logger
+
+
+class LastUsedBuffer:
+    """Write-behind buffer for ``UserToken.last_used_at``.
+
+    Authenticated requests only record the timestamp in memory. Pending
+    timestamps are persisted with a single bulk UPDATE once the buffer holds
+    ``flush_size`` entries or ``flush_interval`` seconds have passed since the
+    previous flush, and whatever is left is flushed when the worker exits.
+    Timestamps newer than ``granularity`` seconds are not persisted again.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float | None = None,
+        flush_size: int | None = None,
+        granularity: float | None = None,
+    ):
+        """Initialize the buffer, falling back to settings for each option."""
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._granularity = granularity
+        self._pending: dict[int, datetime] = {}
+        self._lock = Lock()
+        self._last_flush = monotonic()
+
+    @property
+    def flush_interval(self) -> float:
+        """Seconds between flushes."""
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return settings.TOKEN_LAST_USED_FLUSH_INTERVAL
+
+    @property
+    def flush_size(self) -> int:
+        """Number of pending entries that forces a flush."""
+        if self._flush_size is not None:
+            return self._flush_size
+        return settings.TOKEN_LAST_USED_FLUSH_SIZE
+
+    @property
+    def granularity(self) -> timedelta:
+        """Minimum age of the stored timestamp before it is persisted again."""
+        if self._granularity is not None:
+            return timedelta(seconds=self._granularity)
+        return timedelta(seconds=settings.TOKEN_LAST_USED_GRANULARITY)
+
+    def __len__(self) -> int:
+        """Return the number of pending entries."""
+        return len(self._pending)
+
+    def touch(
+        self,
+        token_id: int,
+        last_used_at: datetime | None,
+        now: datetime | None = None,
+    ) -> bool:
+        """Record a use of the token.
+
+        Args:
+            token_id: Primary key of the UserToken
+            last_used_at: The last-used timestamp currently known for the token
+            now: Time of use, defaults to the current time
+
+        Returns:
+            bool: True if the timestamp was buffered, False if it is too recent
+        """
+        now = now or timezone.now()
+        if last_used_at and now - last_used_at < self.granularity:
+            return False
+
+        with self._lock:
+            self._pending[token_id] = now
+            should_flush = (
+                len(self._pending) >= self.flush_size
+                or monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if should_flush:
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """Persist every pending timestamp in one bulk UPDATE.
+
+        Returns:
+            int: Number of tokens written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = monotonic()
+
+        if not pending:
+            return 0
+
+        user_tokens = [
+            UserToken(pk=token_id, last_used_at=last_used_at)
+            for token_id, last_used_at in pending.items()
+        ]
+        try:
+            UserToken.objects.bulk_update(user_tokens, ["last_used_at"])
+        except Exception:
+            logger.error(
+                "Error flushing token last-used timestamps",
+                extra={
+                    "pending": len(user_tokens),
+                    "traceback": True,
+                },
+            )
+            return 0
+        return len(user_tokens)
+
+
+last_used_buffer = LastUsedBuffer()
+atexit_register(last_used_buffer.flush)
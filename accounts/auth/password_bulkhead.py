@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore
+from threading import Lock
+from time import perf_counter
+from typing import TypeVar
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password as django_check_password
+from django.contrib.auth.hashers import make_password as django_make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from utils.metrics import metrics
+
+T = TypeVar("T")
+
+
+class HashingBulkheadFullError(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordBulkhead:
+    """Bounded executor for password hashing.
+
+    Hashing runs on a pool sized to the CPU cores, away from the request
+    threads, so a login storm cannot take every worker thread. The hash
+    functions release the GIL, which lets the pool use every core. When the
+    pool is busy and ``max_queue`` requests already wait, new work fails
+    fast with ``HashingBulkheadFullError``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_queue: int | None = None,
+    ) -> None:
+        """Initialize the bulkhead, falling back to settings for each option."""
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._slots: BoundedSemaphore | None = None
+        self._in_flight = 0
+        self._lock = Lock()
+
+    @property
+    def max_workers(self) -> int:
+        """Number of hashing threads."""
+        if self._max_workers is not None:
+            return self._max_workers
+        return settings.PASSWORD_HASHING_WORKERS
+
+    @property
+    def max_queue(self) -> int:
+        """Number of hashing requests allowed to wait for a free thread."""
+        if self._max_queue is not None:
+            return self._max_queue
+        return settings.PASSWORD_HASHING_MAX_QUEUE
+
+    def run(self, function: Callable[..., T], *args: object) -> T:
+        """Run the function on the hashing pool and wait for its result.
+
+        Raises:
+            HashingBulkheadFullError: If the pool and its queue are full
+        """
+        executor, slots = self._pool()
+        if not slots.acquire(blocking=False):
+            metrics.increment("password_hashing.rejected")
+            raise HashingBulkheadFullError("Password hashing queue is full")
+
+        self._track(1)
+        submitted = perf_counter()
+
+        def task() -> T:
+            started = perf_counter()
+            metrics.observe("password_hashing.queue_wait_seconds", started - submitted)
+            try:
+                return function(*args)
+            finally:
+                metrics.observe(
+                    "password_hashing.hash_seconds", perf_counter() - started
+                )
+
+        def release(_future: Future) -> None:
+            self._track(-1)
+            slots.release()
+
+        future = executor.submit(task)
+        future.add_done_callback(release)
+        return future.result()
+
+    def check_password(self, raw_password: str, encoded: str) -> tuple[bool, bool]:
+        """Check a password against its hash.
+
+        Returns:
+            tuple[bool, bool]: Whether the password matches and whether its
+            hash should be upgraded to the preferred hasher
+        """
+        must_update: list[bool] = []
+        is_correct = self.run(
+            django_check_password,
+            raw_password,
+            encoded,
+            lambda _raw_password: must_update.append(True),
+        )
+        return is_correct, bool(must_update)
+
+    def make_password(self, raw_password: str) -> str:
+        """Hash a password with the preferred hasher."""
+        return self.run(django_make_password, raw_password)
+
+    def shutdown(self) -> None:
+        """Stop the pool, it is created again on next use."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = None
+
+    def _pool(self) -> tuple[ThreadPoolExecutor, BoundedSemaphore]:
+        """Return the executor and its admission slots, creating them lazily."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hashing",
+                )
+                self._slots = BoundedSemaphore(self.max_workers + self.max_queue)
+            return self._executor, self._slots
+
+    def _track(self, delta: int) -> None:
+        """Update the number of hashing requests running or waiting."""
+        with self._lock:
+            self._in_flight += delta
+            metrics.set_gauge("password_hashing.in_flight", self._in_flight)
+
+
+password_bulkhead = PasswordBulkhead()
+
+
+@receiver(setting_changed)
+def reset_password_bulkhead(setting: str, **kwargs: dict) -> None:
+    """Resize the pool when the settings change (tests)."""
+    if setting in {"PASSWORD_HASHING_WORKERS", "PASSWORD_HASHING_MAX_QUEUE"}:
+        password_bulkhead.shutdown()
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import Enum
+from fcntl import LOCK_EX
+from fcntl import LOCK_UN
+from fcntl import flock as fcntl_flock
+from hashlib import sha256 as hashlib_sha256
+from mmap import mmap as mmap_mmap
+from os import O_CREAT
+from os import O_RDWR
+from os import close as os_close
+from os import fstat as os_fstat
+from os import getpid as os_getpid
+from os import open as os_open
+from os import pread as os_pread
+from os import pwrite as os_pwrite
+from os import replace as os_replace
+from os import stat as os_stat
+from struct import Struct
+from threading import RLock
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import Count
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models.user_token import UserToken
+from utils.metrics import metrics
+
+# magic, bloom bits, hash count, table slots, entries, flags
+HEADER = Struct("<4sIIIII")
+HEADER_SIZE = 32
+FLAGS_OFFSET = 20
+MAGIC = b"RVF1"
+KEY_SIZE = 16
+EMPTY_SLOT = bytes(KEY_SIZE)
+BITS_PER_ENTRY = 10
+HASH_COUNT = 7
+
+# El filtro está lleno: las claves nuevas solo quedan en el Bloom
+FLAG_SATURATED = 1
+# El archivo fue reemplazado por una reconstrucción y hay que reabrirlo
+FLAG_RETIRED = 2
+
+
+class RevocationStatus(Enum):
+    """Result of a revocation check."""
+
+    valid = "valid"
+    revoked = "revoked"
+    unknown = "unknown"
+
+
+def token_key(digest: str) -> str:
+    """Return the filter key of a stateful token."""
+    return f"token:{digest}"
+
+
+def session_key(family: UUID | str) -> str:
+    """Return the filter key of a refresh token family."""
+    return f"session:{family}"
+
+
+def revocation_key(payload: dict[str, Any], digest: str) -> str:
+    """Return the filter key of a token from its payload and digest."""
+    if payload.get("token_type") == "access":
+        return session_key(payload["sid"])
+    return token_key(digest)
+
+
+class RevocationFilter:
+    """Revoked token ids shared by every worker process of the node.
+
+    The filter lives in a memory-mapped file: a Bloom filter answers most
+    checks with a few byte reads, and an open-addressing table of 16-byte key
+    digests confirms Bloom hits exactly. Checks take no lock; writers
+    serialize with ``flock``. Rebuilds write a new file and atomically
+    replace the old one, which is flagged as retired so other processes
+    remap. Once the table is full, new keys only land in the Bloom filter and
+    matching checks report ``unknown`` so callers fall back to the database.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        capacity: int | None = None,
+    ):
+        """Initialize the filter, falling back to settings for each option."""
+        self._path = path
+        self._capacity = capacity
+        self._lock = RLock()
+        self._fd: int | None = None
+        self._mm: mmap_mmap | None = None
+
+    @property
+    def path(self) -> str:
+        """Path of the shared file."""
+        if self._path is not None:
+            return self._path
+        return str(settings.TOKEN_REVOCATION_FILTER_PATH)
+
+    @property
+    def capacity(self) -> int:
+        """Number of keys the exact table holds."""
+        if self._capacity is not None:
+            return self._capacity
+        return settings.TOKEN_REVOCATION_FILTER_CAPACITY
+
+    @property
+    def bloom_bits(self) -> int:
+        """Size of the Bloom filter in bits."""
+        return -(-self.capacity * BITS_PER_ENTRY // 8) * 8
+
+    @property
+    def slots(self) -> int:
+        """Slots of the exact table, kept at most half full."""
+        return self.capacity * 2
+
+    @property
+    def size(self) -> int:
+        """Size of the shared file in bytes."""
+        return HEADER_SIZE + self.bloom_bits // 8 + self.slots * KEY_SIZE
+
+    def check(self, key: str) -> RevocationStatus:
+        """Return whether the key was revoked, without any lock or database."""
+        digest = hashlib_sha256(key.encode()).digest()[:KEY_SIZE]
+        mm = self._mapping()
+
+        if not self._bloom_contains(mm, digest):
+            return RevocationStatus.valid
+        if self._find_slot(mm, digest)[1]:
+            return RevocationStatus.revoked
+        if self._flags(mm) & FLAG_SATURATED:
+            metrics.increment("revocation_filter.unknown")
+            return RevocationStatus.unknown
+        return RevocationStatus.valid
+
+    def revoke(self, key: str) -> None:
+        """Add the key to the filter."""
+        digest = hashlib_sha256(key.encode()).digest()[:KEY_SIZE]
+        with self._locked() as mm:
+            self._insert(mm, digest)
+
+    def rebuild(self, keys: Iterable[str] | None = None) -> int:
+        """Replace the filter with the given keys, or the database ones.
+
+        Returns:
+            int: Number of keys in the new filter
+        """
+        with self._lock:
+            with self._open_current() as fd:
+                count = self._replace(
+                    fd,
+                    database_revocation_keys() if keys is None else keys,
+                )
+            os_close(fd)
+            self.close()
+        return count
+
+    def close(self) -> None:
+        """Unmap the shared file."""
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+                self._mm = None
+            if self._fd is not None:
+                os_close(self._fd)
+                self._fd = None
+
+    def _mapping(self) -> mmap_mmap:
+        """Return the current mapping, (re)opening the file if needed."""
+        mm = self._mm
+        if mm is not None and not self._flags(mm) & FLAG_RETIRED:
+            return mm
+
+        with self._lock:
+            if self._mm is not None and not self._flags(self._mm) & FLAG_RETIRED:
+                return self._mm
+            self.close()
+
+            while True:
+                with self._open_current() as fd:
+                    if self._is_current(fd):
+                        self._mm = mmap_mmap(fd, self.size)
+                        self._fd = fd
+                        return self._mm
+
+                    # Primer uso en el nodo: se reconstruye desde la BD
+                    self._replace(fd, database_revocation_keys())
+                os_close(fd)
+
+    @contextmanager
+    def _open_current(self) -> Iterator[int]:
+        """Open the file currently at ``path`` and hold its writer lock."""
+        while True:
+            fd = os_open(self.path, O_RDWR | O_CREAT, 0o600)
+            fcntl_flock(fd, LOCK_EX)
+            if os_fstat(fd).st_ino == os_stat(self.path).st_ino:
+                break
+            fcntl_flock(fd, LOCK_UN)
+            os_close(fd)
+
+        try:
+            yield fd
+        finally:
+            fcntl_flock(fd, LOCK_UN)
+
+    def _replace(self, fd: int, keys: Iterable[str]) -> int:
+        """Write a new filter and flag the locked previous file as retired."""
+        count = self._write_file(keys)
+        if os_fstat(fd).st_size >= HEADER_SIZE:
+            # Las demás instancias verán la marca y reabrirán el archivo
+            flags = int.from_bytes(os_pread(fd, 4, FLAGS_OFFSET), "little")
+            os_pwrite(fd, (flags | FLAG_RETIRED).to_bytes(4, "little"), FLAGS_OFFSET)
+        return count
+
+    @contextmanager
+    def _locked(self) -> Iterator[mmap_mmap]:
+        """Hold the writer lock on the current file."""
+        with self._lock:
+            while True:
+                mm = self._mapping()
+                fcntl_flock(self._fd, LOCK_EX)
+                if not self._flags(mm) & FLAG_RETIRED:
+                    break
+                fcntl_flock(self._fd, LOCK_UN)
+
+            try:
+                yield mm
+            finally:
+                fcntl_flock(self._fd, LOCK_UN)
+
+    def _is_current(self, fd: int) -> bool:
+        """Return True if the file holds a filter with the expected layout."""
+        if os_fstat(fd).st_size != self.size:
+            return False
+        with open(fd, "rb", closefd=False) as file:
+            header = HEADER.unpack(file.read(HEADER.size))
+        magic, bloom_bits, hash_count, slots, _count, flags = header
+        return (
+            magic == MAGIC
+            and (bloom_bits, hash_count, slots)
+            == (self.bloom_bits, HASH_COUNT, self.slots)
+            and not flags & FLAG_RETIRED
+        )
+
+    def _write_file(self, keys: Iterable[str]) -> int:
+        """Write a new filter with the keys and atomically move it in place."""
+        buffer = bytearray(self.size)
+        HEADER.pack_into(
+            buffer, 0, MAGIC, self.bloom_bits, HASH_COUNT, self.slots, 0, 0
+        )
+        for key in keys:
+            self._insert(buffer, hashlib_sha256(key.encode()).digest()[:KEY_SIZE])
+
+        tmp_path = f"{self.path}.{os_getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(buffer)
+        os_replace(tmp_path, self.path)
+
+        count = HEADER.unpack_from(buffer, 0)[4]
+        metrics.set_gauge("revocation_filter.entries", count)
+        return count
+
+    def _insert(self, buffer: bytearray | mmap_mmap, digest: bytes) -> None:
+        """Insert the key digest, slot first and Bloom bits last."""
+        _magic, _bloom_bits, _hash_count, _slots, count, flags = HEADER.unpack_from(
+            buffer, 0
+        )
+        slot, found = self._find_slot(buffer, digest)
+        if found:
+            return
+
+        if count >= self.capacity or slot is None:
+            flags |= FLAG_SATURATED
+        else:
+            offset = self._slot_offset(slot)
+            buffer[offset : offset + KEY_SIZE] = digest
+            count += 1
+
+        for bit in self._bloom_positions(digest):
+            buffer[HEADER_SIZE + bit // 8] |= 1 << (bit % 8)
+
+        HEADER.pack_into(
+            buffer,
+            0,
+            MAGIC,
+            self.bloom_bits,
+            HASH_COUNT,
+            self.slots,
+            count,
+            flags,
+        )
+
+    def _bloom_positions(self, digest: bytes) -> list[int]:
+        """Return the Bloom bit positions of the digest (double hashing)."""
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.bloom_bits for i in range(HASH_COUNT)]
+
+    def _bloom_contains(self, buffer: mmap_mmap, digest: bytes) -> bool:
+        """Return True if every Bloom bit of the digest is set."""
+        return all(
+            buffer[HEADER_SIZE + bit // 8] & (1 << (bit % 8))
+            for bit in self._bloom_positions(digest)
+        )
+
+    def _find_slot(
+        self,
+        buffer: bytearray | mmap_mmap,
+        digest: bytes,
+    ) -> tuple[int | None, bool]:
+        """Probe the table for the digest.
+
+        Returns:
+            tuple: (slot holding the digest or the first empty one, found)
+        """
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        for probe in range(self.slots):
+            slot = (start + probe) % self.slots
+            offset = self._slot_offset(slot)
+            stored = bytes(buffer[offset : offset + KEY_SIZE])
+            if stored == digest:
+                return slot, True
+            if stored == EMPTY_SLOT:
+                return slot, False
+        return None, False
+
+    def _slot_offset(self, slot: int) -> int:
+        """Return the byte offset of a table slot."""
+        return HEADER_SIZE + self.bloom_bits // 8 + slot * KEY_SIZE
+
+    def _flags(self, buffer: mmap_mmap) -> int:
+        """Return the header flags."""
+        return int.from_bytes(buffer[FLAGS_OFFSET : FLAGS_OFFSET + 4], "little")
+
+
+def database_revocation_keys() -> Iterator[str]:
+    """Yield the keys of every revoked token that has not expired yet."""
+    now = timezone.now()
+
+    revoked_tokens = UserToken.objects.filter(
+        family__isnull=True,
+        is_valid=False,
+        expires_at__gt=now,
+    ).values_list("token_digest", flat=True)
+    for digest in revoked_tokens.iterator(chunk_size=2000):
+        yield token_key(digest)
+
+    # Rotar un refresh token invalida la fila anterior pero no la sesión:
+    # una sesión está revocada cuando ya no le queda ningún token válido
+    revoked_sessions = (
+        UserToken.objects.filter(family__isnull=False, expires_at__gt=now)
+        .values("family")
+        .annotate(valid_tokens=Count("pk", filter=Q(is_valid=True)))
+        .filter(valid_tokens=0)
+        .values_list("family", flat=True)
+    )
+    for family in revoked_sessions.iterator(chunk_size=2000):
+        yield session_key(family)
+
+
+revocation_filter = RevocationFilter()
+
+
+@receiver(setting_changed)
+def reset_revocation_filter(setting: str, **kwargs: dict) -> None:
+    """Reopen the filter when its settings change."""
+    if setting.startswith("TOKEN_REVOCATION_FILTER_"):
+        revocation_filter.close()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import field
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+from django.conf import settings
+from django.db import router
+
+from accounts.models.custom_user import CustomUser
+from utils.metrics import metrics
+
+# Columnas de CustomUser que necesita el pipeline de una petición autenticada
+USER_SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "is_verified",
+    "has_mfa",
+    "updated_at",
+)
+
+
+@dataclass
+class CachedToken:
+    """Verified token state kept in the process-local cache."""
+
+    is_valid: bool
+    payload: dict[str, Any] = field(default_factory=dict)
+    token_id: int | None = None
+    last_used_at: datetime | None = None
+    user_snapshot: dict[str, Any] | None = None
+    cached_until: float = 0.0
+
+    @property
+    def user_id(self) -> int | None:
+        """Return the id of the token owner."""
+        return self.user_snapshot["id"] if self.user_snapshot else None
+
+    def build_user(self) -> CustomUser:
+        """Build a fresh user instance from the snapshot.
+
+        Columns outside the snapshot are deferred and loaded on first access.
+        """
+        # from_db espera los valores en el orden de las columnas del modelo
+        field_names = [
+            field.attname
+            for field in CustomUser._meta.concrete_fields
+            if field.attname in self.user_snapshot
+        ]
+        return CustomUser.from_db(
+            router.db_for_read(CustomUser),
+            field_names,
+            [self.user_snapshot[name] for name in field_names],
+        )
+
+
+def snapshot_user(user: CustomUser) -> dict[str, Any]:
+    """Return the slim snapshot of the user kept in the cache."""
+    return {name: getattr(user, name) for name in USER_SNAPSHOT_FIELDS}
+
+
+class TokenCache:
+    """Bounded TTL/LRU cache of verified tokens keyed by token digest."""
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        ttl: float | None = None,
+    ):
+        """Initialize the cache, falling back to settings for each option."""
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[str, CachedToken] = OrderedDict()
+        self._digests_by_user: dict[int, set[str]] = {}
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of cached tokens, 0 disables the cache."""
+        if self._max_size is not None:
+            return self._max_size
+        return settings.TOKEN_CACHE_MAX_SIZE
+
+    @property
+    def ttl(self) -> float:
+        """Seconds an entry may be served before it is verified again."""
+        if self._ttl is not None:
+            return self._ttl
+        return settings.TOKEN_CACHE_TTL
+
+    def __len__(self) -> int:
+        """Return the number of cached tokens."""
+        return len(self._entries)
+
+    def get(self, digest: str) -> CachedToken | None:
+        """Return the cached entry for the digest, if present and fresh."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry.cached_until <= monotonic():
+                self._remove(digest)
+                entry = None
+
+            if entry is None:
+                metrics.increment("token_cache.misses")
+                return None
+
+            self._entries.move_to_end(digest)
+            metrics.increment("token_cache.hits")
+            return entry
+
+    def set(
+        self,
+        digest: str,
+        entry: CachedToken,
+        expires_in: float | None = None,
+    ) -> None:
+        """Cache the entry for at most ``ttl`` or ``expires_in`` seconds."""
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl if expires_in is None else min(self.ttl, expires_in)
+        if ttl <= 0:
+            return
+        entry.cached_until = monotonic() + ttl
+
+        with self._lock:
+            self._remove(digest)
+            self._entries[digest] = entry
+            if entry.user_id is not None:
+                self._digests_by_user.setdefault(entry.user_id, set()).add(digest)
+
+            while len(self._entries) > self.max_size:
+                oldest_digest = next(iter(self._entries))
+                self._remove(oldest_digest)
+                metrics.increment("token_cache.evictions")
+
+            metrics.set_gauge("token_cache.size", len(self._entries))
+
+    def invalidate(self, digest: str) -> None:
+        """Drop the entry cached for the digest."""
+        with self._lock:
+            self._remove(digest)
+            metrics.set_gauge("token_cache.size", len(self._entries))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every entry that belongs to the user."""
+        with self._lock:
+            for digest in list(self._digests_by_user.get(user_id, ())):
+                self._remove(digest)
+            metrics.set_gauge("token_cache.size", len(self._entries))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_user.clear()
+            metrics.set_gauge("token_cache.size", 0)
+
+    def stats(self) -> dict[str, float]:
+        """Return size and hit/miss/eviction counters."""
+        counters = metrics.snapshot()["counters"]
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": counters.get("token_cache.hits", 0),
+            "misses": counters.get("token_cache.misses", 0),
+            "evictions": counters.get("token_cache.evictions", 0),
+        }
+
+    def _remove(self, digest: str) -> None:
+        """Remove an entry and its user index, the lock must be held."""
+        entry = self._entries.pop(digest, None)
+        if entry is None or entry.user_id is None:
+            return
+
+        digests = self._digests_by_user.get(entry.user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_user[entry.user_id]
+
+
+token_cache = TokenCache()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from jwt import InvalidTokenError as jwt_InvalidTokenError
+
+from accounts.auth.revocation_filter import RevocationStatus
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.revocation_filter import session_key
+from accounts.models.user_token import UserToken
+from accounts.utils.hash_token import hash_token
+from accounts.utils.jwt_tokens import decode_token
+
+INACTIVE = {"active": False}
+
+
+def introspect_tokens(tokens: list[str]) -> list[dict[str, Any]]:
+    """Return the RFC 7662 state of each token, in the order given.
+
+    Signatures and expiry are verified first. Revocation of the remaining
+    tokens is resolved with one query: stored tokens by digest and stateless
+    access tokens by session, unless the shared revocation filter already
+    answers for the session.
+    """
+    payloads: list[dict[str, Any] | None] = []
+    digests: set[str] = set()
+    sessions: dict[str, RevocationStatus] = {}
+    for token in tokens:
+        try:
+            payload = decode_token(token)
+        except jwt_InvalidTokenError:
+            payloads.append(None)
+            continue
+
+        payloads.append(payload)
+        if is_stateless(payload):
+            sid = payload["sid"]
+            sessions.setdefault(sid, revocation_filter.check(session_key(sid)))
+        else:
+            digests.add(hash_token(token))
+
+    valid_digests = resolve_revocations(digests, sessions)
+
+    results = []
+    for token, payload in zip(tokens, payloads, strict=True):
+        if payload is None:
+            active = False
+        elif is_stateless(payload):
+            active = sessions[payload["sid"]] is RevocationStatus.valid
+        else:
+            active = hash_token(token) in valid_digests
+
+        results.append(describe(payload) if active else dict(INACTIVE))
+    return results
+
+
+def resolve_revocations(
+    digests: set[str],
+    sessions: dict[str, RevocationStatus],
+) -> set[str]:
+    """Find the valid stored tokens and sessions in a single query.
+
+    Sessions the filter could not answer for are updated in place.
+
+    Returns:
+        set[str]: Digests of the stored tokens that are still valid
+    """
+    unknown_sessions = [
+        sid for sid, status in sessions.items() if status is RevocationStatus.unknown
+    ]
+    for sid in unknown_sessions:
+        sessions[sid] = RevocationStatus.revoked
+    if not digests and not unknown_sessions:
+        return set()
+
+    valid_digests = set()
+    for digest, family in UserToken.objects.filter(
+        Q(token_digest__in=digests) | Q(family__in=unknown_sessions),
+        is_valid=True,
+        expires_at__gt=timezone.now(),
+    ).values_list("token_digest", "family"):
+        valid_digests.add(digest)
+        if family is not None and str(family) in sessions:
+            sessions[str(family)] = RevocationStatus.valid
+    return valid_digests
+
+
+def describe(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return the introspection result of an active token."""
+    return {
+        "active": True,
+        "user_id": payload["user_id"],
+        "exp": int(payload["exp"]),
+        "token_type": payload.get(
+            "token_type",
+            "temporary" if payload.get("is_temporary") else "access",
+        ),
+    }
+
+
+def is_stateless(payload: dict[str, Any]) -> bool:
+    """Return True for access tokens that have no row of their own."""
+    return (
+        payload.get("token_type") == "access" and settings.JWT_STATELESS_ACCESS_TOKENS
+    )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from accounts.utils.email_transports import DjangoTransport
+from accounts.utils.email_transports import OutgoingEmail
+from accounts.utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    """Compare a connection per email with pooled, batched sending."""
+
+    help = "Measure SMTP delivery throughput against a local SMTP sink"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=200,
+            help="Emails sent by each strategy",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Threads used by the concurrent strategy",
+        )
+        parser.add_argument(
+            "--connect-latency",
+            type=float,
+            default=0.02,
+            help="Seconds the sink adds to every new connection",
+        )
+        parser.add_argument(
+            "--message-latency",
+            type=float,
+            default=0.002,
+            help="Seconds the sink adds to every message",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Run the benchmark and print emails per second."""
+        concurrency = options["concurrency"]
+        emails = [
+            OutgoingEmail(f"user{i}@example.com", "Benchmark", "Your code is 123456")
+            for i in range(options["messages"])
+        ]
+
+        def one_connection_per_email(transport: DjangoTransport) -> None:
+            for email in emails:
+                transport.send(email.recipient, email.subject, email.body)
+                transport.close()
+
+        def one_connection(transport: DjangoTransport) -> None:
+            transport.send_many(emails)
+
+        def one_connection_per_thread(transport: DjangoTransport) -> None:
+            chunks = [emails[i::concurrency] for i in range(concurrency)]
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(transport.send_many, chunks))
+
+        cases = (
+            ("connection per email", one_connection_per_email),
+            ("reused connection", one_connection),
+            (f"reused x{concurrency} threads", one_connection_per_thread),
+        )
+        for name, function in cases:
+            sink = SMTPSink(
+                connect_latency=options["connect_latency"],
+                message_latency=options["message_latency"],
+            ).start()
+            try:
+                with override_settings(
+                    EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+                    EMAIL_HOST="127.0.0.1",
+                    EMAIL_PORT=sink.port,
+                    EMAIL_HOST_USER="",
+                    EMAIL_HOST_PASSWORD="",
+                    EMAIL_USE_TLS=False,
+                ):
+                    transport = DjangoTransport()
+                    started = perf_counter()
+                    function(transport)
+                    elapsed = perf_counter() - started
+                    transport.close()
+            finally:
+                sink.stop()
+            self.stdout.write(
+                f"{name}: {len(sink.messages) / elapsed:,.0f} emails/s "
+                f"({sink.connections} connections)"
+            )
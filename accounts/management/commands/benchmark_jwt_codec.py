@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+from time import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from jwt import decode as jwt_decode
+from jwt import encode as jwt_encode
+
+from accounts.utils.hs256_codec import get_hs256_codec
+
+
+class Command(BaseCommand):
+    """Compare the HS256 codec with PyJWT."""
+
+    help = "Measure encode/decode throughput of the HS256 codec against PyJWT"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="Tokens encoded and decoded by each implementation",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Run the benchmark and print operations per second."""
+        iterations = options["iterations"]
+        secret = settings.SECRET_KEY
+        codec = get_hs256_codec(secret)
+        payload = {
+            "user_id": 1,
+            "email": "user@example.com",
+            "is_temporary": False,
+            "exp": time() + 3600,
+            "jti": uuid4().hex,
+        }
+        token = codec.encode(payload)
+        if token != jwt_encode(payload, secret, algorithm="HS256"):
+            self.stderr.write(self.style.ERROR("Codec and PyJWT tokens differ"))
+            return
+
+        cases = (
+            ("encode", "pyjwt", lambda: jwt_encode(payload, secret, algorithm="HS256")),
+            ("encode", "codec", lambda: codec.encode(payload)),
+            (
+                "decode",
+                "pyjwt",
+                lambda: jwt_decode(token, secret, algorithms=["HS256"]),
+            ),
+            ("decode", "codec", lambda: codec.decode(token)),
+        )
+        results: dict[tuple[str, str], float] = {}
+        for operation, implementation, function in cases:
+            started = perf_counter()
+            for _ in range(iterations):
+                function()
+            results[operation, implementation] = iterations / (perf_counter() - started)
+            self.stdout.write(
+                f"{operation} {implementation}: "
+                f"{results[operation, implementation]:,.0f} ops/s"
+            )
+
+        for operation in ("encode", "decode"):
+            speedup = results[operation, "codec"] / results[operation, "pyjwt"]
+            self.stdout.write(
+                self.style.SUCCESS(f"{operation} speedup: {speedup:.2f}x")
+            )
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from math import floor
+from math import log2
+from statistics import median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.crypto import get_random_string
+
+from accounts.auth.hashers import CalibratedArgon2PasswordHasher
+from accounts.auth.hashers import CalibratedPBKDF2PasswordHasher
+from accounts.auth.hashers import CalibratedScryptPasswordHasher
+
+
+class Command(BaseCommand):
+    """Recommend password hasher parameters for this machine."""
+
+    help = (
+        "Benchmark the password hashers and recommend the parameters that "
+        "take the target time per hash on this machine"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250.0,
+            help="Time one hash should take, in milliseconds",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=3,
+            help="Hashes timed per hasher, the median is used",
+        )
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            choices=["pbkdf2", "scrypt", "argon2"],
+            help="Hasher to calibrate, repeatable (default: all)",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Time each hasher with its current parameters and scale them."""
+        target = options["target_ms"] / 1000
+        calibrations = {
+            "pbkdf2": self.calibrate_pbkdf2,
+            "scrypt": self.calibrate_scrypt,
+            "argon2": self.calibrate_argon2,
+        }
+        for name in options["hasher"] or calibrations:
+            calibrations[name](target, options["samples"])
+
+        self.stdout.write(
+            f"Preferred hasher: PASSWORD_HASHER={settings.PASSWORD_HASHER}. "
+            "Stored passwords are rehashed on their next successful login."
+        )
+
+    def calibrate_pbkdf2(self, target: float, samples: int) -> None:
+        """Scale the iterations linearly to the target time."""
+        hasher = CalibratedPBKDF2PasswordHasher()
+        iterations = hasher.iterations
+        elapsed = self.time_hash(
+            lambda password, salt: hasher.encode(password, salt, iterations),
+            samples,
+        )
+        recommended = max(round(iterations * target / elapsed, -4), 10000)
+        self.report(
+            f"pbkdf2 ({iterations} iterations)",
+            elapsed,
+            {"PASSWORD_PBKDF2_ITERATIONS": int(recommended)},
+        )
+
+    def calibrate_scrypt(self, target: float, samples: int) -> None:
+        """Pick the largest power of two work factor within the target time."""
+        hasher = CalibratedScryptPasswordHasher()
+        work_factor = hasher.work_factor
+        elapsed = self.time_hash(hasher.encode, samples)
+        recommended = 2 ** max(floor(log2(work_factor * target / elapsed)), 10)
+        self.report(
+            f"scrypt (N={work_factor}, r={hasher.block_size}, "
+            f"p={hasher.parallelism})",
+            elapsed,
+            {"PASSWORD_SCRYPT_WORK_FACTOR": recommended},
+        )
+
+    def calibrate_argon2(self, target: float, samples: int) -> None:
+        """Scale the number of passes, keeping the memory cost."""
+        hasher = CalibratedArgon2PasswordHasher()
+        try:
+            elapsed = self.time_hash(hasher.encode, samples)
+        except ValueError:
+            self.stdout.write(
+                self.style.WARNING("argon2: skipped, argon2-cffi is not installed")
+            )
+            return
+
+        time_cost = hasher.time_cost
+        self.report(
+            f"argon2 (t={time_cost}, m={hasher.memory_cost} KiB, "
+            f"p={hasher.parallelism})",
+            elapsed,
+            {"PASSWORD_ARGON2_TIME_COST": max(round(time_cost * target / elapsed), 1)},
+        )
+
+    def time_hash(self, encode: Callable[[str, str], str], samples: int) -> float:
+        """Return the median seconds taken by one hash."""
+        timings = []
+        for _ in range(samples):
+            password = get_random_string(16)
+            salt = get_random_string(22)
+            started = perf_counter()
+            encode(password, salt)
+            timings.append(perf_counter() - started)
+        return median(timings)
+
+    def report(self, label: str, elapsed: float, recommended: dict[str, int]) -> None:
+        """Print the measured time and the recommended settings."""
+        self.stdout.write(f"{label}: {elapsed * 1000:.1f} ms per hash")
+        for name, value in recommended.items():
+            self.stdout.write(self.style.SUCCESS(f"  {name}={value}"))
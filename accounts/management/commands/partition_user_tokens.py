@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from accounts.utils.partitions import token_partitions
+
+
+class Command(BaseCommand):
+    """Partition the UserToken table by month and maintain its partitions."""
+
+    help = (
+        "Create the coming UserToken partitions and drop the expired ones; "
+        "--convert partitions the table first"
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rebuild the table as a partitioned table (locks it while copying)",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            help=(
+                "Months of partitions kept ahead "
+                "(default: USER_TOKEN_PARTITION_MONTHS_AHEAD)"
+            ),
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Convert the table if asked, then maintain its partitions."""
+        months_ahead = (
+            settings.USER_TOKEN_PARTITION_MONTHS_AHEAD
+            if options["months_ahead"] is None
+            else options["months_ahead"]
+        )
+
+        if options["convert"]:
+            if token_partitions.is_partitioned():
+                raise CommandError("The UserToken table is already partitioned")
+            copied = token_partitions.convert(months_ahead)
+            self.stdout.write(f"Copied {copied} tokens into the partitioned table")
+        elif not token_partitions.is_partitioned():
+            raise CommandError(
+                "The UserToken table is not partitioned, run with --convert"
+            )
+
+        created, dropped = token_partitions.maintain(
+            months_ahead,
+            timezone.now() - timedelta(seconds=settings.REAP_GRACE_PERIOD),
+        )
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        for name in dropped:
+            self.stdout.write(f"Dropped {name}")
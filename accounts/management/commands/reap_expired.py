@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from accounts.utils.reaper import Reaper
+from accounts.utils.reaper import reap_with_lock
+
+
+class Command(BaseCommand):
+    """Delete expired tokens, verification codes and MFA verifications."""
+
+    help = "Delete expired and revoked rows in small batches, optionally archiving"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows deleted per transaction (default: REAP_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            help="Seconds to sleep between batches (default: REAP_BATCH_PAUSE)",
+        )
+        parser.add_argument(
+            "--grace",
+            type=int,
+            help="Seconds past expiry a row is kept (default: REAP_GRACE_PERIOD)",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            help="Write the deleted rows to gzipped JSONL files in this directory",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Run the reaper and print the throughput per table."""
+        reaper = Reaper(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            grace=(
+                None
+                if options["grace"] is None
+                else timedelta(seconds=options["grace"])
+            ),
+            archive_dir=options["archive_dir"],
+        )
+        reports = reap_with_lock(reaper)
+        if reports is None:
+            self.stderr.write(self.style.WARNING("Another reaper is running"))
+            return
+
+        for report in reports:
+            self.stdout.write(
+                f"{report.table}: {report.deleted} rows in {report.batches} batches, "
+                f"{report.rows_per_second:,.0f} rows/s"
+            )
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from accounts.auth.revocation_filter import revocation_filter
+
+
+class Command(BaseCommand):
+    """Rebuild the shared token revocation filter from the database."""
+
+    help = "Rebuild the shared token revocation filter from revoked UserToken rows"
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Rebuild the filter, dropping keys of expired tokens."""
+        count = revocation_filter.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Revocation filter rebuilt at {revocation_filter.path} "
+                f"with {count} keys"
+            )
+        )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+
+from accounts.models.device import Device
+from accounts.models.user_token import UserToken
+
+# Tamaño de la tabla, sus índices y el ancho medio de fila
+STORAGE_SQL = """
+    SELECT
+        count(*) AS rows,
+        pg_relation_size(%(table)s) AS heap_bytes,
+        pg_indexes_size(%(table)s) AS index_bytes,
+        pg_total_relation_size(%(table)s) AS total_bytes,
+        coalesce(avg(pg_column_size(t.*)), 0) AS avg_row_bytes
+    FROM {table} AS t
+"""
+
+
+class Command(BaseCommand):
+    """Report the storage used by the token tables."""
+
+    help = "Print row count, heap, index and row sizes of UserToken and Device"
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Print the sizes; run before and after a migration to compare."""
+        if connection.vendor != "postgresql":
+            raise CommandError("The storage report needs PostgreSQL")
+
+        for model in (UserToken, Device):
+            table = model._meta.db_table
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    STORAGE_SQL.format(table=connection.ops.quote_name(table)),
+                    {"table": table},
+                )
+                rows, heap, indexes, total, avg_row = cursor.fetchone()
+            self.stdout.write(
+                f"{table}: {rows} rows, heap {heap / 1024:,.0f} KiB, "
+                f"indexes {indexes / 1024:,.0f} KiB, "
+                f"total {total / 1024:,.0f} KiB, "
+                f"average row {avg_row:,.0f} bytes"
+            )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from signal import SIGINT
+from signal import SIGTERM
+from signal import signal as signal_signal
+from types import FrameType
+
+from django.core.management.base import BaseCommand
+
+from accounts.utils.email_outbox import EmailOutboxWorker
+
+
+class Command(BaseCommand):
+    """Deliver the emails written to the outbox."""
+
+    help = "Drain the email outbox with retries, backoff and a dead-letter state"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Emails sent at the same time (default: EMAIL_WORKER_CONCURRENCY)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Emails claimed per batch (default: EMAIL_WORKER_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the outbox is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no email is due instead of polling",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Run the worker until SIGTERM/SIGINT."""
+        worker = EmailOutboxWorker(
+            concurrency=options["concurrency"],
+            batch_size=options["batch_size"],
+        )
+
+        def stop(signum: int, frame: FrameType | None) -> None:
+            self.stdout.write("Stopping after the current batch")
+            worker.stop()
+
+        signal_signal(SIGTERM, stop)
+        signal_signal(SIGINT, stop)
+
+        self.stdout.write(f"Email worker started with concurrency {worker.concurrency}")
+        worker.run(options["poll_interval"], once=options["once"])
+        self.stdout.write(self.style.SUCCESS("Email worker stopped"))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+
+from django.core.management.base import BaseCommand
+
+from accounts.utils.smtp_sink import SMTPSink
+
+
+class Command(BaseCommand):
+    """Run a local SMTP server that discards every message."""
+
+    help = "Accept SMTP messages locally to benchmark email delivery offline"
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        """Add the command arguments."""
+        parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+        parser.add_argument("--port", type=int, default=1025, help="Port to bind")
+        parser.add_argument(
+            "--connect-latency",
+            type=float,
+            default=0.0,
+            help="Seconds added to every new connection",
+        )
+        parser.add_argument(
+            "--message-latency",
+            type=float,
+            default=0.0,
+            help="Seconds added to every accepted message",
+        )
+
+    def handle(self, *args: list, **options: dict) -> None:
+        """Serve until interrupted."""
+        sink = SMTPSink(
+            host=options["host"],
+            port=options["port"],
+            connect_latency=options["connect_latency"],
+            message_latency=options["message_latency"],
+        )
+        self.stdout.write(f"SMTP sink listening on {options['host']}:{sink.port}")
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.server_close()
+        self.stdout.write(
+            f"Received {len(sink.messages)} messages "
+            f"over {sink.connections} connections"
+        )
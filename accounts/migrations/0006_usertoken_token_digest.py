@@ -0,0 +1,37 @@
+# Generated manually for digest-indexed token lookups, edited to add the
+# column without building its unique index under a lock
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_alter_mfaverification_options"),
+    ]
+
+    # La columna nullable sin índice es un cambio de catálogo: no bloquea los
+    # logins. El índice único se construye de forma concurrente en 0008.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.AddField(
+                    model_name="usertoken",
+                    name="token_digest",
+                    field=models.CharField(max_length=64, null=True),
+                ),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name="usertoken",
+                    name="token_digest",
+                    field=models.CharField(
+                        help_text="SHA-256 digest of the token, used for lookups",
+                        max_length=64,
+                        null=True,
+                        unique=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
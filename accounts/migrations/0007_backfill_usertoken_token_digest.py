@@ -0,0 +1,42 @@
+# Generated manually to backfill UserToken.token_digest in chunks
+
+from hashlib import sha256
+
+from django.db import migrations, transaction
+
+# Cada lote se confirma por separado para no mantener locks largos
+BATCH_SIZE = 1000
+
+
+def backfill_token_digest(apps, schema_editor):
+    UserToken = apps.get_model("accounts", "UserToken")
+
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserToken.objects.filter(pk__gt=last_pk, token_digest__isnull=True)
+                .order_by("pk")
+                .only("pk", "token")[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for user_token in batch:
+                user_token.token_digest = sha256(user_token.token.encode()).hexdigest()
+            UserToken.objects.bulk_update(batch, ["token_digest"])
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0006_usertoken_token_digest"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_token_digest, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated manually once every UserToken row has a digest, edited to
+# enforce uniqueness and NOT NULL without blocking the table
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# Las filas que el código antiguo insertó sin digest tras 0007
+backfill_token_digest = import_module(
+    "accounts.migrations.0007_backfill_usertoken_token_digest"
+).backfill_token_digest
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0007_backfill_usertoken_token_digest"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                # El índice se construye sin bloquear escrituras y la
+                # restricción única lo adopta sin volver a recorrer la tabla
+                migrations.RunSQL(
+                    "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+                    "accounts_usertoken_token_digest_key "
+                    "ON accounts_usertoken (token_digest)",
+                    "DROP INDEX CONCURRENTLY IF EXISTS "
+                    "accounts_usertoken_token_digest_key",
+                ),
+                migrations.RunSQL(
+                    "ALTER TABLE accounts_usertoken "
+                    "ADD CONSTRAINT accounts_usertoken_token_digest_key "
+                    "UNIQUE USING INDEX accounts_usertoken_token_digest_key",
+                    "ALTER TABLE accounts_usertoken "
+                    "DROP CONSTRAINT accounts_usertoken_token_digest_key",
+                ),
+                # NOT VALID solo comprueba las filas nuevas: lock breve
+                migrations.RunSQL(
+                    "ALTER TABLE accounts_usertoken "
+                    "ADD CONSTRAINT accounts_usertoken_token_digest_not_null "
+                    "CHECK (token_digest IS NOT NULL) NOT VALID",
+                    "ALTER TABLE accounts_usertoken "
+                    "DROP CONSTRAINT IF EXISTS "
+                    "accounts_usertoken_token_digest_not_null",
+                ),
+                migrations.RunPython(backfill_token_digest, migrations.RunPython.noop),
+                # VALIDATE recorre la tabla sin bloquear lecturas ni escrituras
+                migrations.RunSQL(
+                    "ALTER TABLE accounts_usertoken "
+                    "VALIDATE CONSTRAINT accounts_usertoken_token_digest_not_null",
+                    migrations.RunSQL.noop,
+                ),
+                # Con el CHECK ya validado SET NOT NULL no recorre la tabla
+                migrations.RunSQL(
+                    "ALTER TABLE accounts_usertoken "
+                    "ALTER COLUMN token_digest SET NOT NULL; "
+                    "ALTER TABLE accounts_usertoken "
+                    "DROP CONSTRAINT accounts_usertoken_token_digest_not_null",
+                    "ALTER TABLE accounts_usertoken "
+                    "ALTER COLUMN token_digest DROP NOT NULL",
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="usertoken",
+                    name="token_digest",
+                    field=models.CharField(
+                        help_text="SHA-256 digest of the token, used for lookups",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
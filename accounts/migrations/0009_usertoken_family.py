@@ -0,0 +1,23 @@
+# Generated manually for rotating refresh tokens
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_alter_usertoken_token_digest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usertoken",
+            name="family",
+            field=models.UUIDField(
+                blank=True,
+                db_index=True,
+                help_text="Session shared by every rotation of a refresh token",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated manually for case-insensitive login lookups, edited to build the
+# indexes without locking writes
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0009_usertoken_family"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="customuser_email_upper_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="customuser",
+            index=models.Index(
+                django.db.models.functions.text.Upper("username"),
+                name="customuser_username_upper_idx",
+            ),
+        ),
+    ]
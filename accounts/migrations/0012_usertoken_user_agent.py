@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0011_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usertoken",
+            name="user_agent",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="User-Agent header the token was issued to",
+            ),
+        ),
+    ]
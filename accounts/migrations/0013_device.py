@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_usertoken_user_agent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Device",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("device_type", models.CharField(max_length=50)),
+                ("device_os", models.CharField(max_length=50)),
+                ("device_browser", models.CharField(max_length=50)),
+            ],
+            options={
+                "verbose_name": "device",
+                "verbose_name_plural": "devices",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("device_type", "device_os", "device_browser"),
+                        name="device_unique_triple",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="usertoken",
+            name="device",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Empty until parsed when User-Agent parsing is lazy",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="tokens",
+                to="accounts.device",
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated manually to move the device strings of UserToken to Device in chunks
+
+from django.db import migrations, transaction
+
+# Cada lote se confirma por separado para no mantener locks largos
+BATCH_SIZE = 1000
+
+TRIPLE = ("device_type", "device_os", "device_browser")
+
+
+def backfill_device(apps, schema_editor):
+    Device = apps.get_model("accounts", "Device")
+    UserToken = apps.get_model("accounts", "UserToken")
+
+    device_ids = {}
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserToken.objects.filter(pk__gt=last_pk, device__isnull=True)
+                .exclude(device_type="")
+                .order_by("pk")
+                .only("pk", *TRIPLE)[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            triples = {
+                tuple(getattr(token, name) for name in TRIPLE) for token in batch
+            }
+            missing = triples - device_ids.keys()
+            if missing:
+                Device.objects.bulk_create(
+                    [Device(**dict(zip(TRIPLE, triple))) for triple in missing],
+                    ignore_conflicts=True,
+                )
+                for device in Device.objects.filter(
+                    device_type__in={triple[0] for triple in missing}
+                ):
+                    device_ids[tuple(getattr(device, name) for name in TRIPLE)] = (
+                        device.pk
+                    )
+
+            for token in batch:
+                token.device_id = device_ids[
+                    tuple(getattr(token, name) for name in TRIPLE)
+                ]
+            UserToken.objects.bulk_update(batch, ["device"])
+
+        last_pk = batch[-1].pk
+
+
+def restore_device_strings(apps, schema_editor):
+    UserToken = apps.get_model("accounts", "UserToken")
+
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserToken.objects.filter(pk__gt=last_pk, device__isnull=False)
+                .select_related("device")
+                .order_by("pk")[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for token in batch:
+                for name in TRIPLE:
+                    setattr(token, name, getattr(token.device, name))
+            UserToken.objects.bulk_update(batch, list(TRIPLE))
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0013_device"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_device, restore_device_strings),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:34
+
+from django.db import migrations, models
+
+DEVICE_STRINGS = ("device_browser", "device_os", "device_type")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0014_backfill_usertoken_device"),
+    ]
+
+    # El default permite volver a crear las columnas al revertir; la
+    # migración anterior las rellena desde Device
+    operations = [
+        migrations.AlterField(
+            model_name="usertoken",
+            name=name,
+            field=models.CharField(default="", max_length=50),
+        )
+        for name in DEVICE_STRINGS
+    ] + [
+        migrations.RemoveField(
+            model_name="usertoken",
+            name=name,
+        )
+        for name in DEVICE_STRINGS
+    ]
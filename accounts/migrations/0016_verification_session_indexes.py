@@ -0,0 +1,50 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:37, edited to build the indexes
+# without locking writes
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0015_remove_usertoken_device_strings"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="mfaverification",
+            index=models.Index(
+                condition=models.Q(("is_verified", False)),
+                fields=["user", "method", "code", "expires_at"],
+                name="mfaverification_pending_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="usertoken",
+            index=models.Index(
+                condition=models.Q(("is_valid", True)),
+                fields=["family"],
+                name="usertoken_valid_family_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="usertoken",
+            index=models.Index(
+                condition=models.Q(("family__isnull", True), ("is_valid", False)),
+                fields=["expires_at"],
+                name="usertoken_revoked_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="verificationcode",
+            index=models.Index(
+                condition=models.Q(("is_used", False)),
+                fields=["user", "code", "-created_at"],
+                name="verificationcode_pending_idx",
+            ),
+        ),
+    ]
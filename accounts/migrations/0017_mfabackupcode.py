@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_verification_session_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MFABackupCode",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("digest", models.CharField(max_length=64)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="mfa_backup_codes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "MFA backup code",
+                "verbose_name_plural": "MFA backup codes",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "digest"),
+                        name="mfabackupcode_user_digest_unique",
+                    )
+                ],
+            },
+        ),
+    ]
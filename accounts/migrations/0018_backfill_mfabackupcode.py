@@ -0,0 +1,55 @@
+# Generated manually to move the plaintext backup codes of UserMFA to
+# MFABackupCode as keyed hashes, in chunks
+
+from django.db import migrations, transaction
+from django.utils.crypto import salted_hmac
+
+# Cada lote se confirma por separado para no mantener locks largos
+BATCH_SIZE = 1000
+
+# Igual que accounts.utils.backup_codes.BACKUP_CODE_SALT
+BACKUP_CODE_SALT = "accounts.mfa_backup_code"
+
+
+def hash_backup_codes(apps, schema_editor):
+    UserMFA = apps.get_model("accounts", "UserMFA")
+    MFABackupCode = apps.get_model("accounts", "MFABackupCode")
+
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserMFA.objects.filter(pk__gt=last_pk, backup_codes__isnull=False)
+                .order_by("pk")
+                .only("pk", "user_id", "backup_codes")[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            MFABackupCode.objects.bulk_create(
+                [
+                    MFABackupCode(
+                        user_id=mfa_config.user_id,
+                        digest=salted_hmac(BACKUP_CODE_SALT, code).hexdigest(),
+                    )
+                    for mfa_config in batch
+                    for code in set(mfa_config.backup_codes or [])
+                ],
+                ignore_conflicts=True,
+            )
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0017_mfabackupcode"),
+    ]
+
+    operations = [
+        # Los hashes no se pueden revertir: al deshacer, los códigos se pierden
+        migrations.RunPython(hash_backup_codes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:47
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0018_backfill_mfabackupcode"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="usermfa",
+            name="backup_codes",
+        ),
+    ]
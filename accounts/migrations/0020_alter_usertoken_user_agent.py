@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0019_remove_usermfa_backup_codes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="usertoken",
+            name="user_agent",
+            field=models.TextField(
+                blank=True,
+                help_text="User-Agent header kept only until the device is parsed",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0020_alter_usertoken_user_agent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="device",
+            name="user_agent",
+            field=models.TextField(
+                blank=True,
+                default="",
+                help_text="A User-Agent header parsed to this device",
+            ),
+        ),
+    ]
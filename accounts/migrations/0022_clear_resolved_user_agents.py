@@ -0,0 +1,77 @@
+# Generated manually to keep one User-Agent header per Device and clear the
+# headers of tokens whose device is already resolved, in chunks
+
+from django.db import migrations, transaction
+
+# Cada lote se confirma por separado para no mantener locks largos
+BATCH_SIZE = 1000
+
+
+def clear_user_agents(apps, schema_editor):
+    Device = apps.get_model("accounts", "Device")
+    UserToken = apps.get_model("accounts", "UserToken")
+
+    # Un header de ejemplo por dispositivo, para calentar la caché de parseo
+    for device in Device.objects.filter(user_agent=""):
+        device.user_agent = (
+            UserToken.objects.filter(device=device)
+            .exclude(user_agent__isnull=True)
+            .exclude(user_agent="")
+            .values_list("user_agent", flat=True)
+            .first()
+            or ""
+        )
+        device.save(update_fields=["user_agent"])
+
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            pks = list(
+                UserToken.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:BATCH_SIZE]
+            )
+            if not pks:
+                break
+
+            UserToken.objects.filter(pk__in=pks, device__isnull=False).update(
+                user_agent=None
+            )
+            UserToken.objects.filter(pk__in=pks, user_agent="").update(user_agent=None)
+
+        last_pk = pks[-1]
+
+
+def restore_user_agents(apps, schema_editor):
+    UserToken = apps.get_model("accounts", "UserToken")
+
+    # El header original no se guardó: se usa el de ejemplo del dispositivo
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                UserToken.objects.filter(pk__gt=last_pk, device__isnull=False)
+                .select_related("device")
+                .order_by("pk")[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+
+            for token in batch:
+                token.user_agent = token.device.user_agent
+            UserToken.objects.bulk_update(batch, ["user_agent"])
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0021_device_user_agent"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_user_agents, restore_user_agents),
+    ]
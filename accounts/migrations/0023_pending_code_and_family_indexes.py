@@ -0,0 +1,76 @@
+# Generated by Django 5.1.4 on 2026-10-18 09:21, edited to change the indexes
+# without locking writes
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations, models
+
+# Nombre generado por Django para el db_index de UserToken.family
+FAMILY_INDEX = "accounts_usertoken_family_40879ce1"
+
+
+def concurrently(schema_editor):
+    # Los índices de una tabla particionada no admiten CONCURRENTLY
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table "
+            "WHERE partrelid = 'accounts_usertoken'::regclass"
+        )
+        return "" if cursor.fetchone() else "CONCURRENTLY "
+
+
+def drop_family_index(apps, schema_editor):
+    schema_editor.execute(
+        f"DROP INDEX {concurrently(schema_editor)}IF EXISTS {FAMILY_INDEX}"
+    )
+
+
+def create_family_index(apps, schema_editor):
+    schema_editor.execute(
+        f"CREATE INDEX {concurrently(schema_editor)}IF NOT EXISTS {FAMILY_INDEX} "
+        'ON "accounts_usertoken" ("family")'
+    )
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY no puede ejecutarse dentro de una
+    # transacción
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0022_clear_resolved_user_agents"),
+    ]
+
+    operations = [
+        # El índice nuevo se crea antes de borrar el anterior
+        AddIndexConcurrently(
+            model_name="verificationcode",
+            index=models.Index(
+                condition=models.Q(("is_used", False)),
+                fields=["user", "-created_at"],
+                name="verificationcode_recent_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="verificationcode",
+            name="verificationcode_pending_idx",
+        ),
+        # Las consultas por sesión filtran is_valid: basta el índice parcial
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_family_index, create_family_index),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="usertoken",
+                    name="family",
+                    field=models.UUIDField(
+                        blank=True,
+                        help_text="Session shared by every rotation of a refresh token",
+                        null=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -4,3 +4,6 @@ from accounts.models.mfa_verification import MFAVerification
 from accounts.models.custom_user import CustomUser
 from accounts.models.verification_code import VerificationCode
 from accounts.models.user_token import UserToken
+from accounts.models.email_outbox import EmailOutbox
+from accounts.models.device import Device
+from accounts.models.mfa_backup_code import MFABackupCode
@@ -6,6 +6,8 @@ from django.contrib.auth.models import AbstractUser
 from django.db.models import BooleanField
 from django.db.models import DateTimeField
 from django.db.models import EmailField
+from django.db.models import Index
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 
@@ -27,3 +29,8 @@ class CustomUser(AbstractUser):
 
         verbose_name = _("user")
         verbose_name_plural = _("users")
+        # Búsquedas sin distinguir mayúsculas del login (__iexact usa UPPER)
+        indexes: ClassVar[list[Index]] = [
+            Index(Upper("email"), name="customuser_email_upper_idx"),
+            Index(Upper("username"), name="customuser_username_upper_idx"),
+        ]
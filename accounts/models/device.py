@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db.models import CharField
+from django.db.models import Model
+from django.db.models import TextField
+from django.db.models import UniqueConstraint
+from django.utils.translation import gettext_lazy as _
+
+
+class Device(Model):
+    """Distinct device, OS and browser that tokens were issued to."""
+
+    device_type = CharField(max_length=50)
+    device_os = CharField(max_length=50)
+    device_browser = CharField(max_length=50)
+    user_agent = TextField(
+        blank=True,
+        default="",
+        help_text=_("A User-Agent header parsed to this device"),
+    )
+
+    class Meta:
+        """Meta class for Device."""
+
+        verbose_name = _("device")
+        verbose_name_plural = _("devices")
+        constraints: ClassVar[list[UniqueConstraint]] = [
+            UniqueConstraint(
+                fields=["device_type", "device_os", "device_browser"],
+                name="device_unique_triple",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return the device, OS and browser."""
+        return f"{self.device_type} / {self.device_os} / {self.device_browser}"
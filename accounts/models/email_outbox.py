@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import EmailField
+from django.db.models import Index
+from django.db.models import Model
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import Q
+from django.db.models import TextField
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class EmailOutbox(Model):
+    """Email written by a request and delivered by the email worker."""
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+
+    recipient = EmailField()
+    subject = CharField(max_length=255)
+    body = TextField()
+    status = CharField(
+        max_length=10,
+        choices=[
+            (STATUS_PENDING, "Pending"),
+            (STATUS_SENT, "Sent"),
+            (STATUS_DEAD, "Dead"),
+        ],
+        default=STATUS_PENDING,
+    )
+    attempts = PositiveSmallIntegerField(default=0)
+    next_attempt_at = DateTimeField(
+        default=timezone.now,
+        help_text=_("Earliest time the worker may try to deliver the email"),
+    )
+    last_error = TextField(blank=True, default="")
+    message_id = CharField(max_length=255, blank=True, default="")
+    created_at = DateTimeField(auto_now_add=True)
+    sent_at = DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """Meta class for EmailOutbox."""
+
+        verbose_name = _("email outbox entry")
+        verbose_name_plural = _("email outbox")
+        # La cola del worker: solo las filas pendientes, por fecha de intento
+        indexes: ClassVar[list[Index]] = [
+            Index(
+                fields=["next_attempt_at"],
+                condition=Q(status="pending"),
+                name="emailoutbox_pending_idx",
+            ),
+        ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db.models import CASCADE
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import ForeignKey
+from django.db.models import Model
+from django.db.models import UniqueConstraint
+from django.utils.translation import gettext_lazy as _
+
+from accounts.models.custom_user import CustomUser
+
+
+class MFABackupCode(Model):
+    """Unused one-time MFA backup code, stored as a keyed hash."""
+
+    user = ForeignKey(CustomUser, on_delete=CASCADE, related_name="mfa_backup_codes")
+    digest = CharField(max_length=64)
+    created_at = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta class for MFABackupCode."""
+
+        verbose_name = _("MFA backup code")
+        verbose_name_plural = _("MFA backup codes")
+        # El índice único sirve la búsqueda y el borrado al consumir un código
+        constraints: ClassVar[list[UniqueConstraint]] = [
+            UniqueConstraint(
+                fields=["user", "digest"],
+                name="mfabackupcode_user_digest_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"MFA backup code for {self.user.email}"
@@ -7,7 +7,9 @@ from django.db.models import BooleanField
 from django.db.models import CharField
 from django.db.models import DateTimeField
 from django.db.models import ForeignKey
+from django.db.models import Index
 from django.db.models import Model
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models.custom_user import CustomUser
@@ -34,6 +36,14 @@ class MFAVerification(Model):
 
         verbose_name = _("MFA verification")
         ordering: ClassVar[list[str]] = ["-created_at"]
+        # Solo las verificaciones pendientes se consultan
+        indexes: ClassVar[list[Index]] = [
+            Index(
+                fields=["user", "method", "code", "expires_at"],
+                condition=Q(is_verified=False),
+                name="mfaverification_pending_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         """Return string representation."""
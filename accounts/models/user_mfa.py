@@ -6,7 +6,6 @@ from django.db.models import BooleanField
 from django.db.models import CharField
 from django.db.models import DateTimeField
 from django.db.models import ForeignKey
-from django.db.models import JSONField
 from django.db.models import Model
 from django.db.models import OneToOneField
 from django.utils.translation import gettext_lazy as _
@@ -33,9 +32,6 @@ class UserMFA(Model):
         blank=True,
         help_text=_("Secret key for TOTP generation"),
     )
-    backup_codes = JSONField(
-        null=True, blank=True, help_text=_("List of one-time backup codes")
-    )
     created_at = DateTimeField(auto_now_add=True)
     updated_at = DateTimeField(auto_now=True)
 
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
 from django.db.models import CASCADE
+from django.db.models import PROTECT
 from django.db.models import BooleanField
 from django.db.models import CharField
 from django.db.models import DateTimeField
 from django.db.models import ForeignKey
+from django.db.models import Index
 from django.db.models import Model
+from django.db.models import Q
 from django.db.models import TextField
+from django.db.models import UUIDField
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models.custom_user import CustomUser
+from accounts.models.device import Device
 
 
 class UserToken(Model):
@@ -17,9 +24,29 @@ class UserToken(Model):
 
     user = ForeignKey(CustomUser, on_delete=CASCADE, related_name="tokens")
     token = TextField()
-    device_type = CharField(max_length=50)
-    device_os = CharField(max_length=50)
-    device_browser = CharField(max_length=50)
+    token_digest = CharField(
+        max_length=64,
+        unique=True,
+        help_text=_("SHA-256 digest of the token, used for lookups"),
+    )
+    family = UUIDField(
+        null=True,
+        blank=True,
+        help_text=_("Session shared by every rotation of a refresh token"),
+    )
+    user_agent = TextField(
+        null=True,
+        blank=True,
+        help_text=_("User-Agent header kept only until the device is parsed"),
+    )
+    device = ForeignKey(
+        Device,
+        on_delete=PROTECT,
+        null=True,
+        blank=True,
+        related_name="tokens",
+        help_text=_("Empty until parsed when User-Agent parsing is lazy"),
+    )
     is_valid = BooleanField(default=True)
     created_at = DateTimeField(auto_now_add=True)
     expires_at = DateTimeField()
@@ -30,3 +57,17 @@ class UserToken(Model):
 
         verbose_name = _("user token")
         verbose_name_plural = _("user tokens")
+        indexes: ClassVar[list[Index]] = [
+            # Sesiones con algún token válido (refresh, logout, revocación)
+            Index(
+                fields=["family"],
+                condition=Q(is_valid=True),
+                name="usertoken_valid_family_idx",
+            ),
+            # Tokens revocados aún no expirados, para el filtro de revocación
+            Index(
+                fields=["expires_at"],
+                condition=Q(is_valid=False, family__isnull=True),
+                name="usertoken_revoked_idx",
+            ),
+        ]
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from typing import ClassVar
+
 from django.db.models import CASCADE
 from django.db.models import BooleanField
 from django.db.models import CharField
 from django.db.models import DateTimeField
 from django.db.models import ForeignKey
+from django.db.models import Index
 from django.db.models import Model
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from accounts.models.custom_user import CustomUser
@@ -28,3 +32,12 @@ class VerificationCode(Model):
 
         verbose_name = _("verification code")
         verbose_name_plural = _("verification codes")
+        # Solo los códigos pendientes se consultan: verificación y reenvío.
+        # Un usuario tiene pocos códigos pendientes, el código se filtra
+        indexes: ClassVar[list[Index]] = [
+            Index(
+                fields=["user", "-created_at"],
+                condition=Q(is_used=False),
+                name="verificationcode_recent_idx",
+            ),
+        ]
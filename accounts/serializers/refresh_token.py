@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from rest_framework.serializers import CharField
+from rest_framework.serializers import Serializer
+
+
+class RefreshToken(Serializer):
+    """Serializer for refreshing an access token."""
+
+    refresh_token = CharField()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.conf import settings
+from rest_framework.serializers import CharField
+from rest_framework.serializers import ListField
+from rest_framework.serializers import Serializer
+from rest_framework.serializers import ValidationError
+
+
+class TokenIntrospection(Serializer):
+    """Serializer for introspecting a batch of tokens."""
+
+    tokens = ListField(child=CharField(), allow_empty=False)
+
+    def validate_tokens(self, tokens: list[str]) -> list[str]:
+        """Limit the batch size."""
+        if len(tokens) > settings.TOKEN_INTROSPECTION_MAX_BATCH:
+            raise ValidationError(
+                f"Ensure this field has no more than "
+                f"{settings.TOKEN_INTROSPECTION_MAX_BATCH} elements."
+            )
+        return tokens
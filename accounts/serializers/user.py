@@ -4,6 +4,7 @@ from typing import ClassVar
 
 from rest_framework.serializers import ModelSerializer
 
+from accounts.auth.password_bulkhead import password_bulkhead
 from accounts.models.custom_user import CustomUser
 
 
@@ -21,10 +22,17 @@ class User(ModelSerializer):
         }
 
     def create(self, validated_data: dict) -> CustomUser:
-        """Create a new user."""
-        user = CustomUser.objects.create_user(
-            email=validated_data["email"],
-            username=validated_data["username"],
-            password=validated_data["password"],
+        """Create a new user.
+
+        Same as ``create_user``, with the password hashed on the hashing pool.
+
+        Raises:
+            HashingBulkheadFullError: If the password hashing queue is full
+        """
+        user = CustomUser(
+            email=CustomUser.objects.normalize_email(validated_data["email"]),
+            username=CustomUser.normalize_username(validated_data["username"]),
+            password=password_bulkhead.make_password(validated_data["password"]),
         )
+        user.save()
         return user
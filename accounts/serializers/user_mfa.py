@@ -21,7 +21,6 @@ class UserMFASerializer(ModelSerializer):
             "is_enabled",
             "default_method",
             "otp_secret",
-            "backup_codes",
             "created_at",
             "updated_at",
         )
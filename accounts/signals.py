@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.auth.invalidation_bus import invalidation_bus
+from accounts.auth.token_cache import token_cache
+from accounts.models.custom_user import CustomUser
+from accounts.models.user_mfa import UserMFA
+from accounts.models.user_token import UserToken
+
+
+def invalidate_user_tokens(user_id: str) -> None:
+    """Drop the cached tokens of the user named by an invalidation key."""
+    token_cache.invalidate_user(int(user_id))
+
+
+# Claves que cada proceso desaloja de sus cachés locales
+invalidation_bus.register("token", token_cache.invalidate)
+invalidation_bus.register("user", invalidate_user_tokens)
+invalidation_bus.register("mfa", invalidate_user_tokens)
+invalidation_bus.register_reset(token_cache.clear)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(
+    sender: type[CustomUser],
+    instance: CustomUser,
+    **kwargs: dict,
+) -> None:
+    """Drop cached tokens of a user whose data changed."""
+    if kwargs.get("created"):
+        # Ningún proceso tiene tokens de un usuario nuevo en caché
+        return
+    invalidation_bus.publish("user", instance.pk)
+
+
+@receiver(post_save, sender=UserToken)
+@receiver(post_delete, sender=UserToken)
+def invalidate_cached_token(
+    sender: type[UserToken],
+    instance: UserToken,
+    **kwargs: dict,
+) -> None:
+    """Drop the cached verdict of a token whose row changed."""
+    if kwargs.get("created"):
+        # Un token recién emitido no está en ninguna caché: sin NOTIFY en el login
+        return
+    invalidation_bus.publish("token", instance.token_digest)
+
+
+@receiver(post_save, sender=UserMFA)
+@receiver(post_delete, sender=UserMFA)
+def invalidate_cached_mfa(
+    sender: type[UserMFA],
+    instance: UserMFA,
+    **kwargs: dict,
+) -> None:
+    """Drop cached state derived from the MFA configuration of a user."""
+    invalidation_bus.publish("mfa", instance.user_id)
@@ -3,11 +3,16 @@ from __future__ import annotations
 from django.urls import path
 
 from accounts.api.configure_mfa import configure_mfa
+from accounts.api.jwks import get as jwks_get
 from accounts.api.list_mfa_methods import get as list_mfa_methods_get
 from accounts.api.login import post as login_post
 from accounts.api.logout import post as logout_post
+from accounts.api.metrics import get as metrics_get
+from accounts.api.refresh_token import post as refresh_token_post
+from accounts.api.regenerate_backup_codes import post as regenerate_backup_codes_post
 from accounts.api.register import post as register_post
 from accounts.api.resend_code import post as resend_code_post
+from accounts.api.token_introspection import post as token_introspection_post
 from accounts.api.verify_code import post as verify_code_post
 from accounts.api.verify_mfa import post as verify_mfa_post
 
@@ -29,6 +34,16 @@ urlpatterns = [
         logout_post,
         name="logout",
     ),
+    path(
+        "token/refresh/",
+        refresh_token_post,
+        name="token-refresh",
+    ),
+    path(
+        "token/introspect/",
+        token_introspection_post,
+        name="token-introspect",
+    ),
     path(
         "verify-code/",
         verify_code_post,
@@ -54,4 +69,19 @@ urlpatterns = [
         verify_mfa_post,
         name="verify-mfa",
     ),
+    path(
+        "mfa/backup-codes/",
+        regenerate_backup_codes_post,
+        name="regenerate-backup-codes",
+    ),
+    path(
+        "metrics/",
+        metrics_get,
+        name="metrics",
+    ),
+    path(
+        ".well-known/jwks.json",
+        jwks_get,
+        name="jwks",
+    ),
 ]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.crypto import salted_hmac
+from pyotp import random_base32 as pyotp_random_base32
+
+from accounts.models.custom_user import CustomUser
+from accounts.models.mfa_backup_code import MFABackupCode
+
+# Separa estos HMAC de cualquier otro derivado de SECRET_KEY
+BACKUP_CODE_SALT = "accounts.mfa_backup_code"
+
+
+def hash_backup_code(code: str, secret: str | None = None) -> str:
+    """Return the keyed digest stored for a backup code.
+
+    An HMAC keyed with ``SECRET_KEY``: a leaked table alone is not enough
+    to try the 8-character codes offline.
+    """
+    return salted_hmac(BACKUP_CODE_SALT, code, secret=secret).hexdigest()
+
+
+def generate_backup_codes(user: CustomUser) -> list[str]:
+    """Replace the user's backup codes with a new set.
+
+    Returns:
+        list: The new codes in plain text, only available now
+    """
+    codes = [pyotp_random_base32()[:8] for _ in range(settings.MFA_BACKUP_CODE_COUNT)]
+    with transaction.atomic():
+        MFABackupCode.objects.filter(user=user).delete()
+        MFABackupCode.objects.bulk_create(
+            [MFABackupCode(user=user, digest=hash_backup_code(code)) for code in codes]
+        )
+    return codes
+
+
+def consume_backup_code(user: CustomUser, code: str) -> bool:
+    """Use up a backup code of the user.
+
+    A single ``DELETE`` on the (user, digest) index: of two concurrent uses
+    of the same code only one deletes the row.
+
+    Returns:
+        bool: Whether the code was valid and unused
+    """
+    # Los códigos generados antes de rotar SECRET_KEY siguen sirviendo
+    digests = [
+        hash_backup_code(code, secret)
+        for secret in [settings.SECRET_KEY, *settings.SECRET_KEY_FALLBACKS]
+    ]
+    deleted, _ = MFABackupCode.objects.filter(user=user, digest__in=digests).delete()
+    return deleted > 0
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TypeVar
+
+from django.db import connection
+from django.db.models import Model
+from django.db.models import QuerySet
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+
+def consume_once(
+    queryset: QuerySet[ModelT],
+    flag: str,
+    **changes: object,
+) -> ModelT | None:
+    """Mark the first row of the queryset as consumed and return it.
+
+    A single ``UPDATE ... WHERE pk = (first row) AND NOT flag RETURNING``
+    sets the boolean ``flag`` (and ``changes``) on the first row that
+    matches the queryset and does not have it set yet. A concurrent call
+    on the same row waits for the row lock, re-checks ``flag`` and updates
+    nothing, so each row is consumed exactly once.
+
+    Args:
+        queryset: Candidate rows, in order of preference
+        flag: Boolean field set once the row is consumed
+        changes: Other fields to set on the consumed row
+
+    Returns:
+        Model | None: The consumed row, or None if nothing matched
+    """
+    model = queryset.model
+    meta = model._meta
+    quote_name = connection.ops.quote_name
+
+    candidate_sql, candidate_params = (
+        queryset.filter(**{flag: False}).values("pk")[:1].query.sql_with_params()
+    )
+    assignments = [f"{quote_name(meta.get_field(flag).column)} = true"]
+    params: list = []
+    for name, value in changes.items():
+        field = meta.get_field(name)
+        assignments.append(f"{quote_name(field.column)} = %s")
+        params.append(field.get_db_prep_save(value, connection))
+
+    fields = meta.concrete_fields
+    sql = (
+        f"UPDATE {quote_name(meta.db_table)} SET {', '.join(assignments)} "
+        f"WHERE {quote_name(meta.pk.column)} = ({candidate_sql}) "
+        f"AND NOT {quote_name(meta.get_field(flag).column)} "
+        f"RETURNING {', '.join(quote_name(field.column) for field in fields)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *candidate_params])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return model.from_db(
+        connection.alias,
+        [field.attname for field in fields],
+        row,
+    )
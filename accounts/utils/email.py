@@ -5,15 +5,19 @@ from random import choices as random_choices
 from string import digits as string_digits
 from typing import Any
 
-from boto3 import client as boto3_client
-from botocore.exceptions import ClientError
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 
+from accounts.models.custom_user import CustomUser
 from accounts.models.verification_code import VerificationCode
+from accounts.utils.email_outbox import enqueue_email
+from accounts.utils.email_transports import EmailDeliveryError
+from accounts.utils.email_transports import get_email_transport
 from utils.logger import logger
+from utils.metrics import metrics
 from utils.result_as_values import Result
 
 
@@ -52,39 +56,7 @@ def send_verification_email(
         type=code_type,
     )
 
-    subject = "Your Verification Code"
-    message = f"Your verification code is: {code}\nThis code will expire in 10 minutes."
-
-    if settings.SEND_EMAIL:
-        try:
-            client_params = {
-                "service_name": "ses",
-                "aws_access_key_id": settings.AWS_ACCESS_KEY_ID,
-                "aws_secret_access_key": settings.AWS_SECRET_ACCESS_KEY,
-                "region_name": settings.AWS_REGION_NAME,
-            }
-
-            # Create a new SES client
-            ses_client = boto3_client(
-                **client_params,
-            )
-
-            send_email_params = {
-                "Source": settings.DEFAULT_FROM_EMAIL,
-                "Destination": {"ToAddresses": ["pacg1991@gmail.com"]},
-                "Message": {
-                    "Subject": {"Data": subject, "Charset": "UTF-8"},
-                    "Body": {"Text": {"Data": message, "Charset": "UTF-8"}},
-                },
-            }
-
-            # Send email through SES
-            response = ses_client.send_email(**send_email_params)
-            logger.info(f"Email sent! Message ID: {response['MessageId']}")
-        except ClientError as e:
-            logger.info(f"An error occurred: {e.response['Error']['Message']}")
-            # Here you might want to handle the error appropriately,
-            # such as logging it or raising a custom exception
+    deliver_verification_code(user, code)
 
     return Result.ok(
         {
@@ -92,3 +64,93 @@ def send_verification_email(
             "expires_at": expires_at,
         }
     )
+
+
+def resend_verification_email(
+    user: User | AbstractUser,
+) -> Result[dict[str, Any]]:
+    """Resend the pending verification code, at most once per interval.
+
+    Within ``VERIFICATION_RESEND_INTERVAL`` seconds of the last send the
+    pending code is reused and nothing is sent. Resends of the same user are
+    serialized, so a burst of requests produces at most one new code.
+    """
+    interval = timedelta(seconds=settings.VERIFICATION_RESEND_INTERVAL)
+    with transaction.atomic():
+        # Bloquear al usuario serializa los reenvíos concurrentes
+        list(CustomUser.objects.select_for_update().filter(pk=user.pk))
+
+        pending = (
+            VerificationCode.objects.filter(user=user, is_used=False)
+            .order_by("-created_at")
+            .first()
+        )
+        if not pending:
+            return Result.fail(
+                "no_pending_verification",
+                "No pending verification found",
+            )
+
+        now = timezone.now()
+        if pending.created_at + interval > now and pending.expires_at > now:
+            metrics.increment("verification_code.resend_coalesced")
+            return Result.ok(
+                {
+                    "code": pending.code,
+                    "expires_at": pending.expires_at,
+                    "resent": False,
+                    "next_resend_at": pending.created_at + interval,
+                }
+            )
+
+        data = send_verification_email(user, pending.type).value
+        return Result.ok(
+            {
+                **data,
+                "resent": True,
+                "next_resend_at": timezone.now() + interval,
+            }
+        )
+
+
+def deliver_verification_code(
+    user: User | AbstractUser,
+    code: str,
+) -> None:
+    """Email the code to the user.
+
+    With ``EMAIL_DELIVERY = "outbox"`` the email is written to the outbox in
+    the current transaction and delivered by the email worker. With
+    ``"sync"`` it is sent once the current transaction commits.
+    """
+    if not settings.SEND_EMAIL:
+        return
+
+    subject = "Your Verification Code"
+    message = f"Your verification code is: {code}\nThis code will expire in 10 minutes."
+
+    if settings.EMAIL_DELIVERY == "outbox":
+        enqueue_email(user.email, subject, message)
+    else:
+        transaction.on_commit(lambda: send_email(user.email, subject, message))
+
+
+def send_email(recipient: str, subject: str, body: str) -> Result[str]:
+    """Send an email right away through the configured transport.
+
+    When the transport is slow, failing or behind an open circuit the email
+    is handed to the outbox instead and a ``email_degraded`` failure is
+    returned, so the caller never waits longer than the send budget.
+    """
+    try:
+        message_id = get_email_transport().send(recipient, subject, body)
+    except EmailDeliveryError as e:
+        if not e.retryable:
+            logger.info(f"An error occurred: {e}")
+            return Result.fail("email_rejected", str(e))
+        enqueue_email(recipient, subject, body)
+        metrics.increment("email_transport.degraded")
+        logger.info(f"Email delivery degraded, queued for retry: {e}")
+        return Result.fail("email_degraded", str(e))
+    logger.info(f"Email sent! Message ID: {message_id}")
+    return Result.ok(message_id)
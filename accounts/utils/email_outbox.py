@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from random import uniform as random_uniform
+from threading import Event
+from time import perf_counter
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.utils.email_transports import EmailDeliveryError
+from accounts.utils.email_transports import EmailTransport
+from accounts.utils.email_transports import OutgoingEmail
+from accounts.utils.email_transports import TransportUnavailableError
+from accounts.utils.email_transports import get_email_transport
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+def enqueue_email(recipient: str, subject: str, body: str) -> EmailOutbox:
+    """Write the email to the outbox.
+
+    Runs in the caller's transaction, so the email only exists if the
+    request that produced it commits.
+    """
+    return EmailOutbox.objects.create(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Return the exponential backoff, with jitter, after a failed attempt."""
+    delay = min(
+        settings.EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_RETRY_MAX_DELAY,
+    )
+    return timedelta(seconds=delay * random_uniform(0.8, 1.2))
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of one delivery attempt."""
+
+    email: EmailOutbox
+    message_id: str = ""
+    error: EmailDeliveryError | None = None
+
+
+class EmailOutboxWorker:
+    """Drain the email outbox through a transport.
+
+    Rows are claimed with ``SKIP LOCKED`` and leased by moving their next
+    attempt forward, so several workers can run at once and a crashed
+    worker's rows become available again when the lease ends. A batch is
+    split between the threads and each share goes to the transport in one
+    ``send_many`` call, outside any transaction.
+    """
+
+    def __init__(
+        self,
+        transport: EmailTransport | None = None,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        """Initialize the worker, falling back to settings for each option."""
+        self.transport = transport or get_email_transport()
+        self.concurrency = concurrency or settings.EMAIL_WORKER_CONCURRENCY
+        self.batch_size = batch_size or settings.EMAIL_WORKER_BATCH_SIZE
+        self.stopped = Event()
+
+    def run(self, poll_interval: float, once: bool = False) -> None:
+        """Process batches until stopped, or until the outbox is drained."""
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency,
+                thread_name_prefix="email-worker",
+            ) as executor:
+                while not self.stopped.is_set():
+                    close_old_connections()
+                    processed = self.process_batch(executor)
+                    if processed:
+                        continue
+                    if once:
+                        break
+                    self.stopped.wait(poll_interval)
+        finally:
+            self.transport.close()
+
+    def stop(self) -> None:
+        """Finish the current batch and stop."""
+        self.stopped.set()
+
+    def process_batch(self, executor: ThreadPoolExecutor | None = None) -> int:
+        """Deliver one batch of due emails.
+
+        Returns:
+            int: Number of emails attempted
+        """
+        emails = self.claim()
+        if not emails:
+            return 0
+
+        chunks = [emails[i :: self.concurrency] for i in range(self.concurrency)]
+        chunks = [chunk for chunk in chunks if chunk]
+        if executor is None:
+            results = [self.deliver(chunk) for chunk in chunks]
+        else:
+            results = list(executor.map(self.deliver, chunks))
+        for chunk_results in results:
+            for result in chunk_results:
+                self.record(result)
+        return len(emails)
+
+    def claim(self) -> list[EmailOutbox]:
+        """Lease the next due emails to this worker."""
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=EmailOutbox.STATUS_PENDING,
+                    next_attempt_at__lte=now,
+                )
+                .order_by("next_attempt_at")[: self.batch_size]
+            )
+            if not emails:
+                return []
+
+            lease_until = now + timedelta(seconds=settings.EMAIL_WORKER_LEASE)
+            for email in emails:
+                email.attempts += 1
+                email.next_attempt_at = lease_until
+            EmailOutbox.objects.bulk_update(emails, ["attempts", "next_attempt_at"])
+        return emails
+
+    def deliver(self, emails: list[EmailOutbox]) -> list[DeliveryResult]:
+        """Send emails through the transport in one call."""
+        started = perf_counter()
+        sent = self.transport.send_many(
+            [
+                OutgoingEmail(email.recipient, email.subject, email.body)
+                for email in emails
+            ]
+        )
+        elapsed = perf_counter() - started
+        metrics.observe("email_outbox.delivery_seconds", elapsed / len(emails))
+
+        results = []
+        for email, outcome in zip(emails, sent, strict=True):
+            if isinstance(outcome, EmailDeliveryError):
+                results.append(DeliveryResult(email, error=outcome))
+            else:
+                results.append(DeliveryResult(email, message_id=outcome))
+        return results
+
+    def record(self, result: DeliveryResult) -> None:
+        """Store the outcome of a delivery attempt."""
+        email = result.email
+        if result.error is None:
+            email.status = EmailOutbox.STATUS_SENT
+            email.message_id = result.message_id
+            email.sent_at = timezone.now()
+            email.last_error = ""
+            # El cuerpo lleva el código de verificación: no se guarda enviado
+            email.body = ""
+            metrics.increment("email_outbox.sent")
+        elif isinstance(result.error, TransportUnavailableError):
+            # El circuito está abierto: no hubo intento, no se descuenta
+            email.attempts -= 1
+            email.next_attempt_at = timezone.now() + timedelta(
+                seconds=settings.EMAIL_BREAKER_RESET_TIMEOUT
+            )
+            email.last_error = str(result.error)
+            metrics.increment("email_outbox.deferred")
+        elif (
+            not result.error.retryable or email.attempts >= settings.EMAIL_MAX_ATTEMPTS
+        ):
+            email.status = EmailOutbox.STATUS_DEAD
+            email.last_error = str(result.error)
+            metrics.increment("email_outbox.dead")
+            logger.error(
+                "Email moved to dead letter",
+                extra={"email_id": email.pk, "error": str(result.error)},
+            )
+        else:
+            email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+            email.last_error = str(result.error)
+            metrics.increment("email_outbox.retried")
+
+        email.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "body",
+                "message_id",
+                "sent_at",
+                "last_error",
+                "next_attempt_at",
+            ]
+        )
@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from email.utils import make_msgid
+from functools import cache
+from json import dumps as json_dumps
+from smtplib import SMTPException
+from smtplib import SMTPRecipientsRefused
+from smtplib import SMTPResponseException
+from smtplib import SMTPServerDisconnected
+from threading import Lock
+from threading import local
+from uuid import uuid4
+
+from boto3 import client as boto3_client
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.utils import DNS_NAME
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from utils.circuit_breaker import CircuitBreaker
+from utils.circuit_breaker import CircuitOpenError
+from utils.logger import logger
+from utils.metrics import metrics
+
+# Errores de SES que no se resuelven reintentando el mismo mensaje
+PERMANENT_SES_ERRORS = frozenset(
+    {
+        "MessageRejected",
+        "MailFromDomainNotVerified",
+        "InvalidParameterValue",
+        "AccountSendingPausedException",
+    }
+)
+
+# Estados de un destino de SendBulkTemplatedEmail que pueden reintentarse
+RETRYABLE_SES_BULK_STATUSES = frozenset(
+    {
+        "Failed",
+        "TransientFailure",
+        "AccountThrottled",
+        "AccountDailyQuotaExceeded",
+    }
+)
+
+# Límite de destinos por llamada a SendBulkTemplatedEmail
+SES_BULK_MAX_DESTINATIONS = 50
+
+# Envíos terminados después de su timeout que se recuerdan para no repetirlos
+LATE_DELIVERIES_MAX = 1000
+
+
+class EmailDeliveryError(Exception):
+    """Raised by a transport when an email could not be delivered."""
+
+    def __init__(self, message: str, retryable: bool = True) -> None:
+        """Initialize the error.
+
+        Args:
+            message: Description of the failure
+            retryable: Whether delivering the same email later may succeed
+        """
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TransportUnavailableError(EmailDeliveryError):
+    """Returned while the circuit is open: the email was not attempted."""
+
+
+@dataclass(frozen=True)
+class OutgoingEmail:
+    """Email handed to a transport."""
+
+    recipient: str
+    subject: str
+    body: str
+
+
+class EmailTransport(ABC):
+    """Delivers emails and returns the provider message ids.
+
+    Transports are built once per process and shared by the worker threads.
+    """
+
+    @abstractmethod
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Deliver one email.
+
+        Raises:
+            EmailDeliveryError: If the email was not delivered
+        """
+
+    def send_many(self, emails: list[OutgoingEmail]) -> list[str | EmailDeliveryError]:
+        """Deliver several emails, reusing whatever the transport can.
+
+        Returns:
+            list: The message id, or the error, of each email in order
+        """
+        results: list[str | EmailDeliveryError] = []
+        for email in emails:
+            try:
+                results.append(self.send(email.recipient, email.subject, email.body))
+            except EmailDeliveryError as e:
+                results.append(e)
+        return results
+
+    def close(self) -> None:  # noqa: B027
+        """Release the connections kept open between calls, if any."""
+
+
+class SESTransport(EmailTransport):
+    """Transport through Amazon SES.
+
+    One client per process: credentials are resolved once and the HTTPS
+    connections stay in a keep-alive pool sized for the worker threads.
+    With ``EMAIL_SES_TEMPLATE`` set, ``send_many`` sends up to 50 emails
+    per ``SendBulkTemplatedEmail`` call.
+    """
+
+    def __init__(self) -> None:
+        """Create the SES client."""
+        self.client = boto3_client(
+            service_name="ses",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION_NAME,
+            config=Config(
+                max_pool_connections=settings.EMAIL_WORKER_CONCURRENCY,
+                tcp_keepalive=True,
+                connect_timeout=settings.EMAIL_CONNECT_TIMEOUT,
+                read_timeout=settings.EMAIL_TIMEOUT,
+                # Sin reintentos ocultos: los hace el outbox, con backoff
+                retries={"mode": "standard", "max_attempts": 1},
+            ),
+        )
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Deliver the email through SES."""
+        try:
+            response = self.client.send_email(
+                Source=settings.DEFAULT_FROM_EMAIL,
+                Destination={"ToAddresses": [recipient]},
+                Message={
+                    "Subject": {"Data": subject, "Charset": "UTF-8"},
+                    "Body": {"Text": {"Data": body, "Charset": "UTF-8"}},
+                },
+            )
+        except ClientError as e:
+            raise self._client_error(e) from e
+        except BotoCoreError as e:
+            raise EmailDeliveryError(str(e)) from e
+        return response["MessageId"]
+
+    def send_many(self, emails: list[OutgoingEmail]) -> list[str | EmailDeliveryError]:
+        """Deliver the emails in bulk calls, if a template is configured."""
+        if not settings.EMAIL_SES_TEMPLATE:
+            return super().send_many(emails)
+
+        results: list[str | EmailDeliveryError] = []
+        for start in range(0, len(emails), SES_BULK_MAX_DESTINATIONS):
+            results.extend(
+                self._send_bulk(emails[start : start + SES_BULK_MAX_DESTINATIONS])
+            )
+        return results
+
+    def _send_bulk(self, emails: list[OutgoingEmail]) -> list[str | EmailDeliveryError]:
+        """Deliver up to 50 emails in one templated call."""
+        try:
+            response = self.client.send_bulk_templated_email(
+                Source=settings.DEFAULT_FROM_EMAIL,
+                Template=settings.EMAIL_SES_TEMPLATE,
+                DefaultTemplateData=json_dumps({"subject": "", "body": ""}),
+                Destinations=[
+                    {
+                        "Destination": {"ToAddresses": [email.recipient]},
+                        "ReplacementTemplateData": json_dumps(
+                            {"subject": email.subject, "body": email.body}
+                        ),
+                    }
+                    for email in emails
+                ],
+            )
+        except ClientError as e:
+            return [self._client_error(e) for _ in emails]
+        except BotoCoreError as e:
+            return [EmailDeliveryError(str(e)) for _ in emails]
+
+        results: list[str | EmailDeliveryError] = []
+        for status in response["Status"]:
+            if status["Status"] == "Success":
+                results.append(status["MessageId"])
+            else:
+                results.append(
+                    EmailDeliveryError(
+                        f"{status['Status']}: {status.get('Error', '')}",
+                        retryable=status["Status"] in RETRYABLE_SES_BULK_STATUSES,
+                    )
+                )
+        return results
+
+    @staticmethod
+    def _client_error(error: ClientError) -> EmailDeliveryError:
+        """Turn an SES API error into a delivery error."""
+        code = error.response["Error"]["Code"]
+        return EmailDeliveryError(
+            f"{code}: {error.response['Error']['Message']}",
+            retryable=code not in PERMANENT_SES_ERRORS,
+        )
+
+
+class DjangoTransport(EmailTransport):
+    """Transport through Django's ``EMAIL_BACKEND`` (SMTP, console, ...).
+
+    Each thread keeps one backend connection open across calls, so a worker
+    thread connects once and not once per batch. A connection is reopened
+    after an error, or when the server dropped it while idle.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without connections, they open on first use."""
+        self._local = local()
+        self._connections: list[BaseEmailBackend] = []
+        self._lock = Lock()
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Deliver one email through the email backend."""
+        result = self.send_many([OutgoingEmail(recipient, subject, body)])[0]
+        if isinstance(result, EmailDeliveryError):
+            raise result
+        return result
+
+    def send_many(self, emails: list[OutgoingEmail]) -> list[str | EmailDeliveryError]:
+        """Deliver the emails over this thread's backend connection."""
+        connection = self._connection()
+        return [self._send(connection, email) for email in emails]
+
+    def close(self) -> None:
+        """Close every thread's connection; they reopen on next use."""
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            self._close(connection)
+
+    def _connection(self) -> BaseEmailBackend:
+        """Return this thread's backend connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _send(
+        self, connection: BaseEmailBackend, email: OutgoingEmail
+    ) -> str | EmailDeliveryError:
+        """Send one email, closing the connection after a failure."""
+        message_id = make_msgid(domain=DNS_NAME.get_fqdn())
+        message = EmailMessage(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email.recipient],
+            headers={"Message-ID": message_id},
+            connection=connection,
+        )
+        try:
+            try:
+                # Abierta aquí, send() no la cierra después de cada mensaje
+                connection.open()
+                message.send()
+            except SMTPServerDisconnected:
+                # El servidor cerró la conexión inactiva: se abre otra
+                self._close(connection)
+                connection.open()
+                message.send()
+        except SMTPRecipientsRefused as e:
+            return EmailDeliveryError(str(e.recipients), retryable=False)
+        except SMTPResponseException as e:
+            self._close(connection)
+            # 4xx es temporal, 5xx es un rechazo definitivo
+            return EmailDeliveryError(
+                f"{e.smtp_code}: {e.smtp_error!r}",
+                retryable=e.smtp_code < 500,  # noqa: PLR2004
+            )
+        except (SMTPException, OSError) as e:
+            self._close(connection)
+            return EmailDeliveryError(str(e))
+        return message_id
+
+    @staticmethod
+    def _close(connection: BaseEmailBackend) -> None:
+        """Close the connection, ignoring a server that already hung up."""
+        try:
+            connection.close()
+        except (SMTPException, OSError):
+            # El backend ya descartó la conexión; la próxima se abre de nuevo
+            pass
+
+
+class ConsoleTransport(EmailTransport):
+    """Transport that logs emails instead of sending them (local development)."""
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Log the email."""
+        message_id = f"console-{uuid4().hex}"
+        logger.info(
+            "Email",
+            extra={
+                "message_id": message_id,
+                "recipient": recipient,
+                "subject": subject,
+                "body": body,
+            },
+        )
+        return message_id
+
+
+@dataclass
+class SentEmail:
+    """Email kept by the memory transport."""
+
+    message_id: str
+    recipient: str
+    subject: str
+    body: str
+
+
+class MemoryTransport(EmailTransport):
+    """Fake SES that keeps emails in memory (tests).
+
+    ``failures`` queues errors raised by the next sends, in order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty mailbox."""
+        self.sent: list[SentEmail] = []
+        self.failures: list[EmailDeliveryError] = []
+        self._lock = Lock()
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Keep the email, or raise the next queued failure."""
+        with self._lock:
+            if self.failures:
+                raise self.failures.pop(0)
+            email = SentEmail(f"memory-{uuid4().hex}", recipient, subject, body)
+            self.sent.append(email)
+        return email.message_id
+
+
+class GuardedTransport(EmailTransport):
+    """Transport wrapper with a time budget and a circuit breaker.
+
+    Calls run on a small pool of their own and are abandoned after
+    ``timeout`` seconds per email, whatever the underlying client does.
+    Timeouts and retryable errors count as failures; once the breaker opens,
+    sends fail immediately with ``TransportUnavailableError`` until a probe
+    succeeds.
+
+    An abandoned call keeps running and may still deliver its emails. Those
+    deliveries are remembered, and sending the same email again through
+    this transport returns the late message id instead of a second email.
+    This only covers retries in the same process: an email that a web
+    request handed to the outbox after a timeout can still arrive twice.
+    """
+
+    def __init__(
+        self,
+        transport: EmailTransport,
+        breaker: CircuitBreaker,
+        timeout: float,
+        max_workers: int,
+    ) -> None:
+        """Wrap the transport."""
+        self.transport = transport
+        self.breaker = breaker
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="email-send",
+        )
+        self._late_deliveries: OrderedDict[OutgoingEmail, str] = OrderedDict()
+        self._lock = Lock()
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Deliver one email within the budget."""
+        result = self.send_many([OutgoingEmail(recipient, subject, body)])[0]
+        if isinstance(result, EmailDeliveryError):
+            raise result
+        return result
+
+    def send_many(self, emails: list[OutgoingEmail]) -> list[str | EmailDeliveryError]:
+        """Deliver the emails within the budget, unless the circuit is open.
+
+        Emails already delivered by an abandoned call are not sent again.
+        """
+        results: list[str | EmailDeliveryError | None] = [
+            self._pop_late_delivery(email) for email in emails
+        ]
+        pending = [
+            email
+            for email, result in zip(emails, results, strict=True)
+            if result is None
+        ]
+        if pending:
+            sent = iter(self._send_guarded(pending))
+            results = [next(sent) if result is None else result for result in results]
+        return results
+
+    def _send_guarded(
+        self, emails: list[OutgoingEmail]
+    ) -> list[str | EmailDeliveryError]:
+        """Send through the breaker and within the budget."""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            return [TransportUnavailableError(str(e)) for _ in emails]
+
+        future = self._executor.submit(self.transport.send_many, emails)
+        try:
+            results = future.result(timeout=self.timeout * len(emails))
+        except FutureTimeoutError:
+            self.breaker.record_failure()
+            metrics.increment("email_transport.timeouts")
+            future.add_done_callback(
+                lambda late: self._record_late_deliveries(emails, late)
+            )
+            return [
+                EmailDeliveryError(f"Email transport timed out after {self.timeout}s")
+                for _ in emails
+            ]
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        delivered = [
+            result
+            for result in results
+            if not isinstance(result, EmailDeliveryError) or not result.retryable
+        ]
+        if delivered:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return results
+
+    def close(self) -> None:
+        """Close the connections of the wrapped transport."""
+        self.transport.close()
+
+    def _record_late_deliveries(
+        self, emails: list[OutgoingEmail], future: Future
+    ) -> None:
+        """Remember the emails an abandoned call delivered after all."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            for email, result in zip(emails, future.result(), strict=True):
+                if isinstance(result, EmailDeliveryError):
+                    continue
+                self._late_deliveries[email] = result
+                if len(self._late_deliveries) > LATE_DELIVERIES_MAX:
+                    self._late_deliveries.popitem(last=False)
+                metrics.increment("email_transport.late_deliveries")
+
+    def _pop_late_delivery(self, email: OutgoingEmail) -> str | None:
+        """Return and forget the message id of a late delivery of the email."""
+        with self._lock:
+            message_id = self._late_deliveries.pop(email, None)
+        if message_id is not None:
+            metrics.increment("email_transport.duplicates_avoided")
+        return message_id
+
+
+TRANSPORTS = {
+    "ses": SESTransport,
+    "django": DjangoTransport,
+    "console": ConsoleTransport,
+    "memory": MemoryTransport,
+}
+
+
+@cache
+def get_email_transport() -> EmailTransport:
+    """Return the transport configured in ``EMAIL_TRANSPORT``, guarded."""
+    return GuardedTransport(
+        TRANSPORTS[settings.EMAIL_TRANSPORT](),
+        breaker=CircuitBreaker(
+            "email_transport",
+            failure_threshold=settings.EMAIL_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.EMAIL_BREAKER_RESET_TIMEOUT,
+        ),
+        timeout=settings.EMAIL_SEND_TIMEOUT,
+        max_workers=settings.EMAIL_WORKER_CONCURRENCY,
+    )
+
+
+@receiver(setting_changed)
+def reset_email_transport(setting: str, **kwargs: dict) -> None:
+    """Build the transport again when the settings change (tests)."""
+    if setting in {
+        "EMAIL_TRANSPORT",
+        "EMAIL_TIMEOUT",
+        "EMAIL_CONNECT_TIMEOUT",
+        "EMAIL_SEND_TIMEOUT",
+        "EMAIL_BREAKER_FAILURE_THRESHOLD",
+        "EMAIL_BREAKER_RESET_TIMEOUT",
+        "EMAIL_WORKER_CONCURRENCY",
+        "AWS_REGION_NAME",
+    }:
+        get_email_transport.cache_clear()
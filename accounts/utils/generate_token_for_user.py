@@ -1,42 +1,57 @@
 from __future__ import annotations
 
+from datetime import datetime
 from datetime import timedelta
 from typing import Any
+from uuid import UUID
+from uuid import uuid4
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import User
 from django.utils import timezone
-from jwt import encode as jwt_encode
 from rest_framework.request import Request
-from ua_parser import user_agent_parser
 
 from accounts.models.user_token import UserToken
+from accounts.utils.hash_token import hash_token
+from accounts.utils.jwt_tokens import encode_token
+from accounts.utils.user_agent import device_resolver
+from accounts.utils.user_agent import user_agent_cache
 from utils.result_as_values import Result
 
+# Vida de los tokens de sesión cuando no se usan access y refresh tokens
+SESSION_TOKEN_LIFETIME = timedelta(days=7)
+
 
 def generate_token_for_user(
     user: User | AbstractUser,
     request: Request,
     is_temporary: bool = False,
+    family: UUID | None = None,
 ) -> Result[dict[str, Any]]:
     """Generate a JWT token and UserToken instance for a given user.
 
+    With ``JWT_STATELESS_ACCESS_TOKENS`` enabled, or when rotating a refresh
+    token, a full login yields a short-lived access token that is verified
+    without the database plus a refresh token stored as the UserToken.
+
     Args:
         user: The user instance to generate token for
         request: The request object to extract user agent info
         is_temporary: If True, generates a short-lived token for verification
+        family: Session of the refresh token being rotated, if any
 
     Returns:
-        tuple: (jwt_token, user_token_instance)
+        dict: ``token``, ``user_token`` and, for access tokens, ``refresh_token``
     """
-    # Parse user agent
-    ua_string = request.META.get("HTTP_USER_AGENT", "")
-    parsed_ua = user_agent_parser.Parse(ua_string)
+    if not is_temporary and (
+        family is not None or settings.JWT_STATELESS_ACCESS_TOKENS
+    ):
+        return generate_access_and_refresh_tokens(user, request, family or uuid4())
 
     # Set expiration based on token type
     expires_at = timezone.now() + (
-        timedelta(minutes=10) if is_temporary else timedelta(days=7)
+        timedelta(minutes=10) if is_temporary else SESSION_TOKEN_LIFETIME
     )
 
     # Create JWT token
@@ -46,27 +61,99 @@ def generate_token_for_user(
         "is_temporary": is_temporary,
         "exp": expires_at.timestamp(),
     }
-    token = jwt_encode(
-        token_payload,
-        settings.SECRET_KEY,
-        algorithm="HS256",
+    token = encode_token(token_payload)
+
+    user_token = create_user_token(user, request, token, expires_at)
+
+    return Result.ok(
+        {
+            "token": token,
+            "user_token": user_token,
+        }
     )
 
-    # Create UserToken instance
-    user_token = UserToken.objects.create(
-        user=user,
-        token=token,
-        device_type=parsed_ua["device"]["family"],
-        device_os=f"{parsed_ua['os']['family']} {parsed_ua['os']['major']}",
-        device_browser=(
-            f"{parsed_ua['user_agent']['family']}" f"{parsed_ua['user_agent']['major']}"
-        ),
-        expires_at=expires_at,
+
+def generate_access_and_refresh_tokens(
+    user: User | AbstractUser,
+    request: Request,
+    family: UUID,
+) -> Result[dict[str, Any]]:
+    """Generate a stateless access token and a stored refresh token.
+
+    Args:
+        user: The user instance to generate tokens for
+        request: The request object to extract user agent info
+        family: Session shared by every rotation of the refresh token
+    """
+    now = timezone.now()
+    access_expires_at = now + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
+    refresh_expires_at = now + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME)
+
+    access_token = encode_token(
+        {
+            "user_id": user.id,
+            "email": user.email,
+            "username": user.username,
+            "is_temporary": False,
+            "token_type": "access",
+            "sid": str(family),
+            "jti": uuid4().hex,
+            "exp": access_expires_at.timestamp(),
+        }
+    )
+    refresh_token = encode_token(
+        {
+            "user_id": user.id,
+            "token_type": "refresh",
+            "sid": str(family),
+            "jti": uuid4().hex,
+            "exp": refresh_expires_at.timestamp(),
+        }
+    )
+
+    user_token = create_user_token(
+        user,
+        request,
+        refresh_token,
+        refresh_expires_at,
+        family=family,
     )
 
     return Result.ok(
         {
-            "token": token,
+            "token": access_token,
+            "refresh_token": refresh_token,
             "user_token": user_token,
         }
     )
+
+
+def create_user_token(
+    user: User | AbstractUser,
+    request: Request,
+    token: str,
+    expires_at: datetime,
+    family: UUID | None = None,
+) -> UserToken:
+    """Store the token with the device it was issued to.
+
+    With ``USER_AGENT_PARSE_LAZY`` only the raw header is stored and the
+    device is parsed when it is read (see ``token_device``). Otherwise the
+    header is not stored with the token: the ``Device`` row keeps one.
+    """
+    ua_string = request.META.get("HTTP_USER_AGENT", "")
+    device_id = None
+    if not settings.USER_AGENT_PARSE_LAZY:
+        device_id = device_resolver.resolve(
+            user_agent_cache.parse(ua_string), ua_string
+        )
+
+    return UserToken.objects.create(
+        user=user,
+        token=token,
+        token_digest=hash_token(token),
+        family=family,
+        user_agent=ua_string if device_id is None else None,
+        device_id=device_id,
+        expires_at=expires_at,
+    )
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from hashlib import sha256 as hashlib_sha256
+
+
+def hash_token(token: str) -> str:
+    """Return the fixed-width SHA-256 hex digest used to look up a token.
+
+    The raw JWT is never used as a lookup key: ``UserToken.token_digest`` holds
+    this digest in a uniquely indexed column instead.
+    """
+    return hashlib_sha256(token.encode()).hexdigest()
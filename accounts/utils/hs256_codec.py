@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from base64 import urlsafe_b64decode as base64_urlsafe_b64decode
+from base64 import urlsafe_b64encode as base64_urlsafe_b64encode
+from binascii import Error as binascii_Error
+from functools import lru_cache
+from hashlib import sha256 as hashlib_sha256
+from hmac import HMAC
+from hmac import compare_digest as hmac_compare_digest
+from json import dumps as json_dumps
+from json import loads as json_loads
+from time import time
+from typing import Any
+
+from jwt import DecodeError as jwt_DecodeError
+from jwt import ExpiredSignatureError as jwt_ExpiredSignatureError
+from jwt import InvalidSignatureError as jwt_InvalidSignatureError
+from jwt import decode as jwt_decode
+from jwt import encode as jwt_encode
+from jwt.algorithms import HMACAlgorithm as jwt_HMACAlgorithm
+
+# Cabecera tal como la serializa PyJWT: claves ordenadas y sin espacios
+HEADER_SEGMENT = base64_urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+# Claims que emite generate_token_for_user, cualquier otro pasa por PyJWT
+CLAIMS = frozenset(
+    {
+        "user_id",
+        "email",
+        "username",
+        "is_temporary",
+        "token_type",
+        "sid",
+        "jti",
+        "exp",
+    }
+)
+
+
+def base64url_encode(data: bytes) -> bytes:
+    """Encode bytes as unpadded base64url."""
+    return base64_urlsafe_b64encode(data).rstrip(b"=")
+
+
+def base64url_decode(data: bytes) -> bytes:
+    """Decode unpadded base64url bytes."""
+    return base64_urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+class HS256Codec:
+    """HS256 JWT codec specialised for the claims issued by this service.
+
+    The header segment is encoded once and the HMAC key is prepared once, so
+    every token only pays for serializing the payload and one HMAC. Tokens
+    are byte-for-byte identical to ``jwt.encode`` and anything outside the
+    fixed claim set is delegated to PyJWT.
+    """
+
+    def __init__(self, secret: str | bytes) -> None:
+        """Prepare the HMAC key, validated the same way PyJWT does."""
+        self._secret = secret
+        self._hmac = HMAC(
+            jwt_HMACAlgorithm(jwt_HMACAlgorithm.SHA256).prepare_key(secret),
+            digestmod=hashlib_sha256,
+        )
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        """Sign the payload.
+
+        Returns:
+            str: The encoded token
+        """
+        if not self._handles(payload):
+            return jwt_encode(payload, self._secret, algorithm="HS256")
+
+        signing_input = (
+            HEADER_SEGMENT
+            + b"."
+            + base64url_encode(json_dumps(payload, separators=(",", ":")).encode())
+        )
+        return (
+            signing_input + b"." + base64url_encode(self._sign(signing_input))
+        ).decode()
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verify the token signature and expiry and return its payload.
+
+        Raises:
+            jwt.InvalidTokenError: If the token cannot be verified
+        """
+        encoded = token.encode()
+        signing_input, _, signature = encoded.rpartition(b".")
+        header, _, payload_segment = signing_input.partition(b".")
+        if header != HEADER_SEGMENT or b"." in payload_segment:
+            return jwt_decode(token, self._secret, algorithms=["HS256"])
+
+        try:
+            signature = base64url_decode(signature)
+            payload = json_loads(base64url_decode(payload_segment))
+        except (binascii_Error, ValueError) as error:
+            raise jwt_DecodeError("Invalid token encoding") from error
+
+        if not hmac_compare_digest(signature, self._sign(signing_input)):
+            raise jwt_InvalidSignatureError("Signature verification failed")
+
+        if not isinstance(payload, dict) or not self._handles(payload):
+            return jwt_decode(token, self._secret, algorithms=["HS256"])
+
+        try:
+            expired = "exp" in payload and int(payload["exp"]) <= time()
+        except (ValueError, OverflowError):
+            return jwt_decode(token, self._secret, algorithms=["HS256"])
+        if expired:
+            raise jwt_ExpiredSignatureError("Signature has expired")
+
+        return payload
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        """Return the HMAC-SHA256 of the signing input."""
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    @staticmethod
+    def _handles(payload: dict[str, Any]) -> bool:
+        """Return True if the payload only has claims the codec validates."""
+        return (
+            payload.keys() <= CLAIMS
+            and isinstance(payload.get("exp", 0), int | float)
+            and not isinstance(payload.get("exp"), bool)
+            and isinstance(payload.get("jti", ""), str)
+        )
+
+
+@lru_cache(maxsize=4)
+def get_hs256_codec(secret: str | bytes) -> HS256Codec:
+    """Return the codec prepared for the secret."""
+    return HS256Codec(secret)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from jwt.algorithms import OKPAlgorithm
+from jwt.algorithms import RSAAlgorithm
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """Asymmetric key of the ring, identified by its ``kid``."""
+
+    kid: str
+    algorithm: str
+    private_key: PrivateKeyTypes
+    active_from: datetime
+
+    @property
+    def public_key(self) -> PublicKeyTypes:
+        """Return the public half of the key."""
+        return self.private_key.public_key()
+
+    def to_jwk(self) -> dict[str, Any]:
+        """Return the public key as a JWK."""
+        if self.algorithm == "EdDSA":
+            jwk = OKPAlgorithm.to_jwk(self.public_key, as_dict=True)
+        else:
+            jwk = RSAAlgorithm.to_jwk(self.public_key, as_dict=True)
+        return {
+            **jwk,
+            "kid": self.kid,
+            "alg": self.algorithm,
+            "use": "sig",
+        }
+
+
+class KeyRing:
+    """Set of signing keys with scheduled rotation.
+
+    The signing key is the one with the latest ``active_from`` that is not in
+    the future. Every key of the ring, including scheduled and retiring ones,
+    is published in the JWKS so verifiers learn about new keys before they
+    are used and keep accepting tokens signed with previous ones.
+    """
+
+    def __init__(self, keys: list[SigningKey]):
+        """Initialize the ring sorted by activation time."""
+        self.keys = sorted(keys, key=lambda key: key.active_from)
+        self._keys_by_kid = {key.kid: key for key in self.keys}
+
+    def __bool__(self) -> bool:
+        """Return True if the ring has any key."""
+        return bool(self.keys)
+
+    def signing_key(self, now: datetime | None = None) -> SigningKey | None:
+        """Return the key tokens are currently signed with."""
+        now = now or timezone.now()
+        active_keys = [key for key in self.keys if key.active_from <= now]
+        return active_keys[-1] if active_keys else None
+
+    def verification_key(self, kid: str) -> SigningKey | None:
+        """Return the key with the given ``kid``."""
+        return self._keys_by_kid.get(kid)
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the public keys as a JWK set."""
+        return {"keys": [key.to_jwk() for key in self.keys]}
+
+
+def load_signing_key(config: dict[str, str]) -> SigningKey:
+    """Load a key from its ``JWT_SIGNING_KEYS`` entry.
+
+    Args:
+        config: Dict with ``kid``, ``private_key`` (PEM) or ``private_key_path``
+            and an optional ISO 8601 ``active_from``, taken as UTC when it
+            has no offset
+    """
+    if "private_key" in config:
+        pem = config["private_key"].encode()
+    else:
+        pem = Path(config["private_key_path"]).read_bytes()
+    private_key = load_pem_private_key(pem, password=None)
+
+    if isinstance(private_key, RSAPrivateKey):
+        algorithm = "RS256"
+    elif isinstance(private_key, Ed25519PrivateKey):
+        algorithm = "EdDSA"
+    else:
+        raise ValueError(f"Unsupported key type for kid {config['kid']}")
+
+    active_from = datetime.min.replace(tzinfo=UTC)
+    if config.get("active_from"):
+        active_from = parse_datetime(config["active_from"])
+        if active_from is None:
+            raise ValueError(f"Invalid active_from for kid {config['kid']}")
+        if timezone.is_naive(active_from):
+            # Sin desfase explícito se interpreta como UTC
+            active_from = timezone.make_aware(active_from, UTC)
+
+    return SigningKey(
+        kid=config["kid"],
+        algorithm=algorithm,
+        private_key=private_key,
+        active_from=active_from,
+    )
+
+
+@cache
+def get_key_ring() -> KeyRing:
+    """Return the key ring built from ``JWT_SIGNING_KEYS``."""
+    return KeyRing([load_signing_key(config) for config in settings.JWT_SIGNING_KEYS])
+
+
+@receiver(setting_changed)
+def reset_key_ring(setting: str, **kwargs: dict) -> None:
+    """Rebuild the key ring when the key settings change."""
+    if setting == "JWT_SIGNING_KEYS":
+        get_key_ring.cache_clear()
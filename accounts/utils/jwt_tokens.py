@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from jwt import InvalidTokenError as jwt_InvalidTokenError
+from jwt import decode as jwt_decode
+from jwt import encode as jwt_encode
+from jwt import get_unverified_header as jwt_get_unverified_header
+
+from accounts.utils.hs256_codec import HEADER_SEGMENT
+from accounts.utils.hs256_codec import get_hs256_codec
+from accounts.utils.jwt_keys import get_key_ring
+
+HS256_PREFIX = HEADER_SEGMENT.decode() + "."
+
+
+def encode_token(payload: dict[str, Any]) -> str:
+    """Sign the payload with the active key of the ring.
+
+    Falls back to HS256 with ``SECRET_KEY`` when no asymmetric key is active.
+    """
+    signing_key = get_key_ring().signing_key()
+    if signing_key is None:
+        return get_hs256_codec(settings.SECRET_KEY).encode(payload)
+
+    return jwt_encode(
+        payload,
+        signing_key.private_key,
+        algorithm=signing_key.algorithm,
+        headers={"kid": signing_key.kid},
+    )
+
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Verify the token signature and expiry and return its payload.
+
+    Tokens carrying a ``kid`` header are verified with that key of the ring,
+    tokens without one with HS256 and ``SECRET_KEY``.
+
+    Raises:
+        jwt.InvalidTokenError: If the token cannot be verified
+    """
+    if token.startswith(HS256_PREFIX):
+        return get_hs256_codec(settings.SECRET_KEY).decode(token)
+
+    kid = jwt_get_unverified_header(token).get("kid")
+    if kid is None:
+        return jwt_decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+
+    verification_key = get_key_ring().verification_key(kid)
+    if verification_key is None:
+        raise jwt_InvalidTokenError(f"Unknown signing key {kid}")
+
+    return jwt_decode(
+        token,
+        verification_key.public_key,
+        algorithms=[verification_key.algorithm],
+    )
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+from re import fullmatch as re_fullmatch
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import OperationalError
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models.user_token import UserToken
+from accounts.utils.generate_token_for_user import SESSION_TOKEN_LIFETIME
+from utils.logger import logger
+from utils.metrics import metrics
+
+# El particionado exige la clave en la PK y en las restricciones únicas
+PARTITION_KEY = "expires_at"
+
+
+def month_start(moment: datetime, months: int = 0) -> datetime:
+    """Return the first instant (UTC) of the month ``months`` after ``moment``."""
+    moment = moment.astimezone(UTC)
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+class TokenPartitions:
+    """Monthly range partitions of the UserToken table by ``expires_at``.
+
+    Optional: the table is converted once with ``convert``. Afterwards
+    ``maintain`` keeps partitions ahead of the longest token lifetime and
+    drops whole months once every token in them has expired, which replaces
+    a mass ``DELETE`` with a ``DROP TABLE``.
+
+    There is no DEFAULT partition: it would block ``DETACH CONCURRENTLY``
+    and make every new month scan it. A token expiring past the last
+    partition cannot be inserted, so ``check_coverage`` reports it loudly
+    at startup and after every maintenance run.
+    """
+
+    def __init__(self, table: str | None = None) -> None:
+        """Initialize for the UserToken table."""
+        self.table = table or UserToken._meta.db_table
+
+    def partition_name(self, month: datetime) -> str:
+        """Return the name of the partition holding the month."""
+        return f"{self.table}_p{month:%Y%m}"
+
+    def is_partitioned(self) -> bool:
+        """Return whether the table is already partitioned."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+                [self.table],
+            )
+            return cursor.fetchone() is not None
+
+    def partitions(self) -> dict[datetime, str]:
+        """Return the partitions by the first instant of their month."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = %s::regclass",
+                [self.table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = {}
+        for name in names:
+            match = re_fullmatch(rf"{self.table}_p(\d{{4}})(\d{{2}})", name)
+            if match:
+                year, month = int(match[1]), int(match[2])
+                partitions[datetime(year, month, 1, tzinfo=UTC)] = name
+        return partitions
+
+    def create_partitions(self, first: datetime, last: datetime) -> list[str]:
+        """Create the missing partitions for every month from first to last."""
+        existing = self.partitions()
+        created = []
+        month = month_start(first)
+        while month <= last:
+            if month not in existing:
+                name = self.partition_name(month)
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE TABLE {connection.ops.quote_name(name)} "
+                        f"PARTITION OF {connection.ops.quote_name(self.table)} "
+                        "FOR VALUES FROM (%s) TO (%s)",
+                        [month, month_start(month, 1)],
+                    )
+                created.append(name)
+            month = month_start(month, 1)
+        return created
+
+    def covered_until(self) -> datetime:
+        """Return the end of the consecutive partitions from the current month."""
+        partitions = self.partitions()
+        month = month_start(timezone.now())
+        while month in partitions:
+            month = month_start(month, 1)
+        return month
+
+    def check_coverage(self) -> bool:
+        """Log an error when tokens issued now could expire past the partitions.
+
+        Returns:
+            bool: Whether every token issued now has a partition
+        """
+        try:
+            if not self.is_partitioned():
+                return True
+            covered_until = self.covered_until()
+        except DatabaseError as e:
+            logger.warning(f"UserToken partition coverage check failed: {e}")
+            return True
+
+        now = timezone.now()
+        metrics.set_gauge(
+            "user_token_partitions.covered_days",
+            (covered_until - now) / timedelta(days=1),
+        )
+        lifetime = max(
+            timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME),
+            SESSION_TOKEN_LIFETIME,
+        )
+        if covered_until >= now + lifetime:
+            return True
+        logger.critical(
+            "UserToken partitions end before the longest token lifetime: "
+            f"tokens expiring after {covered_until:%Y-%m-%d} cannot be stored. "
+            "Run partition_user_tokens now.",
+            extra={"covered_until": covered_until.isoformat()},
+        )
+        return False
+
+    def detach(self, name: str) -> None:
+        """Detach a partition, waiting for the table lock at most the timeout.
+
+        Outside a transaction the partition is detached ``CONCURRENTLY``,
+        which does not block reads or writes on the table; a detach left
+        pending by a failed run is completed with ``FINALIZE``. Inside a
+        transaction, where ``CONCURRENTLY`` is not allowed, a plain
+        ``DETACH`` is used.
+        """
+        quote_name = connection.ops.quote_name
+        statement = (
+            f"ALTER TABLE {quote_name(self.table)} "
+            f"DETACH PARTITION {quote_name(name)}"
+        )
+        lock_timeout = f"{int(settings.USER_TOKEN_PARTITION_LOCK_TIMEOUT * 1000)}ms"
+        with connection.cursor() as cursor:
+            if connection.in_atomic_block:
+                cursor.execute("SET LOCAL lock_timeout = %s", [lock_timeout])
+                cursor.execute(statement)
+                return
+
+            cursor.execute(
+                "SELECT inhdetachpending FROM pg_inherits "
+                "WHERE inhrelid = %s::regclass",
+                [name],
+            )
+            (pending,) = cursor.fetchone()
+            cursor.execute("SET lock_timeout = %s", [lock_timeout])
+            try:
+                cursor.execute(
+                    f"{statement} {'FINALIZE' if pending else 'CONCURRENTLY'}"
+                )
+            finally:
+                cursor.execute("RESET lock_timeout")
+
+    def drop_expired(self, before: datetime) -> list[str]:
+        """Drop the partitions whose every token expired before ``before``.
+
+        Each partition is detached first, so the ``DROP TABLE`` only locks
+        the detached table and not the whole UserToken table.
+        """
+        dropped = []
+        for month, name in sorted(self.partitions().items()):
+            if month_start(month, 1) > before:
+                break
+            try:
+                self.detach(name)
+            except OperationalError as e:
+                if connection.in_atomic_block:
+                    raise
+                # La tabla está ocupada: se reintenta en la próxima pasada
+                logger.warning(f"Could not detach {name}, retrying later: {e}")
+                metrics.increment("user_token_partitions.detach_timeouts")
+                break
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+            dropped.append(name)
+        return dropped
+
+    def maintain(self, months_ahead: int, before: datetime) -> tuple[list, list]:
+        """Create the coming partitions and drop the expired ones.
+
+        Returns:
+            tuple: Names of the created and of the dropped partitions
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            created = self.create_partitions(now, month_start(now, months_ahead))
+        dropped = self.drop_expired(before)
+        self.check_coverage()
+        return created, dropped
+
+    @transaction.atomic
+    def convert(self, months_ahead: int) -> int:
+        """Rebuild the table as a partitioned table and copy its rows.
+
+        Holds an exclusive lock on the table while the rows are copied;
+        run it in a maintenance window.
+
+        Returns:
+            int: Number of rows copied
+        """
+        quote_name = connection.ops.quote_name
+        table = quote_name(self.table)
+        legacy_name = f"{self.table}_legacy"
+        legacy = quote_name(legacy_name)
+
+        with connection.cursor() as cursor:
+            # Las FK diferidas con eventos pendientes impiden borrar la tabla
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = %s",
+                [self.table],
+            )
+            indexes = cursor.fetchall()
+            cursor.execute(
+                "SELECT conname, contype, pg_get_constraintdef(oid) "
+                "FROM pg_constraint WHERE conrelid = %s::regclass",
+                [self.table],
+            )
+            constraints = cursor.fetchall()
+            cursor.execute(
+                f"SELECT min({quote_name(PARTITION_KEY)}), "
+                f"max({quote_name(PARTITION_KEY)}) FROM {table}",
+            )
+            oldest, newest = cursor.fetchone()
+
+            # Los nombres de índices son únicos por esquema: se liberan
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+            for position, (name, _, _) in enumerate(constraints):
+                cursor.execute(
+                    f"ALTER TABLE {legacy} RENAME CONSTRAINT {quote_name(name)} "
+                    f"TO {quote_name(f'{legacy_name}_c{position}')}"
+                )
+            constraint_names = {name for name, _, _ in constraints}
+            for position, (name, _) in enumerate(indexes):
+                if name not in constraint_names:
+                    cursor.execute(
+                        f"ALTER INDEX {quote_name(name)} "
+                        f"RENAME TO {quote_name(f'{legacy_name}_i{position}')}"
+                    )
+
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS "
+                "INCLUDING IDENTITY INCLUDING STORAGE INCLUDING COMMENTS) "
+                f"PARTITION BY RANGE ({quote_name(PARTITION_KEY)})"
+            )
+            for name, kind, definition in constraints:
+                if kind in {"p", "u"}:
+                    # PRIMARY KEY (id) -> PRIMARY KEY (id, expires_at)
+                    definition_sql = f"{definition[:-1]}, {quote_name(PARTITION_KEY)})"
+                else:
+                    definition_sql = definition
+                cursor.execute(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {quote_name(name)} "
+                    f"{definition_sql}"
+                )
+            # Las definiciones se leyeron antes del cambio de nombre: ya
+            # apuntan a la tabla nueva
+            for name, definition in indexes:
+                if name not in constraint_names:
+                    cursor.execute(definition)
+
+            now = timezone.now()
+            self.create_partitions(
+                min(oldest or now, now),
+                max(newest or now, month_start(now, months_ahead)),
+            )
+
+            cursor.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+            copied = cursor.rowcount
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                f"coalesce((SELECT max(id) FROM {table}), 0) + 1, false)",
+                [self.table],
+            )
+            cursor.execute(f"DROP TABLE {legacy}")
+        return copied
+
+
+token_partitions = TokenPartitions()
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from gzip import compress as gzip_compress
+from json import dumps as json_dumps
+from os import fsync as os_fsync
+from pathlib import Path
+from threading import Event
+from threading import Thread
+from time import perf_counter
+from time import sleep
+from typing import IO
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db import connection
+from django.db import transaction
+from django.db.models import Model
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.models.mfa_verification import MFAVerification
+from accounts.models.user_token import UserToken
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.partitions import token_partitions
+from utils.logger import logger
+from utils.metrics import metrics
+
+# Clave del advisory lock que impide dos limpiezas a la vez
+REAPER_LOCK_ID = 0x5245_4150
+
+
+@dataclass(frozen=True)
+class ReapTarget:
+    """Table to clean and the rows of it that are no longer needed."""
+
+    model: type[Model]
+    condition: Callable[[datetime], Q]
+    # Columnas que nunca se archivan (secretos)
+    exclude_columns: tuple[str, ...] = ()
+
+
+REAP_TARGETS = (
+    # Los refresh tokens revocados se conservan hasta expirar: delatan su
+    # reutilización. El resto de tokens revocados ya no sirve de nada.
+    ReapTarget(
+        UserToken,
+        lambda cutoff: Q(expires_at__lt=cutoff)
+        | Q(is_valid=False, family__isnull=True),
+        exclude_columns=("token",),
+    ),
+    ReapTarget(
+        VerificationCode,
+        lambda cutoff: Q(expires_at__lt=cutoff) | Q(is_used=True),
+        exclude_columns=("code",),
+    ),
+    ReapTarget(
+        MFAVerification,
+        lambda cutoff: Q(expires_at__lt=cutoff),
+        exclude_columns=("code", "session_key"),
+    ),
+    # Los emails ya resueltos (enviados o descartados) no se reintentan
+    ReapTarget(
+        EmailOutbox,
+        lambda cutoff: Q(
+            status__in=[EmailOutbox.STATUS_SENT, EmailOutbox.STATUS_DEAD],
+            created_at__lt=cutoff,
+        ),
+        exclude_columns=("body",),
+    ),
+)
+
+
+@dataclass
+class ReapReport:
+    """Rows deleted from one table."""
+
+    table: str
+    deleted: int
+    batches: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Deletion throughput, pauses included."""
+        return self.deleted / self.seconds if self.seconds else 0.0
+
+
+class Reaper:
+    """Delete expired and revoked rows in small keyset-paged batches.
+
+    Every batch is a single ``DELETE ... WHERE id IN (next ids) RETURNING``
+    committed on its own, so locks are held for one batch only, and the
+    pause between batches leaves room for the regular traffic. The rows are
+    deleted without model signals: cached tokens never outlive their
+    expiry, and revoked ones were already invalidated when revoked.
+
+    With ``archive_dir`` every batch is written and synced to the archive
+    before its delete commits.
+
+    When the UserToken table is partitioned, expired months are dropped
+    first, unless the rows have to be archived.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        pause: float | None = None,
+        grace: timedelta | None = None,
+        archive_dir: str | None = None,
+    ) -> None:
+        """Initialize the reaper, falling back to settings for each option."""
+        self.batch_size = batch_size or settings.REAP_BATCH_SIZE
+        self.pause = settings.REAP_BATCH_PAUSE if pause is None else pause
+        self.grace = grace or timedelta(seconds=settings.REAP_GRACE_PERIOD)
+        self.archive_dir = (
+            settings.REAP_ARCHIVE_DIR if archive_dir is None else archive_dir
+        )
+
+    def run(self, targets: tuple[ReapTarget, ...] = REAP_TARGETS) -> list[ReapReport]:
+        """Clean every table and return what was deleted."""
+        cutoff = timezone.now() - self.grace
+        if not self.archive_dir and token_partitions.is_partitioned():
+            # Los meses ya caducados se descartan enteros, sin borrar filas
+            created, dropped = token_partitions.maintain(
+                settings.USER_TOKEN_PARTITION_MONTHS_AHEAD,
+                cutoff,
+            )
+            metrics.increment("reaper.partitions.created", len(created))
+            metrics.increment("reaper.partitions.dropped", len(dropped))
+        return [self.reap(target, cutoff) for target in targets]
+
+    def reap(self, target: ReapTarget, cutoff: datetime) -> ReapReport:
+        """Delete the rows of one table matching the target."""
+        table = target.model._meta.db_table
+        started = perf_counter()
+        deleted = batches = 0
+        last_pk = 0
+        archive = self._open_archive(table)
+        try:
+            while True:
+                rows = self._delete_batch(target, cutoff, last_pk, archive)
+                if not rows:
+                    break
+
+                deleted += len(rows)
+                batches += 1
+                last_pk = max(row["id"] for row in rows)
+                metrics.increment(f"reaper.{table}.deleted", len(rows))
+                if len(rows) < self.batch_size:
+                    break
+                sleep(self.pause)
+        finally:
+            if archive is not None:
+                archive.close()
+
+        return ReapReport(table, deleted, batches, perf_counter() - started)
+
+    def _delete_batch(
+        self,
+        target: ReapTarget,
+        cutoff: datetime,
+        last_pk: int,
+        archive: IO[bytes] | None = None,
+    ) -> list[dict]:
+        """Delete the next batch after ``last_pk`` and return its rows.
+
+        The rows are on disk in the archive before the delete commits.
+        """
+        model = target.model
+        columns = [
+            field.column
+            for field in model._meta.concrete_fields
+            if field.attname not in target.exclude_columns
+        ]
+        next_ids = (
+            model.objects.filter(target.condition(cutoff), pk__gt=last_pk)
+            .order_by("pk")
+            .values("pk")[: self.batch_size]
+        )
+        ids_sql, params = next_ids.query.sql_with_params()
+        quote_name = connection.ops.quote_name
+        sql = (
+            f"DELETE FROM {quote_name(model._meta.db_table)} "
+            f"WHERE {quote_name(model._meta.pk.column)} IN ({ids_sql}) "
+            f"RETURNING {', '.join(quote_name(column) for column in columns)}"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]
+            if archive is not None and rows:
+                self._archive_batch(archive, rows)
+        return rows
+
+    def _open_archive(self, table: str) -> IO[bytes] | None:
+        """Open the compressed JSONL archive of the table for this run."""
+        if not self.archive_dir:
+            return None
+        directory = Path(self.archive_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+        return (directory / f"{table}-{stamp}.jsonl.gz").open("ab")
+
+    def _archive_batch(self, archive: IO[bytes], rows: list[dict]) -> None:
+        """Append the rows as a gzip member of their own and sync it to disk.
+
+        Concatenated members read back as one gzip file, and a crash loses
+        at most the batch whose delete had not committed yet.
+        """
+        lines = "".join(json_dumps(row, default=str) + "\n" for row in rows)
+        archive.write(gzip_compress(lines.encode()))
+        archive.flush()
+        os_fsync(archive.fileno())
+
+
+def reap_with_lock(reaper: Reaper) -> list[ReapReport] | None:
+    """Run the reaper unless another process is already running it.
+
+    Returns:
+        list | None: The reports, or None when the lock is held elsewhere
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [REAPER_LOCK_ID])
+        if not cursor.fetchone()[0]:
+            return None
+    try:
+        return reaper.run()
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [REAPER_LOCK_ID])
+
+
+class ReaperScheduler:
+    """Run the reaper every ``REAP_INTERVAL`` seconds from a daemon thread.
+
+    Optional: enabled when ``REAP_INTERVAL`` is set. Every worker may start
+    one; an advisory lock lets a single process clean at a time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler, stopped."""
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        """Start the scheduler thread if an interval is configured."""
+        if not settings.REAP_INTERVAL or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler after the current run."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        """Reap, then wait for the next run."""
+        while not self._stopped.wait(settings.REAP_INTERVAL):
+            try:
+                close_old_connections()
+                reports = reap_with_lock(Reaper())
+            except Exception:
+                logger.error("Scheduled reap failed", extra={"traceback": True})
+                continue
+            for report in reports or ():
+                logger.info(
+                    "Reaped expired rows",
+                    extra={"table": report.table, "deleted": report.deleted},
+                )
+
+
+reaper_scheduler = ReaperScheduler()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from socketserver import StreamRequestHandler
+from socketserver import ThreadingTCPServer
+from threading import Lock
+from threading import Thread
+from time import sleep
+
+
+class SMTPSinkHandler(StreamRequestHandler):
+    """Speak just enough SMTP for ``smtplib`` to deliver messages."""
+
+    server: SMTPSink
+
+    def reply(self, line: str) -> None:
+        """Write one response line."""
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        """Accept messages until the client quits."""
+        sleep(self.server.connect_latency)
+        self.server.record_connection()
+        self.reply("220 smtp-sink ready")
+        self.recipients: list[str] = []
+        self.in_data = False
+        for raw in self.rfile:
+            line = raw.rstrip(b"\r\n")
+            if self.in_data:
+                self.data(line)
+            elif not self.command(line):
+                return
+
+    def data(self, line: bytes) -> None:
+        """Consume one line of a message body."""
+        if line == b".":
+            self.in_data = False
+            sleep(self.server.message_latency)
+            self.server.record_message(self.recipients)
+            self.recipients = []
+            self.reply("250 OK")
+
+    def command(self, line: bytes) -> bool:
+        """Answer one command; return False once the client quits."""
+        command = line[:4].upper()
+        if command == b"EHLO":
+            self.reply("250-smtp-sink")
+            self.reply("250 8BITMIME")
+        elif command == b"RCPT":
+            recipient = line.split(b":", 1)[1].strip(b" <>").decode()
+            if recipient in self.server.rejected:
+                self.reply("550 Mailbox unavailable")
+            else:
+                self.recipients.append(recipient)
+                self.reply("250 OK")
+        elif command == b"DATA":
+            self.in_data = True
+            self.reply("354 End data with <CR><LF>.<CR><LF>")
+        elif command == b"QUIT":
+            self.reply("221 Bye")
+            return False
+        elif command in {b"HELO", b"MAIL", b"RSET", b"NOOP"}:
+            if command == b"RSET":
+                self.recipients = []
+            self.reply("250 OK")
+        else:
+            self.reply("502 Command not implemented")
+        return True
+
+
+class SMTPSink(ThreadingTCPServer):
+    """Local SMTP server that accepts and discards every message.
+
+    Stands in for a real mail server to benchmark the email transports
+    offline. The latencies simulate the connection setup and the time the
+    server takes to accept each message.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_latency: float = 0.0,
+        message_latency: float = 0.0,
+        rejected: frozenset[str] = frozenset(),
+    ) -> None:
+        """Bind the server; port 0 picks a free port."""
+        super().__init__((host, port), SMTPSinkHandler)
+        self.connect_latency = connect_latency
+        self.message_latency = message_latency
+        self.rejected = rejected
+        self.connections = 0
+        self.messages: list[list[str]] = []
+        self._lock = Lock()
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+        return self.server_address[1]
+
+    def record_connection(self) -> None:
+        """Count a client connection."""
+        with self._lock:
+            self.connections += 1
+
+    def record_message(self, recipients: list[str]) -> None:
+        """Keep the recipients of an accepted message."""
+        with self._lock:
+            self.messages.append(recipients)
+
+    def start(self) -> SMTPSink:
+        """Serve from a daemon thread."""
+        Thread(target=self.serve_forever, name="smtp-sink", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self.shutdown()
+        self.server_close()
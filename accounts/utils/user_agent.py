@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db import transaction
+from ua_parser import user_agent_parser
+
+from accounts.models.device import Device
+from accounts.models.user_token import UserToken
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+@dataclass(frozen=True)
+class DeviceInfo:
+    """Device, OS and browser stored with a token."""
+
+    device_type: str
+    device_os: str
+    device_browser: str
+
+
+def parse_user_agent(ua_string: str) -> DeviceInfo:
+    """Parse a User-Agent header without the cache."""
+    parsed_ua = user_agent_parser.Parse(ua_string)
+    return DeviceInfo(
+        device_type=parsed_ua["device"]["family"],
+        device_os=f"{parsed_ua['os']['family']} {parsed_ua['os']['major']}",
+        device_browser=(
+            f"{parsed_ua['user_agent']['family']}" f"{parsed_ua['user_agent']['major']}"
+        ),
+    )
+
+
+class UserAgentCache:
+    """Bounded LRU cache of parsed User-Agent headers.
+
+    Parsing runs hundreds of regexes while the number of distinct headers is
+    small, so most token issuances are served from the cache.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        """Initialize the cache, falling back to settings for the size."""
+        self._max_size = max_size
+        self._entries: OrderedDict[str, DeviceInfo] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of cached headers, 0 disables the cache."""
+        if self._max_size is not None:
+            return self._max_size
+        return settings.USER_AGENT_CACHE_SIZE
+
+    def __len__(self) -> int:
+        """Return the number of cached headers."""
+        return len(self._entries)
+
+    def parse(self, ua_string: str) -> DeviceInfo:
+        """Return the parsed header, from the cache when possible."""
+        with self._lock:
+            device = self._entries.get(ua_string)
+            if device is not None:
+                self._entries.move_to_end(ua_string)
+                metrics.increment("user_agent_cache.hits")
+                return device
+
+        metrics.increment("user_agent_cache.misses")
+        # Se parsea fuera del lock; dos hilos pueden parsear el mismo header
+        device = parse_user_agent(ua_string)
+        self._store(ua_string, device)
+        return device
+
+    def warm(self, ua_strings: list[str]) -> int:
+        """Parse headers ahead of time, most recent first.
+
+        Returns:
+            int: Number of headers added to the cache
+        """
+        added = 0
+        for ua_string in ua_strings[: self.max_size]:
+            if ua_string not in self._entries:
+                self._store(ua_string, parse_user_agent(ua_string))
+                added += 1
+        return added
+
+    def warm_from_tokens(self, tokens: int | None = None) -> int:
+        """Warm the cache with the headers of the newest ``tokens`` tokens.
+
+        The tokens are read backwards along the primary key, so the cost does
+        not grow with the table. Tokens keep their header only until the
+        device is parsed; resolved tokens contribute the header stored with
+        their ``Device`` row.
+        """
+        tokens = tokens or settings.USER_AGENT_CACHE_WARMUP_TOKENS
+        try:
+            headers = list(
+                UserToken.objects.order_by("-pk").values_list(
+                    "user_agent",
+                    "device__user_agent",
+                )[:tokens]
+            )
+        except DatabaseError as e:
+            # Un worker sin caché caliente sigue funcionando
+            logger.warning(f"User-Agent cache warm-up failed: {e}")
+            return 0
+        ua_strings = dict.fromkeys(
+            staged or resolved for staged, resolved in headers if staged or resolved
+        )
+        return self.warm(list(ua_strings))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            metrics.set_gauge("user_agent_cache.size", 0)
+
+    def stats(self) -> dict[str, float]:
+        """Return size and hit/miss/eviction counters."""
+        counters = metrics.snapshot()["counters"]
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": counters.get("user_agent_cache.hits", 0),
+            "misses": counters.get("user_agent_cache.misses", 0),
+            "evictions": counters.get("user_agent_cache.evictions", 0),
+        }
+
+    def _store(self, ua_string: str, device: DeviceInfo) -> None:
+        """Cache a parsed header, evicting the least recently used."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[ua_string] = device
+            self._entries.move_to_end(ua_string)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                metrics.increment("user_agent_cache.evictions")
+            metrics.set_gauge("user_agent_cache.size", len(self._entries))
+
+
+user_agent_cache = UserAgentCache()
+
+
+class DeviceResolver:
+    """Process-local map of parsed devices to their ``Device`` row id.
+
+    Tokens are issued to a small set of devices, so once a device is known
+    issuing a token needs no lookup.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        """Initialize the map, falling back to settings for the size."""
+        self._max_size = max_size
+        self._ids: OrderedDict[DeviceInfo, int] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def max_size(self) -> int:
+        """Maximum number of cached devices."""
+        if self._max_size is not None:
+            return self._max_size
+        return settings.USER_AGENT_CACHE_SIZE
+
+    def resolve(self, device: DeviceInfo, ua_string: str = "") -> int:
+        """Return the id of the device row, creating it if needed.
+
+        A new row keeps ``ua_string`` as the header to warm the cache with.
+        """
+        with self._lock:
+            device_id = self._ids.get(device)
+            if device_id is not None:
+                self._ids.move_to_end(device)
+                metrics.increment("device_resolver.hits")
+                return device_id
+
+        metrics.increment("device_resolver.misses")
+        row, created = Device.objects.get_or_create(
+            device_type=device.device_type,
+            device_os=device.device_os,
+            device_browser=device.device_browser,
+            defaults={"user_agent": ua_string},
+        )
+        if created:
+            # Una fila de una transacción revertida no debe quedar en la caché
+            transaction.on_commit(lambda: self._store(device, row.pk))
+        else:
+            self._store(device, row.pk)
+        return row.pk
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._ids.clear()
+
+    def _store(self, device: DeviceInfo, device_id: int) -> None:
+        """Cache the id of a device, evicting the least recently used."""
+        with self._lock:
+            self._ids[device] = device_id
+            self._ids.move_to_end(device)
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+
+device_resolver = DeviceResolver()
+
+
+def token_device(user_token: UserToken) -> DeviceInfo:
+    """Return the device of a token, parsing it now if it was stored lazily.
+
+    A lazily stored token is linked to its device once parsed, and its raw
+    header is cleared.
+    """
+    if user_token.device_id is None:
+        ua_string = user_token.user_agent or ""
+        device = user_agent_cache.parse(ua_string)
+        user_token.device_id = device_resolver.resolve(device, ua_string)
+        user_token.user_agent = None
+        UserToken.objects.filter(pk=user_token.pk).update(
+            device_id=user_token.device_id,
+            user_agent=None,
+        )
+        return device
+    device = user_token.device
+    return DeviceInfo(device.device_type, device.device_os, device.device_browser)
@@ -2,8 +2,30 @@ from __future__ import annotations
 
 from os import environ as os_environ
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os_environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
 
 application = get_asgi_application()
+
+# Los workers escuchan las invalidaciones de cachés publicadas por los demás
+from accounts.auth.invalidation_bus import invalidation_bus  # noqa: E402
+
+invalidation_bus.start()
+
+# Los User-Agent de los tokens recientes ya parseados al arrancar
+from accounts.utils.user_agent import user_agent_cache  # noqa: E402
+
+if settings.USER_AGENT_CACHE_WARMUP:
+    user_agent_cache.warm_from_tokens()
+
+# Sin partición para su mes un token no puede guardarse: avisar al arrancar
+from accounts.utils.partitions import token_partitions  # noqa: E402
+
+token_partitions.check_coverage()
+
+# Limpieza periódica opcional de filas expiradas (REAP_INTERVAL)
+from accounts.utils.reaper import reaper_scheduler  # noqa: E402
+
+reaper_scheduler.start()
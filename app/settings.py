@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from json import loads as json_loads
+from os import cpu_count as os_cpu_count
 from os import environ as os_environ
 from pathlib import Path
+from tempfile import gettempdir
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -112,18 +115,173 @@ if os_environ.get("RATE_LIMIT_ENABLED", "0") == "1":
         "user": os_environ.get("MAX_REQUESTS_PER_MINUTE", "60") + "/minute",
     }
 
+# Token last-used write-behind buffer
+TOKEN_LAST_USED_FLUSH_INTERVAL = float(
+    os_environ.get("TOKEN_LAST_USED_FLUSH_INTERVAL", "30")
+)
+TOKEN_LAST_USED_FLUSH_SIZE = int(os_environ.get("TOKEN_LAST_USED_FLUSH_SIZE", "500"))
+TOKEN_LAST_USED_GRANULARITY = float(os_environ.get("TOKEN_LAST_USED_GRANULARITY", "60"))
+
+# JWT signing keys. Each entry is {"kid", "private_key_path" or "private_key",
+# "active_from"}; RSA keys sign with RS256 and Ed25519 keys with EdDSA. Without
+# keys, tokens are signed with HS256 and SECRET_KEY.
+JWT_SIGNING_KEYS = json_loads(os_environ.get("JWT_SIGNING_KEYS", "[]"))
+JWKS_CACHE_MAX_AGE = int(os_environ.get("JWKS_CACHE_MAX_AGE", "3600"))
+
+# Short-lived access tokens verified without the database, renewed with
+# rotating refresh tokens stored as UserToken rows
+JWT_STATELESS_ACCESS_TOKENS = os_environ.get("JWT_STATELESS_ACCESS_TOKENS", "0") == "1"
+JWT_ACCESS_TOKEN_LIFETIME = int(os_environ.get("JWT_ACCESS_TOKEN_LIFETIME", "300"))
+JWT_REFRESH_TOKEN_LIFETIME = int(
+    os_environ.get("JWT_REFRESH_TOKEN_LIFETIME", str(7 * 24 * 60 * 60))
+)
+
+# Process-local cache of verified tokens
+TOKEN_CACHE_MAX_SIZE = int(os_environ.get("TOKEN_CACHE_MAX_SIZE", "10000"))
+TOKEN_CACHE_TTL = float(os_environ.get("TOKEN_CACHE_TTL", "60"))
+
+# Parsed User-Agent headers kept per process, warmed at startup with the
+# headers of the newest USER_AGENT_CACHE_WARMUP_TOKENS tokens.
+# Lazy parsing keeps the raw header on the token until the device is read.
+USER_AGENT_CACHE_SIZE = int(os_environ.get("USER_AGENT_CACHE_SIZE", "1024"))
+USER_AGENT_CACHE_WARMUP = os_environ.get("USER_AGENT_CACHE_WARMUP", "1") == "1"
+USER_AGENT_CACHE_WARMUP_TOKENS = int(
+    os_environ.get("USER_AGENT_CACHE_WARMUP_TOKENS", "10000")
+)
+USER_AGENT_PARSE_LAZY = os_environ.get("USER_AGENT_PARSE_LAZY", "0") == "1"
+
+# Revoked tokens shared by every worker of the node through a memory-mapped file
+TOKEN_REVOCATION_FILTER_PATH = os_environ.get(
+    "TOKEN_REVOCATION_FILTER_PATH",
+    str(Path(gettempdir()) / "auth_token_revocations"),
+)
+TOKEN_REVOCATION_FILTER_CAPACITY = int(
+    os_environ.get("TOKEN_REVOCATION_FILTER_CAPACITY", "100000")
+)
+
+# Password hashing cost, tuned per machine with the calibrate_password_hashers
+# command. Stored hashes made with other parameters, or with a hasher other
+# than PASSWORD_HASHER ("pbkdf2", "scrypt" or "argon2", the latter needs
+# argon2-cffi), are upgraded on the next successful login.
+PASSWORD_PBKDF2_ITERATIONS = int(os_environ.get("PASSWORD_PBKDF2_ITERATIONS", "870000"))
+PASSWORD_SCRYPT_WORK_FACTOR = int(
+    os_environ.get("PASSWORD_SCRYPT_WORK_FACTOR", "16384")
+)
+PASSWORD_SCRYPT_BLOCK_SIZE = int(os_environ.get("PASSWORD_SCRYPT_BLOCK_SIZE", "8"))
+PASSWORD_SCRYPT_PARALLELISM = int(os_environ.get("PASSWORD_SCRYPT_PARALLELISM", "5"))
+PASSWORD_ARGON2_TIME_COST = int(os_environ.get("PASSWORD_ARGON2_TIME_COST", "2"))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os_environ.get("PASSWORD_ARGON2_MEMORY_COST", "102400")
+)
+PASSWORD_ARGON2_PARALLELISM = int(os_environ.get("PASSWORD_ARGON2_PARALLELISM", "8"))
+PASSWORD_HASHER_CLASSES = {
+    "pbkdf2": "accounts.auth.hashers.CalibratedPBKDF2PasswordHasher",
+    "scrypt": "accounts.auth.hashers.CalibratedScryptPasswordHasher",
+    "argon2": "accounts.auth.hashers.CalibratedArgon2PasswordHasher",
+}
+PASSWORD_HASHER = os_environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(
+        hasher
+        for name, hasher in PASSWORD_HASHER_CLASSES.items()
+        if name != PASSWORD_HASHER
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+# Bounded pool that hashes passwords off the request threads; requests beyond
+# the queue limit are rejected with 503
+PASSWORD_HASHING_WORKERS = int(
+    os_environ.get("PASSWORD_HASHING_WORKERS", str(os_cpu_count() or 1))
+)
+PASSWORD_HASHING_MAX_QUEUE = int(os_environ.get("PASSWORD_HASHING_MAX_QUEUE", "32"))
+
+# Number of one-time MFA backup codes issued with an OTP configuration
+MFA_BACKUP_CODE_COUNT = int(os_environ.get("MFA_BACKUP_CODE_COUNT", "5"))
+
+# Deletion of expired and revoked tokens, verification codes, MFA
+# verifications and delivered or dead outbox emails (reap_expired command).
+# Rows are kept REAP_GRACE_PERIOD seconds past expiry; REAP_INTERVAL > 0 also
+# runs it from the web workers.
+REAP_BATCH_SIZE = int(os_environ.get("REAP_BATCH_SIZE", "500"))
+REAP_BATCH_PAUSE = float(os_environ.get("REAP_BATCH_PAUSE", "0.1"))
+REAP_GRACE_PERIOD = int(os_environ.get("REAP_GRACE_PERIOD", "3600"))
+REAP_ARCHIVE_DIR = os_environ.get("REAP_ARCHIVE_DIR", "")
+REAP_INTERVAL = float(os_environ.get("REAP_INTERVAL", "0"))
+
+# Optional monthly partitioning of UserToken by expires_at (partition_user_tokens
+# command). Partitions are kept this many months ahead, which must cover the
+# longest token lifetime; the reaper drops the expired months.
+USER_TOKEN_PARTITION_MONTHS_AHEAD = int(
+    os_environ.get("USER_TOKEN_PARTITION_MONTHS_AHEAD", "2")
+)
+# Seconds a partition detach waits for the table lock before retrying on the
+# next run, so it never queues the traffic behind it
+USER_TOKEN_PARTITION_LOCK_TIMEOUT = float(
+    os_environ.get("USER_TOKEN_PARTITION_LOCK_TIMEOUT", "5")
+)
+
+# Maximum number of tokens accepted by one introspection request
+TOKEN_INTROSPECTION_MAX_BATCH = int(
+    os_environ.get("TOKEN_INTROSPECTION_MAX_BATCH", "100")
+)
+
+# Invalidations of process-local auth caches broadcast to every worker
+# ("postgres" uses LISTEN/NOTIFY, "local" only reaches the current process)
+AUTH_INVALIDATION_TRANSPORT = os_environ.get("AUTH_INVALIDATION_TRANSPORT", "postgres")
+AUTH_INVALIDATION_CHANNEL = os_environ.get(
+    "AUTH_INVALIDATION_CHANNEL", "auth_invalidation"
+)
+
 # Custom user model
 AUTH_USER_MODEL = "accounts.CustomUser"
+# Single-pass mode resolves the user once and checks one password hash per
+# login attempt; "0" also runs Django's ModelBackend after EmailBackend
+AUTH_SINGLE_PASS = os_environ.get("AUTH_SINGLE_PASS", "1") == "1"
 AUTHENTICATION_BACKENDS = [
     "accounts.auth.email_backend.EmailBackend",
-    "django.contrib.auth.backends.ModelBackend",
 ]
+if not AUTH_SINGLE_PASS:
+    AUTHENTICATION_BACKENDS.append("django.contrib.auth.backends.ModelBackend")
 
 # Email settings
 EMAIL_BACKEND = os_environ.get(
     "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
 )
 DEFAULT_FROM_EMAIL = os_environ.get("DEFAULT_FROM_EMAIL", "noreply@example.com")
+EMAIL_HOST = os_environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os_environ.get("EMAIL_PORT", "25"))
+EMAIL_HOST_USER = os_environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os_environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os_environ.get("EMAIL_USE_TLS", "0") == "1"
+EMAIL_TIMEOUT = float(os_environ.get("EMAIL_TIMEOUT", "5"))
+
+# Verification emails: "outbox" writes them in the request transaction for the
+# run_email_worker command to deliver, "sync" sends them after the commit.
+# EMAIL_TRANSPORT is "ses", "django" (sends through EMAIL_BACKEND), "console"
+# or "memory" (tests).
+EMAIL_DELIVERY = os_environ.get("EMAIL_DELIVERY", "outbox")
+EMAIL_TRANSPORT = os_environ.get("EMAIL_TRANSPORT", "ses")
+EMAIL_MAX_ATTEMPTS = int(os_environ.get("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_DELAY = float(os_environ.get("EMAIL_RETRY_BASE_DELAY", "30"))
+EMAIL_RETRY_MAX_DELAY = float(os_environ.get("EMAIL_RETRY_MAX_DELAY", "3600"))
+EMAIL_WORKER_CONCURRENCY = int(os_environ.get("EMAIL_WORKER_CONCURRENCY", "4"))
+EMAIL_WORKER_BATCH_SIZE = int(os_environ.get("EMAIL_WORKER_BATCH_SIZE", "50"))
+EMAIL_WORKER_LEASE = float(os_environ.get("EMAIL_WORKER_LEASE", "60"))
+# SES template used to send a worker batch in one SendBulkTemplatedEmail call;
+# its subject must be {{subject}} and its text part {{{body}}}. Without it
+# every email is one SendEmail call over the pooled connections.
+EMAIL_SES_TEMPLATE = os_environ.get("EMAIL_SES_TEMPLATE", "")
+# Time budget per email and circuit breaker around the transport: after
+# EMAIL_BREAKER_FAILURE_THRESHOLD failures in a row sends fail fast for
+# EMAIL_BREAKER_RESET_TIMEOUT seconds, then one probe decides
+EMAIL_CONNECT_TIMEOUT = float(os_environ.get("EMAIL_CONNECT_TIMEOUT", "2"))
+EMAIL_SEND_TIMEOUT = float(os_environ.get("EMAIL_SEND_TIMEOUT", "5"))
+EMAIL_BREAKER_FAILURE_THRESHOLD = int(
+    os_environ.get("EMAIL_BREAKER_FAILURE_THRESHOLD", "5")
+)
+EMAIL_BREAKER_RESET_TIMEOUT = float(os_environ.get("EMAIL_BREAKER_RESET_TIMEOUT", "30"))
 
 # AWS Settings
 AWS_ACCESS_KEY_ID = os_environ.get("AWS_ACCESS_KEY_ID")
@@ -132,6 +290,9 @@ AWS_REGION_NAME = os_environ.get("AWS_REGION_NAME", "us-east-1")
 AWS_SES_AUTO_THROTTLE = 0.5
 
 SEND_VERIFICATION_CODE_IN_RESPONSE = False
+# Resend requests within this many seconds of the last code reuse it and
+# send nothing
+VERIFICATION_RESEND_INTERVAL = int(os_environ.get("VERIFICATION_RESEND_INTERVAL", "60"))
 SEND_EMAIL = True
 
 # Development settings
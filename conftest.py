@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from uuid import UUID
+from uuid import uuid4
 from warnings import simplefilter as warnings_simplefilter
 
+from django.utils import timezone
 from pytest import Config as pytestConfig
 from pytest import fixture
 from rest_framework.test import APIClient
 
+from accounts.auth.revocation_filter import revocation_filter
+from accounts.auth.token_cache import token_cache
 from accounts.models.custom_user import CustomUser
+from accounts.models.user_token import UserToken
+from accounts.utils.user_agent import device_resolver
 
 
 def pytest_configure(config: pytestConfig):
@@ -22,6 +32,38 @@ def enable_db_access_for_all_tests(db: pytestConfig) -> None:
     pass
 
 
+@fixture(autouse=True)
+def clear_token_cache() -> None:
+    """Start every test with an empty token cache."""
+    token_cache.clear()
+
+
+@fixture(autouse=True)
+def clear_device_resolver() -> None:
+    """Forget device ids created by the transactions of previous tests."""
+    device_resolver.clear()
+
+
+@fixture(autouse=True)
+def local_invalidation_bus(settings: pytestConfig) -> None:
+    """Broadcast cache invalidations inside the test process only."""
+    settings.AUTH_INVALIDATION_TRANSPORT = "local"
+
+
+@fixture(autouse=True)
+def memory_email_transport(settings: pytestConfig) -> None:
+    """Never send real emails from the tests."""
+    settings.EMAIL_TRANSPORT = "memory"
+
+
+@fixture(autouse=True)
+def isolate_revocation_filter(settings: pytestConfig, tmp_path: Path) -> None:
+    """Give every test its own shared revocation filter file."""
+    settings.TOKEN_REVOCATION_FILTER_PATH = str(tmp_path / "revocations")
+    settings.TOKEN_REVOCATION_FILTER_CAPACITY = 1000
+    revocation_filter.rebuild([])
+
+
 @fixture
 def api_client() -> APIClient:
     """Create API client."""
@@ -48,3 +90,28 @@ def create_unverified_user() -> CustomUser:
         password="test123",
         is_verified=False,
     )
+
+
+@fixture
+def create_user_token() -> Callable[..., UserToken]:
+    """Return a factory of UserToken rows, valid for a day by default."""
+
+    def factory(
+        user: CustomUser,
+        expires_in: timedelta = timedelta(days=1),
+        *,
+        digest: str | None = None,
+        is_valid: bool = True,
+        family: UUID | None = None,
+    ) -> UserToken:
+        digest = digest or uuid4().hex
+        return UserToken.objects.create(
+            user=user,
+            token=f"secret-{digest}",
+            token_digest=digest,
+            family=family,
+            is_valid=is_valid,
+            expires_at=timezone.now() + expires_in,
+        )
+
+    return factory
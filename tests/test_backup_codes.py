@@ -0,0 +1,121 @@
+"""Test module for hashed MFA backup codes."""
+
+from __future__ import annotations
+
+from django.urls import reverse
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from accounts.api.verify_mfa import _verify_otp
+from accounts.models.mfa_backup_code import MFABackupCode
+from accounts.models.mfa_method import MFAMethod
+from accounts.models.user_mfa import UserMFA
+from accounts.utils.backup_codes import consume_backup_code
+from accounts.utils.backup_codes import generate_backup_codes
+from accounts.utils.backup_codes import hash_backup_code
+from accounts.utils.generate_token_for_user import generate_token_for_user
+
+
+@fixture
+def otp_config(create_verified_user):
+    """Configure OTP for the verified user."""
+    return UserMFA.objects.create(
+        user=create_verified_user,
+        is_enabled=True,
+        default_method=MFAMethod.objects.get(name="otp"),
+        otp_secret="JBSWY3DPEHPK3PXP",
+    )
+
+
+def authenticate(api_client, user, is_temporary=False):
+    """Send a token of the user with every request of the client."""
+    request = APIRequestFactory().get("/", HTTP_USER_AGENT="pytest")
+    token = generate_token_for_user(
+        user=user,
+        request=request,
+        is_temporary=is_temporary,
+    ).value["token"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+@pytest_mark.django_db
+class TestBackupCodes:
+    """Test class for storing and consuming backup codes."""
+
+    def test_codes_are_stored_hashed(self, create_verified_user, settings):
+        """Test only keyed digests of the codes reach the database."""
+        codes = generate_backup_codes(create_verified_user)
+
+        digests = set(
+            MFABackupCode.objects.filter(user=create_verified_user).values_list(
+                "digest", flat=True
+            )
+        )
+        assert len(codes) == settings.MFA_BACKUP_CODE_COUNT
+        assert digests == {hash_backup_code(code) for code in codes}
+        assert not digests & set(codes)
+
+    def test_code_is_consumed_once_in_one_query(
+        self,
+        create_verified_user,
+        django_assert_num_queries,
+    ):
+        """Test a code is used up by a single DELETE."""
+        code = generate_backup_codes(create_verified_user)[0]
+
+        with django_assert_num_queries(1):
+            assert consume_backup_code(create_verified_user, code)
+        assert not consume_backup_code(create_verified_user, code)
+
+    def test_codes_survive_secret_rotation(self, create_verified_user, settings):
+        """Test codes hashed with a previous SECRET_KEY are still accepted."""
+        code = generate_backup_codes(create_verified_user)[0]
+        settings.SECRET_KEY_FALLBACKS = [settings.SECRET_KEY]
+        settings.SECRET_KEY = "rotated-secret-key-with-enough-length-for-hmac"
+
+        assert consume_backup_code(create_verified_user, code)
+
+    def test_verify_otp_accepts_backup_code(self, otp_config):
+        """Test MFA verification consumes the backup code, not the config."""
+        code = generate_backup_codes(otp_config.user)[0]
+        updated_at = otp_config.updated_at
+
+        assert _verify_otp(code, otp_config) == (True, None)
+        assert _verify_otp(code, otp_config) == (False, "Invalid code")
+
+        otp_config.refresh_from_db()
+        assert otp_config.updated_at == updated_at
+
+    def test_regenerate_replaces_codes(self, api_client, otp_config):
+        """Test the endpoint returns a new set and revokes the old one."""
+        old_code = generate_backup_codes(otp_config.user)[0]
+        client = authenticate(api_client, otp_config.user)
+
+        response = client.post(reverse("accounts:regenerate-backup-codes"))
+
+        assert response.status_code == status.HTTP_200_OK
+        codes = response.data["data"]["backup_codes"]
+        assert MFABackupCode.objects.filter(user=otp_config.user).count() == len(codes)
+        assert not consume_backup_code(otp_config.user, old_code)
+        assert consume_backup_code(otp_config.user, codes[0])
+
+    def test_regenerate_requires_otp(self, api_client, create_verified_user):
+        """Test users without OTP cannot get backup codes."""
+        client = authenticate(api_client, create_verified_user)
+
+        response = client.post(reverse("accounts:regenerate-backup-codes"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "otp_not_configured"
+
+    def test_regenerate_rejects_temporary_token(self, api_client, otp_config):
+        """Test a token pending MFA verification cannot regenerate codes."""
+        client = authenticate(api_client, otp_config.user, is_temporary=True)
+
+        response = client.post(reverse("accounts:regenerate-backup-codes"))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not MFABackupCode.objects.exists()
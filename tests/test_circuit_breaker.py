@@ -0,0 +1,258 @@
+"""Test module for the circuit breaker around the email transport."""
+
+from __future__ import annotations
+
+from threading import Event
+
+from django.urls import reverse
+from django.utils import timezone
+from pytest import fixture
+from pytest import mark as pytest_mark
+from pytest import raises as pytest_raises
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.utils.email import send_email
+from accounts.utils.email_outbox import EmailOutboxWorker
+from accounts.utils.email_outbox import enqueue_email
+from accounts.utils.email_transports import EmailDeliveryError
+from accounts.utils.email_transports import GuardedTransport
+from accounts.utils.email_transports import MemoryTransport
+from accounts.utils.email_transports import TransportUnavailableError
+from accounts.utils.email_transports import get_email_transport
+from utils.circuit_breaker import CircuitBreaker
+from utils.circuit_breaker import CircuitOpenError
+from utils.metrics import metrics
+
+
+class FakeClock:
+    """Clock moved by hand."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@fixture
+def clock() -> FakeClock:
+    """Return a clock moved by hand."""
+    return FakeClock()
+
+
+@fixture
+def breaker(clock) -> CircuitBreaker:
+    """Return a breaker opening after two failures for ten seconds."""
+    return CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=clock)
+
+
+class BlockingTransport(MemoryTransport):
+    """Memory transport whose sends wait until the test releases them."""
+
+    def __init__(self) -> None:
+        """Initialize the transport, blocked."""
+        super().__init__()
+        self.started = Event()
+        self.released = Event()
+
+    def send(self, recipient: str, subject: str, body: str) -> str:
+        """Wait for the release, then keep the email."""
+        self.started.set()
+        self.released.wait()
+        return super().send(recipient, subject, body)
+
+
+@fixture
+def blocking_transport():
+    """Return a transport that never answers while the test runs."""
+    transport = BlockingTransport()
+    yield transport
+    # Libera los hilos abandonados por el presupuesto de tiempo
+    transport.released.set()
+
+
+@fixture
+def slow_email_transport(settings, monkeypatch, blocking_transport):
+    """Put the blocking transport behind the app transport, 50 ms budget."""
+    settings.EMAIL_SEND_TIMEOUT = 0.05
+    monkeypatch.setattr(get_email_transport(), "transport", blocking_transport)
+    return blocking_transport
+
+
+@fixture
+def guarded(breaker) -> GuardedTransport:
+    """Return a memory transport behind the breaker with a 50 ms budget."""
+    return GuardedTransport(
+        MemoryTransport(),
+        breaker=breaker,
+        timeout=0.05,
+        max_workers=2,
+    )
+
+
+def state_gauge() -> float:
+    """Return the published state of the test breaker."""
+    return metrics.snapshot()["gauges"]["circuit_breaker.test.state"]
+
+
+class TestCircuitBreaker:
+    """Test class for the breaker state machine."""
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        """Test the breaker opens at the threshold and rejects calls."""
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert state_gauge() == 2  # noqa: PLR2004
+        with pytest_raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_allows_a_single_probe(self, breaker, clock):
+        """Test one probe goes through after the reset timeout."""
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+
+        breaker.before_call()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert state_gauge() == 1
+        with pytest_raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_probe_result_closes_or_reopens(self, breaker, clock):
+        """Test a failed probe reopens and a successful one closes."""
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 10
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        clock.now = 20
+        breaker.before_call()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert state_gauge() == 0
+
+
+@pytest_mark.django_db
+class TestGuardedTransport:
+    """Test class for the time budget and fast failure of email sends."""
+
+    def test_slow_send_times_out_within_budget(
+        self,
+        guarded,
+        blocking_transport,
+        monkeypatch,
+    ):
+        """Test a transport that never answers is abandoned after the budget."""
+        monkeypatch.setattr(guarded, "transport", blocking_transport)
+
+        with pytest_raises(EmailDeliveryError) as error:
+            guarded.send("a@test.com", "Subject", "Body")
+
+        assert blocking_transport.started.is_set()
+        assert not blocking_transport.sent
+        assert error.value.retryable
+
+    def test_open_circuit_fails_fast(self, guarded, breaker):
+        """Test sends are not attempted while the circuit is open."""
+        guarded.transport.failures.extend(
+            [EmailDeliveryError("Throttling"), EmailDeliveryError("Throttling")]
+        )
+        for _ in range(2):
+            with pytest_raises(EmailDeliveryError):
+                guarded.send("a@test.com", "Subject", "Body")
+
+        with pytest_raises(EmailDeliveryError):
+            guarded.send("a@test.com", "Subject", "Body")
+
+        # Sin fallos pendientes, un envío intentado habría llegado
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not guarded.transport.sent
+
+    def test_open_circuit_does_not_spend_outbox_attempts(self, guarded, breaker):
+        """Test the worker defers emails without counting an attempt."""
+        breaker.failure_threshold = 1
+        breaker.record_failure()
+        email = enqueue_email("a@test.com", "Subject", "Body")
+
+        EmailOutboxWorker(transport=guarded).process_batch()
+
+        email.refresh_from_db()
+        assert email.status == EmailOutbox.STATUS_PENDING
+        assert email.attempts == 0
+        assert email.next_attempt_at > timezone.now()
+        assert not guarded.transport.sent
+
+    def test_late_delivery_is_not_sent_twice(self, breaker, blocking_transport):
+        """Test a send finished after its timeout is not repeated."""
+        guarded = GuardedTransport(
+            blocking_transport, breaker=breaker, timeout=0.05, max_workers=1
+        )
+        with pytest_raises(EmailDeliveryError) as error:
+            guarded.send("a@test.com", "Subject", "Body")
+        assert not isinstance(error.value, TransportUnavailableError)
+
+        blocking_transport.released.set()
+        # La cola de un solo hilo garantiza que el envío abandonado terminó
+        guarded._executor.submit(lambda: None).result()
+        message_id = guarded.send("a@test.com", "Subject", "Body")
+
+        assert len(blocking_transport.sent) == 1
+        assert message_id == blocking_transport.sent[0].message_id
+
+    def test_rejected_email_does_not_open_circuit(self, guarded, breaker):
+        """Test permanent errors are not counted as transport failures."""
+        guarded.transport.failures.extend(
+            [
+                EmailDeliveryError("MessageRejected", retryable=False),
+                EmailDeliveryError("MessageRejected", retryable=False),
+            ]
+        )
+        for _ in range(2):
+            with pytest_raises(EmailDeliveryError):
+                guarded.send("a@test.com", "Subject", "Body")
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_degraded_send_falls_back_to_outbox(self, slow_email_transport):
+        """Test a failed synchronous send is queued and reported as degraded."""
+        get_email_transport().breaker.failure_threshold = 1
+
+        for _ in range(2):
+            result = send_email("a@test.com", "Subject", "Body")
+            assert result.error.code == "email_degraded"
+
+        assert EmailOutbox.objects.count() == 2  # noqa: PLR2004
+
+    def test_login_returns_quickly_when_email_is_slow(
+        self,
+        api_client,
+        create_unverified_user,
+        settings,
+        slow_email_transport,
+        django_capture_on_commit_callbacks,
+    ):
+        """Test a slow email provider does not hold the login request."""
+        settings.SEND_EMAIL = True
+        settings.EMAIL_DELIVERY = "sync"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                reverse("accounts:login"),
+                {"email": "unverified@test.com", "password": "test123"},
+                format="json",
+            )
+
+        assert response.data["code"] == "email_not_verified"
+        # La respuesta llegó con el envío todavía bloqueado
+        assert slow_email_transport.started.is_set()
+        assert not slow_email_transport.released.is_set()
+        assert EmailOutbox.objects.filter(recipient="unverified@test.com").exists()
@@ -0,0 +1,141 @@
+"""Test module for consume-once verification codes."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from threading import Barrier
+
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.api.verify_mfa import _verify_email
+from accounts.models.mfa_method import MFAMethod
+from accounts.models.mfa_verification import MFAVerification
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.consume_once import consume_once
+
+
+def create_code(user, code="123456", expires_in=timedelta(minutes=10)):
+    """Create a pending login verification code."""
+    return VerificationCode.objects.create(
+        user=user,
+        code=code,
+        expires_at=timezone.now() + expires_in,
+        type="login",
+    )
+
+
+def pending_codes(user, code="123456"):
+    """Return the unexpired codes of the user matching the value."""
+    return VerificationCode.objects.filter(
+        user=user,
+        code=code,
+        expires_at__gt=timezone.now(),
+    ).order_by("-created_at")
+
+
+@pytest_mark.django_db
+class TestConsumeOnce:
+    """Test class for the conditional UPDATE ... RETURNING primitive."""
+
+    def test_code_is_consumed_once(self, create_verified_user):
+        """Test the first call returns the used row and the second nothing."""
+        code = create_code(create_verified_user)
+
+        consumed = consume_once(pending_codes(create_verified_user), "is_used")
+
+        assert consumed.pk == code.pk
+        assert consumed.is_used
+        assert consumed.type == "login"
+        assert consume_once(pending_codes(create_verified_user), "is_used") is None
+
+    def test_consume_is_one_query(
+        self,
+        create_verified_user,
+        django_assert_num_queries,
+    ):
+        """Test the lookup and the update share a single round trip."""
+        create_code(create_verified_user)
+
+        with django_assert_num_queries(1):
+            consume_once(pending_codes(create_verified_user), "is_used")
+
+    def test_expired_and_wrong_codes_are_kept(self, create_verified_user):
+        """Test rows outside the queryset are neither returned nor changed."""
+        create_code(create_verified_user, expires_in=timedelta(minutes=-1))
+        create_code(create_verified_user, code="654321")
+
+        assert consume_once(pending_codes(create_verified_user), "is_used") is None
+        assert not VerificationCode.objects.filter(is_used=True).exists()
+
+    def test_mfa_code_is_single_use(self, create_verified_user):
+        """Test an MFA email code verifies once and records when."""
+        method = MFAMethod.objects.get(name="email")
+        verification = MFAVerification.objects.create(
+            user=create_verified_user,
+            method=method,
+            code="123456",
+            expires_at=timezone.now() + timedelta(minutes=10),
+            session_key="session",
+        )
+
+        assert _verify_email("123456", create_verified_user, method) == (True, None)
+        assert _verify_email("123456", create_verified_user, method)[0] is False
+
+        verification.refresh_from_db()
+        assert verification.is_verified
+        assert verification.verified_at is not None
+
+    def test_verify_code_endpoint_consumes_code(
+        self,
+        api_client,
+        create_unverified_user,
+    ):
+        """Test the endpoint verifies the user with the pending code."""
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "unverified@test.com", "password": "test123"},
+            format="json",
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['token']}"
+        )
+        code = VerificationCode.objects.get()
+
+        response = api_client.post(
+            reverse("accounts:verify-code"),
+            {"code": code.code},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        create_unverified_user.refresh_from_db()
+        assert create_unverified_user.is_verified
+
+
+@pytest_mark.django_db(transaction=True)
+class TestConsumeOnceConcurrency:
+    """Test class for concurrent submissions of the same code."""
+
+    def test_parallel_submissions_succeed_once(self, create_verified_user):
+        """Test only one of many simultaneous consumers gets the code."""
+        create_code(create_verified_user)
+        threads = 8
+        barrier = Barrier(threads)
+
+        def submit(_):
+            try:
+                barrier.wait()
+                return consume_once(pending_codes(create_verified_user), "is_used")
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(submit, range(threads)))
+
+        assert len([result for result in results if result is not None]) == 1
+        assert VerificationCode.objects.get().is_used
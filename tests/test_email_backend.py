@@ -0,0 +1,81 @@
+"""Test module for the single-pass email/username authentication."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import connection
+from django.db.models import Q
+from pytest import fixture
+from pytest import mark as pytest_mark
+
+from accounts.auth.password_bulkhead import password_bulkhead
+from accounts.models.custom_user import CustomUser
+
+
+@fixture
+def count_hashes(monkeypatch):
+    """Count the password hashes checked through the bulkhead."""
+    calls = []
+    check_password = password_bulkhead.check_password
+
+    def counting_check_password(raw_password, encoded):
+        calls.append(encoded)
+        return check_password(raw_password, encoded)
+
+    monkeypatch.setattr(password_bulkhead, "check_password", counting_check_password)
+    return calls
+
+
+@pytest_mark.django_db
+class TestEmailBackend:
+    """Test class for the single-pass authentication backend."""
+
+    def test_only_email_backend_is_configured(self):
+        """Test a login attempt goes through a single backend."""
+        assert settings.AUTHENTICATION_BACKENDS == [
+            "accounts.auth.email_backend.EmailBackend",
+        ]
+
+    def test_lookup_ignores_case(self, create_verified_user):
+        """Test email and username match regardless of case."""
+        assert authenticate(username="TEST@Test.com", password="test123")
+        assert authenticate(username="TestUser", password="test123")
+
+    def test_failed_attempts_cost_one_query_and_one_hash(
+        self,
+        create_verified_user,
+        count_hashes,
+        django_assert_num_queries,
+    ):
+        """Test bad passwords and unknown users do the same work."""
+        with django_assert_num_queries(1):
+            assert authenticate(username="test@test.com", password="wrong") is None
+        with django_assert_num_queries(1):
+            assert authenticate(username="nobody@test.com", password="wrong") is None
+
+        assert len(count_hashes) == 2  # noqa: PLR2004
+        assert count_hashes[0].split("$")[:2] == count_hashes[1].split("$")[:2]
+
+    def test_exact_match_wins_over_case_variant(self, create_verified_user):
+        """Test users differing only in case resolve to the exact match."""
+        CustomUser.objects.create_user(
+            username="TESTUSER",
+            email="other@test.com",
+            password="other123",
+        )
+
+        assert authenticate(username="TESTUSER", password="other123")
+        assert authenticate(username="testuser", password="test123")
+
+    def test_lookup_uses_functional_indexes(self, create_verified_user):
+        """Test the case-insensitive lookup is served by an index."""
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = CustomUser.objects.filter(
+            Q(username__iexact="test@test.com") | Q(email__iexact="test@test.com")
+        ).explain()
+
+        assert "customuser_email_upper_idx" in plan
+        assert "customuser_username_upper_idx" in plan
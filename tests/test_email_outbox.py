@@ -0,0 +1,133 @@
+"""Test module for the email outbox and its worker."""
+
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from pytest import fixture
+from pytest import mark as pytest_mark
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.email_outbox import EmailOutboxWorker
+from accounts.utils.email_outbox import enqueue_email
+from accounts.utils.email_transports import EmailDeliveryError
+from accounts.utils.email_transports import MemoryTransport
+from accounts.utils.email_transports import get_email_transport
+
+
+@fixture
+def transport() -> MemoryTransport:
+    """Return a fresh in-memory transport."""
+    return MemoryTransport()
+
+
+@pytest_mark.django_db
+class TestEmailOutbox:
+    """Test class for durable email delivery."""
+
+    def test_login_writes_code_to_outbox(
+        self,
+        api_client,
+        create_unverified_user,
+        settings,
+    ):
+        """Test the verification email is stored with the request."""
+        settings.SEND_EMAIL = True
+
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "unverified@test.com", "password": "test123"},
+            format="json",
+        )
+
+        assert response.data["code"] == "email_not_verified"
+        code = VerificationCode.objects.get(user=create_unverified_user)
+        email = EmailOutbox.objects.get()
+        assert email.recipient == "unverified@test.com"
+        assert code.code in email.body
+        assert email.status == EmailOutbox.STATUS_PENDING
+
+    def test_worker_delivers_pending_emails(self, transport):
+        """Test due emails are sent and marked as sent."""
+        enqueue_email("a@test.com", "Subject", "Body a")
+        enqueue_email("b@test.com", "Subject", "Body b")
+
+        processed = EmailOutboxWorker(transport=transport).process_batch()
+
+        assert processed == 2  # noqa: PLR2004
+        assert {sent.recipient for sent in transport.sent} == {
+            "a@test.com",
+            "b@test.com",
+        }
+        for email in EmailOutbox.objects.all():
+            assert email.status == EmailOutbox.STATUS_SENT
+            assert email.message_id.startswith("memory-")
+            assert email.attempts == 1
+            assert email.body == ""
+
+    def test_retryable_failure_backs_off(self, transport):
+        """Test a temporary failure schedules a later attempt."""
+        email = enqueue_email("a@test.com", "Subject", "Body")
+        transport.failures.append(EmailDeliveryError("Throttling"))
+        worker = EmailOutboxWorker(transport=transport)
+
+        worker.process_batch()
+
+        email.refresh_from_db()
+        assert email.status == EmailOutbox.STATUS_PENDING
+        assert email.attempts == 1
+        assert email.last_error == "Throttling"
+        assert email.next_attempt_at > timezone.now()
+        # No vuelve a intentarse hasta que pase el backoff
+        assert worker.process_batch() == 0
+
+    def test_permanent_failure_goes_to_dead_letter(self, transport):
+        """Test a rejected email is not retried."""
+        email = enqueue_email("a@test.com", "Subject", "Body")
+        transport.failures.append(
+            EmailDeliveryError("MessageRejected", retryable=False)
+        )
+
+        EmailOutboxWorker(transport=transport).process_batch()
+
+        email.refresh_from_db()
+        assert email.status == EmailOutbox.STATUS_DEAD
+        assert email.last_error == "MessageRejected"
+
+    def test_last_attempt_goes_to_dead_letter(self, transport, settings):
+        """Test an email failing EMAIL_MAX_ATTEMPTS times stops retrying."""
+        settings.EMAIL_MAX_ATTEMPTS = 2
+        email = enqueue_email("a@test.com", "Subject", "Body")
+        transport.failures.extend(
+            [EmailDeliveryError("Throttling"), EmailDeliveryError("Throttling")]
+        )
+        worker = EmailOutboxWorker(transport=transport)
+
+        worker.process_batch()
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        worker.process_batch()
+
+        email.refresh_from_db()
+        assert email.status == EmailOutbox.STATUS_DEAD
+        assert email.attempts == 2  # noqa: PLR2004
+
+    def test_command_drains_outbox(self, monkeypatch):
+        """Test the worker command delivers due emails and exits with --once."""
+        # La conexión del test vive dentro de una transacción
+        monkeypatch.setattr(
+            "accounts.utils.email_outbox.close_old_connections",
+            lambda: None,
+        )
+        enqueue_email("a@test.com", "Subject", "Body")
+        stdout = StringIO()
+
+        call_command("run_email_worker", "--once", stdout=stdout)
+
+        assert EmailOutbox.objects.get().status == EmailOutbox.STATUS_SENT
+        assert [sent.recipient for sent in get_email_transport().transport.sent] == [
+            "a@test.com"
+        ]
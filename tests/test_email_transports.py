@@ -0,0 +1,151 @@
+"""Test module for the pooled email transports."""
+
+from __future__ import annotations
+
+from io import StringIO
+from json import dumps as json_dumps
+
+from botocore.stub import ANY
+from botocore.stub import Stubber
+from django.core.management import call_command
+from pytest import fixture
+from pytest import mark as pytest_mark
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.utils.email_outbox import EmailOutboxWorker
+from accounts.utils.email_outbox import enqueue_email
+from accounts.utils.email_transports import DjangoTransport
+from accounts.utils.email_transports import EmailDeliveryError
+from accounts.utils.email_transports import OutgoingEmail
+from accounts.utils.email_transports import SESTransport
+from accounts.utils.email_transports import get_email_transport
+from accounts.utils.smtp_sink import SMTPSink
+
+
+@fixture
+def smtp_sink(settings):
+    """Point the SMTP email backend at a local sink."""
+    sink = SMTPSink(rejected=frozenset({"rejected@test.com"})).start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST = "127.0.0.1"
+    settings.EMAIL_PORT = sink.port
+    yield sink
+    sink.stop()
+
+
+@pytest_mark.django_db
+class TestEmailTransports:
+    """Test class for connection reuse and batched sending."""
+
+    def test_send_many_reuses_one_connection(self, smtp_sink):
+        """Test consecutive batches go over one SMTP connection."""
+        transport = DjangoTransport()
+
+        results = transport.send_many(
+            [
+                OutgoingEmail("a@test.com", "Subject", "Body"),
+                OutgoingEmail("rejected@test.com", "Subject", "Body"),
+            ]
+        )
+        transport.send_many([OutgoingEmail("b@test.com", "Subject", "Body")])
+        transport.close()
+
+        assert smtp_sink.connections == 1
+        assert smtp_sink.messages == [["a@test.com"], ["b@test.com"]]
+        assert isinstance(results[1], EmailDeliveryError)
+        assert not results[1].retryable
+        assert results[0].startswith("<")
+
+    def test_dropped_connection_is_reopened(self, smtp_sink):
+        """Test a connection the server closed while idle is replaced."""
+        transport = DjangoTransport()
+        transport.send("a@test.com", "Subject", "Body")
+        # Simula el cierre por inactividad del lado del servidor
+        transport._connection().connection.close()
+
+        message_id = transport.send("b@test.com", "Subject", "Body")
+        transport.close()
+
+        assert message_id.startswith("<")
+        assert smtp_sink.connections == 2  # noqa: PLR2004
+        assert smtp_sink.messages == [["a@test.com"], ["b@test.com"]]
+
+    def test_worker_keeps_connections_between_batches(self, smtp_sink, settings):
+        """Test later batches reuse the connections of the first one."""
+        settings.EMAIL_TRANSPORT = "django"
+        settings.EMAIL_WORKER_CONCURRENCY = 2
+        worker = EmailOutboxWorker()
+        for batch in range(3):
+            for i in range(4):
+                enqueue_email(f"user{batch}-{i}@test.com", "Subject", "Body")
+            worker.process_batch()
+        worker.transport.close()
+
+        assert smtp_sink.connections <= 2  # noqa: PLR2004
+        assert len(smtp_sink.messages) == 12  # noqa: PLR2004
+        assert not EmailOutbox.objects.exclude(status=EmailOutbox.STATUS_SENT)
+
+    def test_ses_client_is_shared_and_pooled(self, settings):
+        """Test the SES client is built once with a pool for the workers."""
+        settings.EMAIL_TRANSPORT = "ses"
+        settings.EMAIL_WORKER_CONCURRENCY = 8
+
+        transport = get_email_transport()
+        config = transport.transport.client.meta.config
+
+        assert get_email_transport() is transport
+        assert config.max_pool_connections == 8  # noqa: PLR2004
+
+    def test_ses_sends_batch_in_one_bulk_call(self, settings):
+        """Test a template turns a batch into one bulk call per 50 emails."""
+        settings.EMAIL_SES_TEMPLATE = "verification"
+        transport = SESTransport()
+        emails = [
+            OutgoingEmail("a@test.com", "Subject", "Code 1"),
+            OutgoingEmail("b@test.com", "Subject", "Code 2"),
+        ]
+
+        with Stubber(transport.client) as stubber:
+            stubber.add_response(
+                "send_bulk_templated_email",
+                {
+                    "Status": [
+                        {"Status": "Success", "MessageId": "ses-1"},
+                        {"Status": "MessageRejected", "Error": "Bad address"},
+                    ]
+                },
+                {
+                    "Source": settings.DEFAULT_FROM_EMAIL,
+                    "Template": "verification",
+                    "DefaultTemplateData": ANY,
+                    "Destinations": [
+                        {
+                            "Destination": {"ToAddresses": [email.recipient]},
+                            "ReplacementTemplateData": json_dumps(
+                                {"subject": email.subject, "body": email.body}
+                            ),
+                        }
+                        for email in emails
+                    ],
+                },
+            )
+            results = transport.send_many(emails)
+
+        assert results[0] == "ses-1"
+        assert isinstance(results[1], EmailDeliveryError)
+        assert not results[1].retryable
+
+    def test_benchmark_reports_each_strategy(self):
+        """Test the benchmark runs offline against the sink."""
+        stdout = StringIO()
+
+        call_command(
+            "benchmark_email_transport",
+            "--messages=4",
+            "--connect-latency=0",
+            "--message-latency=0",
+            stdout=stdout,
+        )
+
+        assert "(4 connections)" in stdout.getvalue()
+        assert "(1 connections)" in stdout.getvalue()
@@ -0,0 +1,67 @@
+"""Test module for the HS256 JWT codec."""
+
+from __future__ import annotations
+
+from time import time
+
+from jwt import ExpiredSignatureError
+from jwt import InvalidAudienceError
+from jwt import InvalidSignatureError
+from jwt import decode as jwt_decode
+from jwt import encode as jwt_encode
+from pytest import raises as pytest_raises
+
+from accounts.utils.hs256_codec import HS256Codec
+
+SECRET = "codec-test-secret-with-enough-length"
+
+
+def claims(**overrides):
+    """Return the claim set issued at login."""
+    return {
+        "user_id": 1,
+        "email": "test@test.com",
+        "is_temporary": False,
+        "exp": time() + 60,
+        **overrides,
+    }
+
+
+class TestHS256Codec:
+    """Test class for the HS256 codec."""
+
+    def test_tokens_match_pyjwt(self):
+        """Test encoded tokens are identical to the ones of PyJWT."""
+        payload = claims(email="ñandú@test.com")
+
+        token = HS256Codec(SECRET).encode(payload)
+
+        assert token == jwt_encode(payload, SECRET, algorithm="HS256")
+        assert jwt_decode(token, SECRET, algorithms=["HS256"]) == payload
+
+    def test_decodes_pyjwt_tokens(self):
+        """Test tokens issued by PyJWT are verified by the codec."""
+        payload = claims()
+        token = jwt_encode(payload, SECRET, algorithm="HS256")
+
+        assert HS256Codec(SECRET).decode(token) == payload
+
+    def test_rejects_tampered_and_expired_tokens(self):
+        """Test bad signatures and past expirations raise PyJWT errors."""
+        codec = HS256Codec(SECRET)
+        token = codec.encode(claims())
+
+        with pytest_raises(InvalidSignatureError):
+            HS256Codec("another-secret-with-enough-length").decode(token)
+        with pytest_raises(ExpiredSignatureError):
+            codec.decode(codec.encode(claims(exp=time() - 1)))
+
+    def test_unknown_claims_fall_back_to_pyjwt(self):
+        """Test claims outside the fixed set keep the PyJWT validation."""
+        codec = HS256Codec(SECRET)
+        payload = claims(aud="other-service")
+        token = codec.encode(payload)
+
+        assert token == jwt_encode(payload, SECRET, algorithm="HS256")
+        with pytest_raises(InvalidAudienceError):
+            codec.decode(token)
@@ -0,0 +1,185 @@
+"""Test module for the indexes of the verification and session tables."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from re import sub as re_sub
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from pytest import fixture
+from pytest import mark as pytest_mark
+
+from accounts.api.verify_mfa import _verify_email
+from accounts.auth.revocation_filter import database_revocation_keys
+from accounts.models.custom_user import CustomUser
+from accounts.models.mfa_method import MFAMethod
+from accounts.models.mfa_verification import MFAVerification
+from accounts.models.user_token import UserToken
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.email import resend_verification_email
+
+USERS = 200
+ROWS_PER_USER = 5
+
+
+@fixture
+def populated_tables():
+    """Fill the tables with other users' rows, as in production, and analyze.
+
+    The planner then chooses between the indexes and a sequential scan on
+    real statistics.
+    """
+    now = timezone.now()
+    users = CustomUser.objects.bulk_create(
+        [
+            CustomUser(username=f"user{i}", email=f"user{i}@test.com", password="!")
+            for i in range(USERS)
+        ]
+    )
+    method = MFAMethod.objects.get(name="email")
+    VerificationCode.objects.bulk_create(
+        [
+            VerificationCode(
+                user=user,
+                code=f"{i:06d}",
+                expires_at=now + timedelta(minutes=10),
+                is_used=i > 0,
+                type="login",
+            )
+            for user in users
+            for i in range(ROWS_PER_USER)
+        ]
+    )
+    MFAVerification.objects.bulk_create(
+        [
+            MFAVerification(
+                user=user,
+                method=method,
+                code=f"{i:06d}",
+                expires_at=now + timedelta(minutes=10),
+                is_verified=i > 0,
+                session_key="session",
+            )
+            for user in users
+            for i in range(ROWS_PER_USER)
+        ]
+    )
+    UserToken.objects.bulk_create(
+        [
+            UserToken(
+                user=user,
+                token=f"{user.pk}-{i}",
+                token_digest=f"{user.pk}-{i}",
+                family=uuid4(),
+                is_valid=i == 0,
+                expires_at=now + timedelta(days=i - 2),
+            )
+            for user in users
+            for i in range(ROWS_PER_USER)
+        ]
+    )
+    with connection.cursor() as cursor:
+        for model in (VerificationCode, MFAVerification, UserToken):
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+
+def explain(captured: CaptureQueriesContext, prefix: str) -> list[str]:
+    """Return the plans of the captured statements starting with ``prefix``."""
+    plans = []
+    with connection.cursor() as cursor:
+        for query in captured.captured_queries:
+            # Los iterator() usan cursores de servidor: DECLARE ... FOR <sql>
+            sql = re_sub(r"^DECLARE .+? CURSOR WITHOUT HOLD FOR ", "", query["sql"])
+            if sql.startswith(prefix):
+                cursor.execute(f"EXPLAIN {sql}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+    assert plans, f"No statement starting with {prefix}"
+    return plans
+
+
+@pytest_mark.django_db
+@pytest_mark.usefixtures("populated_tables")
+class TestIndexes:
+    """Test class for the plans of the hot queries."""
+
+    def test_verify_code_uses_pending_index(self, api_client, create_unverified_user):
+        """Test the code consumed by the verify endpoint is found by index."""
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "unverified@test.com", "password": "test123"},
+            format="json",
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['token']}"
+        )
+        code = VerificationCode.objects.get(user=create_unverified_user)
+
+        with CaptureQueriesContext(connection) as captured:
+            api_client.post(
+                reverse("accounts:verify-code"),
+                {"code": code.code},
+                format="json",
+            )
+
+        for plan in explain(captured, 'UPDATE "accounts_verificationcode"'):
+            assert "verificationcode_recent_idx" in plan
+
+    def test_resend_uses_pending_index(self, create_unverified_user, settings):
+        """Test the newest pending code of the resend is found by index."""
+        settings.VERIFICATION_RESEND_INTERVAL = 0
+        VerificationCode.objects.create(
+            user=create_unverified_user,
+            code="123456",
+            expires_at=timezone.now() + timedelta(minutes=10),
+            type="login",
+        )
+
+        with CaptureQueriesContext(connection) as captured:
+            resend_verification_email(create_unverified_user)
+
+        for plan in explain(captured, 'SELECT "accounts_verificationcode"'):
+            assert "verificationcode_recent_idx" in plan
+
+    def test_mfa_verification_uses_pending_index(self, create_verified_user):
+        """Test the MFA code verification query."""
+        with CaptureQueriesContext(connection) as captured:
+            _verify_email(
+                "123456", create_verified_user, MFAMethod.objects.get(name="email")
+            )
+
+        for plan in explain(captured, 'UPDATE "accounts_mfaverification"'):
+            assert "mfaverification_pending_idx" in plan
+
+    def test_session_revocation_uses_family_index(
+        self,
+        api_client,
+        create_verified_user,
+        settings,
+    ):
+        """Test a reused refresh token revokes its session by index."""
+        settings.JWT_STATELESS_ACCESS_TOKENS = True
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "test@test.com", "password": "test123"},
+            format="json",
+        )
+        refresh = {"refresh_token": response.data["data"]["refresh_token"]}
+        api_client.post(reverse("accounts:token-refresh"), refresh, format="json")
+
+        with CaptureQueriesContext(connection) as captured:
+            api_client.post(reverse("accounts:token-refresh"), refresh, format="json")
+
+        plans = explain(captured, 'UPDATE "accounts_usertoken"')
+        assert any("usertoken_valid_family_idx" in plan for plan in plans)
+
+    def test_revocation_rebuild_uses_revoked_index(self):
+        """Test the revocation filter rebuild reads only revoked tokens."""
+        with CaptureQueriesContext(connection) as captured:
+            list(database_revocation_keys())
+
+        plan = explain(captured, 'SELECT "accounts_usertoken"."token_digest"')[0]
+        assert "usertoken_revoked_idx" in plan
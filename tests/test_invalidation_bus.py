@@ -0,0 +1,120 @@
+"""Test module for the cache invalidation bus."""
+
+from __future__ import annotations
+
+from threading import Event
+
+from django.urls import reverse
+from pytest import mark as pytest_mark
+
+from accounts.auth.invalidation_bus import MAX_PAYLOAD_SIZE
+from accounts.auth.invalidation_bus import InvalidationBus
+from accounts.auth.invalidation_bus import LocalTransport
+from accounts.auth.invalidation_bus import PostgresTransport
+from accounts.auth.invalidation_bus import invalidation_bus
+from accounts.auth.token_cache import CachedToken
+from accounts.auth.token_cache import TokenCache
+from accounts.auth.token_cache import snapshot_user
+from accounts.utils.hash_token import hash_token
+from utils.metrics import metrics
+
+
+def worker(transport, cache=None):
+    """Create a bus standing in for another worker process."""
+    bus = InvalidationBus(transport=transport, channel="auth_invalidation")
+    received = []
+    bus.register("token", received.append)
+    if cache is not None:
+        bus.register("token", cache.invalidate)
+    bus.start()
+    return bus, received
+
+
+@pytest_mark.django_db
+class TestInvalidationBus:
+    """Test class for the invalidation bus."""
+
+    def test_keys_reach_other_workers_once(self):
+        """Test the publisher applies its keys locally and skips the echo."""
+        transport = LocalTransport()
+        publisher, published = worker(transport)
+        _, received = worker(transport)
+
+        publisher.publish("token", "a", "b")
+
+        assert published == ["a", "b"]
+        assert received == ["a", "b"]
+
+    def test_large_batches_fit_in_a_notification(self):
+        """Test long key lists are split in several messages."""
+        transport = LocalTransport()
+        messages = []
+        transport.listen("auth_invalidation", messages.append, lambda: None)
+        publisher = InvalidationBus(transport=transport, channel="auth_invalidation")
+
+        publisher.publish("token", *(hash_token(str(i)) for i in range(500)))
+
+        assert len(messages) > 1
+        assert all(len(message.encode()) < MAX_PAYLOAD_SIZE for message in messages)
+
+    def test_logout_evicts_token_in_other_workers(
+        self,
+        api_client,
+        create_verified_user,
+        monkeypatch,
+    ):
+        """Test a logout drops the token cached by another worker."""
+        transport = LocalTransport()
+        monkeypatch.setattr(invalidation_bus, "_transport", transport)
+        other_cache = TokenCache(max_size=10, ttl=60)
+        worker(transport, other_cache)
+
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "test@test.com", "password": "test123"},
+        )
+        token = response.data["data"]["token"]
+        digest = hash_token(token)
+        other_cache.set(
+            digest,
+            CachedToken(
+                is_valid=True, user_snapshot=snapshot_user(create_verified_user)
+            ),
+        )
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        api_client.post(reverse("accounts:logout"))
+
+        assert other_cache.get(digest) is None
+
+
+@pytest_mark.django_db(transaction=True)
+class TestPostgresTransport:
+    """Test class for the LISTEN/NOTIFY transport."""
+
+    def test_notification_reaches_listener(self):
+        """Test a published key is received by another connection."""
+        listening = Event()
+        delivered = Event()
+        listener = InvalidationBus(
+            transport=PostgresTransport(poll_timeout=0.1),
+            channel="auth_invalidation_test",
+        )
+        listener.register("user", lambda _user_id: delivered.set())
+        listener.register_reset(listening.set)
+        listener.start()
+        publisher = InvalidationBus(
+            transport=PostgresTransport(),
+            channel="auth_invalidation_test",
+        )
+
+        try:
+            assert listening.wait(5)
+            publisher.publish("user", 1)
+            assert delivered.wait(5)
+        finally:
+            listener.stop()
+
+        summaries = metrics.snapshot()["summaries"]
+        assert summaries["invalidation_bus.lag_seconds"]["count"] >= 1
+        assert summaries["invalidation_bus.publish_seconds"]["count"] >= 1
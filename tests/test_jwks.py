@@ -0,0 +1,129 @@
+"""Test module for asymmetric token signing and the JWKS endpoint."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.asymmetric.rsa import generate_private_key
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.hazmat.primitives.serialization import NoEncryption
+from cryptography.hazmat.primitives.serialization import PrivateFormat
+from django.urls import reverse
+from django.utils import timezone
+from jwt import PyJWKSet
+from jwt import decode as jwt_decode
+from jwt import get_unverified_header as jwt_get_unverified_header
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.utils.jwt_tokens import decode_token
+from accounts.utils.jwt_tokens import encode_token
+
+
+def to_pem(private_key):
+    """Serialize a private key as PEM."""
+    return private_key.private_bytes(
+        Encoding.PEM,
+        PrivateFormat.PKCS8,
+        NoEncryption(),
+    ).decode()
+
+
+@fixture
+def key_ring_settings(settings):
+    """Configure an RSA key in use and an Ed25519 key scheduled for rotation."""
+    settings.JWT_SIGNING_KEYS = [
+        {
+            "kid": "rsa-current",
+            "private_key": to_pem(
+                generate_private_key(public_exponent=65537, key_size=2048)
+            ),
+        },
+        {
+            "kid": "ed25519-next",
+            "private_key": to_pem(Ed25519PrivateKey.generate()),
+            "active_from": (timezone.now() + timedelta(days=1)).isoformat(),
+        },
+    ]
+    return settings
+
+
+@pytest_mark.django_db
+class TestJWKS:
+    """Test class for asymmetric signing with a key ring."""
+
+    def test_token_is_signed_with_active_key(self, key_ring_settings):
+        """Test tokens carry the kid of the active key and verify with it."""
+        token = encode_token({"user_id": 1})
+
+        assert jwt_get_unverified_header(token) == {
+            "alg": "RS256",
+            "kid": "rsa-current",
+            "typ": "JWT",
+        }
+        assert decode_token(token) == {"user_id": 1}
+
+    def test_scheduled_key_signs_after_activation(self, key_ring_settings):
+        """Test the scheduled key takes over once its activation time passes."""
+        key_ring_settings.JWT_SIGNING_KEYS = [
+            {
+                **key_ring_settings.JWT_SIGNING_KEYS[1],
+                "active_from": (timezone.now() - timedelta(minutes=1)).isoformat(),
+            },
+            key_ring_settings.JWT_SIGNING_KEYS[0],
+        ]
+
+        token = encode_token({"user_id": 1})
+
+        assert jwt_get_unverified_header(token)["kid"] == "ed25519-next"
+
+    def test_naive_activation_time_is_utc(self, key_ring_settings):
+        """Test an activation time without offset is read as UTC."""
+        active_from = timezone.now().replace(tzinfo=None) - timedelta(minutes=1)
+        key_ring_settings.JWT_SIGNING_KEYS[1]["active_from"] = active_from.isoformat()
+
+        token = encode_token({"user_id": 1})
+
+        assert jwt_get_unverified_header(token)["kid"] == "ed25519-next"
+        assert decode_token(token) == {"user_id": 1}
+
+    def test_jwks_verifies_tokens_locally(self, api_client, key_ring_settings):
+        """Test the published keys are enough to verify a token."""
+        token = encode_token({"user_id": 1})
+
+        response = api_client.get(reverse("accounts:jwks"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Cache-Control"] == "public, max-age=3600"
+        jwk_set = PyJWKSet.from_dict(response.json())
+        assert [key.key_id for key in jwk_set.keys] == [
+            "rsa-current",
+            "ed25519-next",
+        ]
+        payload = jwt_decode(
+            token,
+            jwk_set["rsa-current"].key,
+            algorithms=["RS256"],
+        )
+        assert payload == {"user_id": 1}
+
+    def test_login_token_authenticates(
+        self,
+        api_client,
+        create_verified_user,
+        key_ring_settings,
+    ):
+        """Test a token signed with the key ring authenticates requests."""
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "test@test.com", "password": "test123"},
+            format="json",
+        )
+        token = response.data["data"]["token"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,196 @@
+"""Test module for JWT authentication."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from django.urls import reverse
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from accounts.auth.token_cache import CachedToken
+from accounts.auth.token_cache import TokenCache
+from accounts.auth.token_cache import snapshot_user
+from accounts.auth.token_cache import token_cache
+from accounts.models.user_token import UserToken
+from accounts.utils.generate_token_for_user import generate_token_for_user
+from accounts.utils.hash_token import hash_token
+
+
+@fixture
+def issue_token():
+    """Issue a token for a user through the regular token generator."""
+
+    def _issue_token(user, is_temporary=False):
+        request = APIRequestFactory().get("/", HTTP_USER_AGENT="pytest")
+        return generate_token_for_user(
+            user=user,
+            request=request,
+            is_temporary=is_temporary,
+        ).value["token"]
+
+    return _issue_token
+
+
+@pytest_mark.django_db
+class TestJWTAuthentication:
+    """Test class for JWT authentication."""
+
+    def test_token_is_stored_by_digest(
+        self,
+        create_verified_user,
+        issue_token,
+    ):
+        """Test the issued token is stored with its digest."""
+        token = issue_token(create_verified_user)
+
+        user_token = UserToken.objects.get(user=create_verified_user)
+        assert user_token.token_digest == hash_token(token)
+
+    def test_authenticated_request(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+    ):
+        """Test a request authenticated with a valid token."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_logout_invalidates_token(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+    ):
+        """Test logout invalidates the token looked up by digest."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.post(reverse("accounts:logout"))
+        assert response.status_code == status.HTTP_200_OK
+        assert not UserToken.objects.get(token_digest=hash_token(token)).is_valid
+
+        response = api_client.get(reverse("accounts:mfa-methods"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_repeated_request_is_served_from_cache(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+    ):
+        """Test a second request with the same token skips decoding and the DB."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        api_client.get(reverse("accounts:mfa-methods"))
+        assert token_cache.get(hash_token(token)) is not None
+
+        with patch("accounts.auth.jwt_authentication.decode_token") as mock_decode:
+            response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_decode.assert_not_called()
+
+    def test_user_change_invalidates_cache(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+    ):
+        """Test saving the user drops its cached tokens."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        api_client.get(reverse("accounts:mfa-methods"))
+
+        create_verified_user.has_mfa = True
+        create_verified_user.save()
+
+        assert token_cache.get(hash_token(token)) is None
+
+
+class TestTokenCache:
+    """Test class for the token cache."""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache is bounded and evicts the oldest entry."""
+        cache = TokenCache(max_size=2, ttl=60)
+        for digest in ("a", "b"):
+            cache.set(digest, CachedToken(is_valid=True, user_snapshot={"id": 1}))
+        cache.get("a")
+
+        cache.set("c", CachedToken(is_valid=True, user_snapshot={"id": 1}))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2  # noqa: PLR2004
+
+    def test_entry_expires_with_token(self):
+        """Test entries are not kept beyond the token expiry."""
+        cache = TokenCache(max_size=10, ttl=60)
+
+        cache.set("a", CachedToken(is_valid=True), expires_in=0)
+
+        assert cache.get("a") is None
+
+    @pytest_mark.django_db
+    def test_user_is_rebuilt_from_snapshot(self, create_verified_user):
+        """Test every snapshot column lands on its own attribute."""
+        entry = CachedToken(
+            is_valid=True,
+            user_snapshot=snapshot_user(create_verified_user),
+        )
+
+        user = entry.build_user()
+
+        assert snapshot_user(user) == snapshot_user(create_verified_user)
+
+
+@pytest_mark.django_db
+class TestJWTAuthenticationQueries:
+    """Test class for the number of queries per authenticated request."""
+
+    def test_cache_miss_uses_single_query(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+        django_assert_num_queries,
+    ):
+        """Test token and user are resolved with one joined query."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        # Authentication plus the MFA methods listing
+        with django_assert_num_queries(2) as captured:
+            response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
+        auth_query = captured.captured_queries[0]["sql"]
+        assert "INNER JOIN" in auth_query
+        assert "password" not in auth_query
+
+    def test_cache_hit_skips_authentication_queries(
+        self,
+        api_client,
+        create_verified_user,
+        issue_token,
+        django_assert_num_queries,
+    ):
+        """Test a cached token needs no query to authenticate."""
+        token = issue_token(create_verified_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        api_client.get(reverse("accounts:mfa-methods"))
+
+        # Only the MFA methods listing
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
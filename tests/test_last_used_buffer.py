@@ -0,0 +1,60 @@
+"""Test module for the token last-used write-behind buffer."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.utils import timezone
+from pytest import mark as pytest_mark
+
+from accounts.auth.last_used_buffer import LastUsedBuffer
+
+
+@pytest_mark.django_db
+class TestLastUsedBuffer:
+    """Test class for the last-used buffer."""
+
+    def test_recent_timestamp_is_not_buffered(self):
+        """Test uses within the granularity window are skipped."""
+        buffer = LastUsedBuffer(flush_interval=3600, flush_size=10, granularity=60)
+        now = timezone.now()
+
+        assert not buffer.touch(1, now - timedelta(seconds=10), now=now)
+        assert buffer.touch(1, now - timedelta(seconds=120), now=now)
+        assert len(buffer) == 1
+
+    def test_uses_are_coalesced_until_flush_size(
+        self, create_verified_user, create_user_token
+    ):
+        """Test repeated uses coalesce and are flushed in bulk."""
+        buffer = LastUsedBuffer(flush_interval=3600, flush_size=2, granularity=0)
+        first = create_user_token(create_verified_user, digest="a" * 64)
+        second = create_user_token(create_verified_user, digest="b" * 64)
+        used_at = timezone.now() + timedelta(minutes=5)
+
+        buffer.touch(first.pk, None, now=used_at)
+        buffer.touch(first.pk, None, now=used_at)
+        assert len(buffer) == 1
+
+        buffer.touch(second.pk, None, now=used_at)
+        assert len(buffer) == 0
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.last_used_at == used_at
+        assert second.last_used_at == used_at
+
+    def test_flush_persists_pending_entries(
+        self, create_verified_user, create_user_token
+    ):
+        """Test an explicit flush, as done on shutdown, writes pending entries."""
+        buffer = LastUsedBuffer(flush_interval=3600, flush_size=10, granularity=0)
+        user_token = create_user_token(create_verified_user, digest="c" * 64)
+        used_at = timezone.now() + timedelta(minutes=5)
+
+        buffer.touch(user_token.pk, None, now=used_at)
+
+        assert buffer.flush() == 1
+        assert buffer.flush() == 0
+        user_token.refresh_from_db()
+        assert user_token.last_used_at == used_at
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from pytest import fixture
 from pytest import mark as pytest_mark
 from rest_framework import status
 
 from accounts.models.mfa_method import MFAMethod
+from accounts.models.mfa_verification import MFAVerification
 from accounts.models.user_mfa import UserMFA
+from accounts.models.user_token import UserToken
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.user_agent import device_resolver
+from accounts.utils.user_agent import user_agent_cache
 from utils.logger import logger
+from utils.result_as_values import Result
 
 
 @pytest_mark.django_db
@@ -172,3 +181,109 @@ class TestLogin:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "errors" in response.data
+
+
+def login_queries(api_client, email):
+    """Log in and return the response and the statements it ran.
+
+    Savepoints are left out: in production the login transaction is the
+    outermost one and BEGIN/COMMIT are not extra statements.
+    """
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": email, "password": "test123"},
+            format="json",
+        )
+    queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if "SAVEPOINT" not in query["sql"]
+    ]
+    return response, queries
+
+
+@fixture
+def known_device(django_capture_on_commit_callbacks):
+    """Resolve the test client's device once, as a warm worker would have."""
+    with django_capture_on_commit_callbacks(execute=True):
+        device_resolver.resolve(user_agent_cache.parse(""))
+
+
+@pytest_mark.django_db
+@pytest_mark.usefixtures("known_device")
+class TestLoginQueryBudget:
+    """Test class for the number of statements per login branch."""
+
+    def test_verified_login(self, api_client, create_verified_user):
+        """Test user and MFA lookup plus the token insert."""
+        response, queries = login_queries(api_client, "test@test.com")
+
+        assert response.data["code"] == "success"
+        assert len(queries) == 2  # noqa: PLR2004
+
+    def test_verified_login_with_postgres_bus(
+        self,
+        api_client,
+        create_verified_user,
+        settings,
+    ):
+        """Test issuing a token publishes no invalidation."""
+        settings.AUTH_INVALIDATION_TRANSPORT = "postgres"
+
+        response, queries = login_queries(api_client, "test@test.com")
+
+        assert response.data["code"] == "success"
+        assert len(queries) == 2  # noqa: PLR2004
+        assert not [sql for sql in queries if "pg_notify" in sql]
+
+    def test_unverified_login(self, api_client, create_unverified_user):
+        """Test the token and the replaced verification code."""
+        response, queries = login_queries(api_client, "unverified@test.com")
+
+        assert response.data["code"] == "email_not_verified"
+        assert len(queries) == 4  # noqa: PLR2004
+
+    def test_mfa_login(self, api_client, create_verified_user):
+        """Test the token and the MFA verification, without a second code."""
+        UserMFA.objects.create(
+            user=create_verified_user,
+            is_enabled=True,
+            default_method=MFAMethod.objects.get(name="email"),
+        )
+
+        response, queries = login_queries(api_client, "test@test.com")
+
+        assert response.data["code"] == "mfa_verification_required"
+        assert len(queries) == 3  # noqa: PLR2004
+        verification = MFAVerification.objects.get(user=create_verified_user)
+        assert response.data["data"]["verification"]["code"] == verification.code
+        assert not VerificationCode.objects.filter(user=create_verified_user).exists()
+
+    def test_failed_step_rolls_back_the_login(
+        self,
+        api_client,
+        create_unverified_user,
+        monkeypatch,
+    ):
+        """Test the token is not kept when the verification code fails."""
+
+        def failing_send_verification_email(**kwargs):
+            VerificationCode.objects.create(
+                user=kwargs["user"],
+                code="000000",
+                expires_at=create_unverified_user.created_at,
+                type="login",
+            )
+            return Result.fail("email_failed", "Email failed")
+
+        monkeypatch.setattr(
+            "accounts.api.login.send_verification_email",
+            failing_send_verification_email,
+        )
+
+        response, _ = login_queries(api_client, "unverified@test.com")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert not UserToken.objects.filter(user=create_unverified_user).exists()
+        assert not VerificationCode.objects.filter(user=create_unverified_user).exists()
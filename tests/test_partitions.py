@@ -0,0 +1,208 @@
+"""Test module for the monthly partitioning of UserToken."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from threading import Event
+from threading import Thread
+
+from django.core.management import call_command
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.models.user_token import UserToken
+from accounts.utils.partitions import TokenPartitions
+from accounts.utils.partitions import month_start
+from accounts.utils.partitions import token_partitions
+from accounts.utils.reaper import Reaper
+from utils.metrics import metrics
+
+
+@fixture
+def scratch_partitions():
+    """Return a partitioned table of three past months and the current one.
+
+    Tests outside a transaction cannot convert UserToken itself: the change
+    would outlive the test.
+    """
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE scratch_tokens (expires_at timestamptz NOT NULL) "
+            "PARTITION BY RANGE (expires_at)"
+        )
+    partitions = TokenPartitions("scratch_tokens")
+    partitions.create_partitions(month_start(now, -3), now)
+    yield partitions
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE scratch_tokens")
+
+
+@pytest_mark.django_db
+class TestTokenPartitions:
+    """Test class for converting and maintaining the partitioned table."""
+
+    def test_convert_keeps_rows_and_ids(self, create_verified_user, create_user_token):
+        """Test every token survives the conversion and ids keep growing."""
+        tokens = [
+            create_user_token(create_verified_user, timedelta(days=days))
+            for days in (-90, -1, 7, 120)
+        ]
+
+        copied = token_partitions.convert(months_ahead=2)
+        token = create_user_token(create_verified_user, timedelta(days=1))
+
+        assert copied == len(tokens)
+        assert token_partitions.is_partitioned()
+        assert token.pk > max(existing.pk for existing in tokens)
+        assert set(UserToken.objects.values_list("pk", flat=True)) == {
+            existing.pk for existing in [*tokens, token]
+        }
+
+    def test_convert_covers_every_month(self, create_verified_user, create_user_token):
+        """Test partitions span the oldest token to the months ahead."""
+        create_user_token(create_verified_user, timedelta(days=-70))
+        now = timezone.now()
+
+        token_partitions.convert(months_ahead=2)
+
+        months = sorted(token_partitions.partitions())
+        assert months[0] == month_start(now - timedelta(days=70))
+        assert months[-1] == month_start(now, 2)
+
+    def test_login_works_on_partitioned_table(self, api_client, create_verified_user):
+        """Test tokens are issued into and read from the partitions."""
+        token_partitions.convert(months_ahead=2)
+
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "test@test.com", "password": "test123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert UserToken.objects.filter(user=create_verified_user).exists()
+
+    def test_maintain_drops_expired_months(
+        self, create_verified_user, create_user_token
+    ):
+        """Test whole expired months are dropped and new ones created."""
+        old = create_user_token(create_verified_user, timedelta(days=-70))
+        current = create_user_token(create_verified_user, timedelta(days=1))
+        token_partitions.convert(months_ahead=1)
+
+        created, dropped = token_partitions.maintain(3, timezone.now())
+
+        assert token_partitions.partition_name(old.expires_at) in dropped
+        assert token_partitions.partition_name(month_start(timezone.now(), 3)) in (
+            created
+        )
+        assert list(UserToken.objects.values_list("pk", flat=True)) == [current.pk]
+
+    def test_reaper_drops_partitions(self, create_verified_user, create_user_token):
+        """Test the reaper drops expired months when the table is partitioned."""
+        create_user_token(create_verified_user, timedelta(days=-70))
+        token_partitions.convert(months_ahead=2)
+
+        Reaper(pause=0).run()
+
+        assert month_start(timezone.now() - timedelta(days=70)) not in (
+            token_partitions.partitions()
+        )
+        assert not UserToken.objects.exists()
+
+    def test_command_converts_table(self, create_verified_user, create_user_token):
+        """Test the command converts the table and reports it."""
+        create_user_token(create_verified_user, timedelta(days=1))
+        stdout = StringIO()
+
+        call_command("partition_user_tokens", "--convert", stdout=stdout)
+
+        assert "Copied 1 tokens" in stdout.getvalue()
+        assert token_partitions.is_partitioned()
+
+    def test_missing_coverage_is_reported(self, settings):
+        """Test tokens outliving the last partition are reported."""
+        settings.JWT_REFRESH_TOKEN_LIFETIME = 100 * 24 * 60 * 60
+        token_partitions.convert(months_ahead=1)
+
+        assert not token_partitions.check_coverage()
+        gauges = metrics.snapshot()["gauges"]
+        assert gauges["user_token_partitions.covered_days"] < 100  # noqa: PLR2004
+
+        token_partitions.maintain(5, timezone.now())
+
+        assert token_partitions.check_coverage()
+
+    def test_expired_months_are_detached_before_drop(
+        self, create_verified_user, create_user_token
+    ):
+        """Test a partition is detached from the table, then dropped."""
+        create_user_token(create_verified_user, timedelta(days=-70))
+        token_partitions.convert(months_ahead=1)
+
+        with CaptureQueriesContext(connection) as captured:
+            token_partitions.drop_expired(month_start(timezone.now()))
+
+        statements = [query["sql"] for query in captured.captured_queries]
+        assert any("DETACH PARTITION" in sql for sql in statements)
+        assert any(sql.startswith("SET LOCAL lock_timeout") for sql in statements)
+
+
+@pytest_mark.django_db(transaction=True)
+class TestTokenPartitionsDetach:
+    """Test class for dropping partitions outside a transaction."""
+
+    def test_detach_is_concurrent(self, scratch_partitions):
+        """Test partitions are detached without blocking the table."""
+        now = timezone.now()
+
+        with CaptureQueriesContext(connection) as captured:
+            dropped = scratch_partitions.drop_expired(month_start(now, -1))
+
+        assert dropped == [
+            scratch_partitions.partition_name(month_start(now, months))
+            for months in (-3, -2)
+        ]
+        assert sorted(scratch_partitions.partitions()) == [
+            month_start(now, -1),
+            month_start(now),
+        ]
+        assert any(
+            "DETACH PARTITION" in query["sql"] and "CONCURRENTLY" in query["sql"]
+            for query in captured.captured_queries
+        )
+
+    def test_busy_table_is_retried_later(self, scratch_partitions, settings):
+        """Test a detach gives up at the lock timeout and keeps the partition."""
+        settings.USER_TOKEN_PARTITION_LOCK_TIMEOUT = 0.05
+        locked = Event()
+        release = Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute("LOCK TABLE scratch_tokens IN EXCLUSIVE MODE")
+                    locked.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        holder = Thread(target=hold_lock)
+        holder.start()
+        locked.wait(timeout=10)
+        try:
+            dropped = scratch_partitions.drop_expired(timezone.now())
+        finally:
+            release.set()
+            holder.join()
+
+        assert dropped == []
+        assert len(scratch_partitions.partitions()) == 4  # noqa: PLR2004
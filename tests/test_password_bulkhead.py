@@ -0,0 +1,121 @@
+"""Test module for the password hashing bulkhead."""
+
+from __future__ import annotations
+
+from threading import Event
+from threading import Thread
+
+from django.contrib.auth import authenticate
+from django.urls import reverse
+from pytest import mark as pytest_mark
+from pytest import raises as pytest_raises
+from rest_framework import status
+
+from accounts.auth.password_bulkhead import HashingBulkheadFullError
+from accounts.auth.password_bulkhead import PasswordBulkhead
+from accounts.auth.password_bulkhead import password_bulkhead
+from utils.metrics import metrics
+
+
+def occupy(bulkhead):
+    """Keep the only hashing thread busy until the returned event is set."""
+    started = Event()
+    release = Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+
+    thread = Thread(target=bulkhead.run, args=(blocked,))
+    thread.start()
+    started.wait(5)
+    return release, thread
+
+
+@pytest_mark.django_db
+class TestPasswordBulkhead:
+    """Test class for the password hashing bulkhead."""
+
+    def test_full_queue_fails_fast(self):
+        """Test work beyond the queue limit is rejected right away."""
+        bulkhead = PasswordBulkhead(max_workers=1, max_queue=0)
+        release, thread = occupy(bulkhead)
+
+        try:
+            with pytest_raises(HashingBulkheadFullError):
+                bulkhead.make_password("test123")
+        finally:
+            release.set()
+            thread.join()
+
+        encoded = bulkhead.make_password("test123")
+        assert bulkhead.check_password("test123", encoded) == (True, False)
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["password_hashing.rejected"] >= 1
+        assert "password_hashing.queue_wait_seconds" in snapshot["summaries"]
+        assert "password_hashing.hash_seconds" in snapshot["summaries"]
+
+    def test_login_returns_503_when_overloaded(
+        self,
+        api_client,
+        create_verified_user,
+        settings,
+    ):
+        """Test logins are shed with 503 instead of queueing forever."""
+        settings.PASSWORD_HASHING_WORKERS = 1
+        settings.PASSWORD_HASHING_MAX_QUEUE = 0
+        release, thread = occupy(password_bulkhead)
+
+        try:
+            response = api_client.post(
+                reverse("accounts:login"),
+                {"email": "test@test.com", "password": "test123"},
+                format="json",
+            )
+        finally:
+            release.set()
+            thread.join()
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.data["code"] == "service_overloaded"
+
+    def test_verified_login_skips_rehash_when_overloaded(
+        self,
+        create_verified_user,
+        settings,
+        monkeypatch,
+    ):
+        """Test a full pool skips the rehash instead of rejecting the login."""
+        settings.PASSWORD_PBKDF2_ITERATIONS = 100000
+        encoded = create_verified_user.password
+
+        def full_make_password(_raw_password):
+            raise HashingBulkheadFullError("Password hashing queue is full")
+
+        monkeypatch.setattr(password_bulkhead, "make_password", full_make_password)
+
+        assert authenticate(username="test@test.com", password="test123")
+        create_verified_user.refresh_from_db()
+        assert create_verified_user.password == encoded
+        assert metrics.snapshot()["counters"]["password_hashing.rehash_skipped"] >= 1
+
+    def test_registered_password_is_hashed_on_pool(self, api_client):
+        """Test a user registered through the pool can log in."""
+        api_client.post(
+            reverse("accounts:register"),
+            {
+                "email": "new@test.com",
+                "username": "newuser",
+                "password": "test123",
+            },
+            format="json",
+        )
+
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "new@test.com", "password": "test123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "email_not_verified"
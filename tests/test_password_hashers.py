@@ -0,0 +1,60 @@
+"""Test module for calibrated password hashers."""
+
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from pytest import mark as pytest_mark
+
+from accounts.auth.hashers import CalibratedScryptPasswordHasher
+
+
+@pytest_mark.django_db
+class TestCalibratedHashers:
+    """Test class for tunable hashing cost and rehash on login."""
+
+    def test_login_rehashes_after_cost_change(self, create_verified_user, settings):
+        """Test a new iteration count is applied on the next login."""
+        settings.PASSWORD_PBKDF2_ITERATIONS = 100000
+
+        authenticate(username="test@test.com", password="test123")
+
+        create_verified_user.refresh_from_db()
+        assert create_verified_user.password.startswith("pbkdf2_sha256$100000$")
+        assert authenticate(username="test@test.com", password="test123")
+
+    def test_login_moves_password_to_preferred_hasher(
+        self,
+        create_verified_user,
+        settings,
+    ):
+        """Test stored hashes move to scrypt once it is preferred."""
+        settings.PASSWORD_SCRYPT_WORK_FACTOR = 1024
+        settings.PASSWORD_HASHERS = [
+            "accounts.auth.hashers.CalibratedScryptPasswordHasher",
+            "accounts.auth.hashers.CalibratedPBKDF2PasswordHasher",
+        ]
+
+        authenticate(username="test@test.com", password="test123")
+
+        create_verified_user.refresh_from_db()
+        assert create_verified_user.password.startswith("scrypt$1024$")
+        assert not CalibratedScryptPasswordHasher().must_update(
+            create_verified_user.password
+        )
+
+    def test_calibration_recommends_settings(self, settings):
+        """Test the command prints a value for the configured hasher."""
+        settings.PASSWORD_PBKDF2_ITERATIONS = 10000
+        stdout = StringIO()
+
+        call_command(
+            "calibrate_password_hashers",
+            "--hasher=pbkdf2",
+            "--samples=1",
+            stdout=stdout,
+        )
+
+        assert "PASSWORD_PBKDF2_ITERATIONS=" in stdout.getvalue()
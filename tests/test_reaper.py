@@ -0,0 +1,145 @@
+"""Test module for the expired-record reaper."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from gzip import open as gzip_open
+from io import StringIO
+from json import loads as json_loads
+from uuid import uuid4
+
+from django.core.management import call_command
+from django.utils import timezone
+from pytest import fixture
+from pytest import mark as pytest_mark
+from pytest import raises as pytest_raises
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.models.mfa_method import MFAMethod
+from accounts.models.mfa_verification import MFAVerification
+from accounts.models.verification_code import VerificationCode
+from accounts.utils.reaper import Reaper
+
+
+@fixture
+def rows(create_verified_user, create_user_token):
+    """Create rows to keep and rows to delete, keyed by what they are."""
+    user = create_verified_user
+    past = timedelta(hours=-2)
+    future = timedelta(hours=1)
+    method = MFAMethod.objects.get(name="email")
+
+    def code(expires_in, is_used=False):
+        return VerificationCode.objects.create(
+            user=user,
+            code="123456",
+            expires_at=timezone.now() + expires_in,
+            is_used=is_used,
+            type="login",
+        )
+
+    def mfa(expires_in):
+        return MFAVerification.objects.create(
+            user=user,
+            method=method,
+            code="123456",
+            expires_at=timezone.now() + expires_in,
+            session_key="session",
+        )
+
+    def email(status, created_in):
+        email = EmailOutbox.objects.create(
+            recipient="test@test.com",
+            subject="Subject",
+            body="Your code is 123456",
+            status=status,
+        )
+        EmailOutbox.objects.filter(pk=email.pk).update(
+            created_at=timezone.now() + created_in
+        )
+        return email
+
+    return {
+        "keep": [
+            create_user_token(user, future),
+            create_user_token(user, future, is_valid=False, family=uuid4()),
+            create_user_token(user, timedelta(minutes=-5)),
+            code(future),
+            mfa(future),
+            email(EmailOutbox.STATUS_PENDING, past),
+            email(EmailOutbox.STATUS_SENT, timedelta(minutes=-5)),
+        ],
+        "delete": [
+            create_user_token(user, past),
+            create_user_token(user, past),
+            create_user_token(user, past, is_valid=False, family=uuid4()),
+            create_user_token(user, future, is_valid=False),
+            code(past),
+            code(future, is_used=True),
+            mfa(past),
+            email(EmailOutbox.STATUS_SENT, past),
+            email(EmailOutbox.STATUS_DEAD, past),
+        ],
+    }
+
+
+@pytest_mark.django_db
+class TestReaper:
+    """Test class for deleting expired and revoked rows."""
+
+    def test_deletes_only_rows_no_longer_needed(self, rows):
+        """Test expired rows, used codes and revoked access tokens go."""
+        reports = Reaper(batch_size=2, pause=0).run()
+
+        for row in rows["keep"]:
+            assert type(row).objects.filter(pk=row.pk).exists()
+        for row in rows["delete"]:
+            assert not type(row).objects.filter(pk=row.pk).exists()
+        deleted = {report.table: report.deleted for report in reports}
+        assert deleted == {
+            "accounts_usertoken": 4,
+            "accounts_verificationcode": 2,
+            "accounts_mfaverification": 1,
+            "accounts_emailoutbox": 2,
+        }
+        assert reports[0].batches == 2  # noqa: PLR2004
+
+    def test_archives_deleted_rows_without_secrets(self, rows, tmp_path):
+        """Test the deleted tokens are archived without the token itself."""
+        Reaper(pause=0, archive_dir=str(tmp_path)).run()
+
+        [archive] = tmp_path.glob("accounts_usertoken-*.jsonl.gz")
+        with gzip_open(archive, "rt") as archive_file:
+            archived = [json_loads(line) for line in archive_file]
+        assert len(archived) == 4  # noqa: PLR2004
+        assert "token" not in archived[0]
+        assert "token_digest" in archived[0]
+
+    def test_archived_batches_are_on_disk_before_the_run_ends(
+        self, rows, tmp_path, monkeypatch
+    ):
+        """Test a committed batch is already readable from the archive."""
+        archived = []
+
+        def crash(seconds):
+            # El proceso muere aquí: el primer lote ya está confirmado
+            [archive] = tmp_path.glob("accounts_usertoken-*.jsonl.gz")
+            with gzip_open(archive, "rt") as archive_file:
+                archived.extend(archive_file.readlines())
+            raise RuntimeError("crash")
+
+        monkeypatch.setattr("accounts.utils.reaper.sleep", crash)
+        with pytest_raises(RuntimeError):
+            Reaper(batch_size=2, pause=0, archive_dir=str(tmp_path)).run()
+
+        assert len(archived) == 2  # noqa: PLR2004
+
+    def test_command_reports_throughput(self, rows):
+        """Test the command prints deleted rows and rows per second."""
+        stdout = StringIO()
+
+        call_command("reap_expired", "--batch-size=1", "--pause=0", stdout=stdout)
+
+        output = stdout.getvalue()
+        assert "accounts_usertoken: 4 rows in 4 batches" in output
+        assert "rows/s" in output
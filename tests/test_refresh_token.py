@@ -0,0 +1,115 @@
+"""Test module for stateless access tokens and rotating refresh tokens."""
+
+from __future__ import annotations
+
+from django.urls import reverse
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.auth.token_cache import token_cache
+from accounts.models.user_token import UserToken
+
+
+@fixture
+def stateless_tokens(settings):
+    """Enable stateless access tokens."""
+    settings.JWT_STATELESS_ACCESS_TOKENS = True
+    return settings
+
+
+@fixture
+def login_tokens(api_client, create_verified_user, stateless_tokens):
+    """Log in and return the access and refresh tokens."""
+    response = api_client.post(
+        reverse("accounts:login"),
+        {"email": "test@test.com", "password": "test123"},
+        format="json",
+    )
+    return response.data["data"]
+
+
+@pytest_mark.django_db
+class TestRefreshToken:
+    """Test class for the access and refresh token model."""
+
+    def test_access_token_needs_no_database(
+        self,
+        api_client,
+        login_tokens,
+        django_assert_num_queries,
+    ):
+        """Test an access token authenticates without reading the database."""
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_tokens['token']}")
+
+        # Only the MFA methods listing
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_refresh_rotates_tokens(self, api_client, login_tokens):
+        """Test refreshing returns a new pair and consumes the old token."""
+        url = reverse("accounts:token-refresh")
+
+        response = api_client.post(
+            url,
+            {"refresh_token": login_tokens["refresh_token"]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        tokens = response.data["data"]
+        assert tokens["refresh_token"] != login_tokens["refresh_token"]
+        assert UserToken.objects.filter(is_valid=True).count() == 1
+
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['token']}")
+        response = api_client.get(reverse("accounts:mfa-methods"))
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_reused_refresh_token_revokes_session(self, api_client, login_tokens):
+        """Test presenting a rotated refresh token revokes the whole family."""
+        url = reverse("accounts:token-refresh")
+        api_client.post(
+            url,
+            {"refresh_token": login_tokens["refresh_token"]},
+            format="json",
+        )
+
+        response = api_client.post(
+            url,
+            {"refresh_token": login_tokens["refresh_token"]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["code"] == "refresh_token_reused"
+        assert not UserToken.objects.filter(is_valid=True).exists()
+
+    def test_refresh_token_is_not_a_bearer_token(self, api_client, login_tokens):
+        """Test a refresh token cannot authenticate requests."""
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {login_tokens['refresh_token']}"
+        )
+
+        response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_revokes_refresh_token(self, api_client, login_tokens):
+        """Test logging out with an access token revokes its refresh token."""
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login_tokens['token']}")
+
+        response = api_client.post(reverse("accounts:logout"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not UserToken.objects.filter(is_valid=True).exists()
+
+        token_cache.clear()
+        api_client.credentials()
+        response = api_client.post(
+            reverse("accounts:token-refresh"),
+            {"refresh_token": login_tokens["refresh_token"]},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,69 @@
+"""Test module for the resend code cooldown."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.urls import reverse
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.models.email_outbox import EmailOutbox
+from accounts.models.verification_code import VerificationCode
+
+
+@fixture
+def temporary_client(api_client, create_unverified_user, settings):
+    """Log in the unverified user and keep its temporary token."""
+    settings.SEND_EMAIL = True
+    response = api_client.post(
+        reverse("accounts:login"),
+        {"email": "unverified@test.com", "password": "test123"},
+        format="json",
+    )
+    token = response.data["data"]["token"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+@pytest_mark.django_db
+class TestResendCode:
+    """Test class for coalescing resend requests."""
+
+    def test_resend_within_interval_reuses_code(self, temporary_client):
+        """Test a burst of resends keeps the code and sends no email."""
+        code = VerificationCode.objects.get()
+
+        for _ in range(3):
+            response = temporary_client.post(reverse("accounts:resend-code"))
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["data"]["resent"] is False
+
+        assert VerificationCode.objects.get().pk == code.pk
+        assert EmailOutbox.objects.count() == 1
+        assert response.data["data"]["next_resend_at"] > code.created_at
+
+    def test_resend_after_interval_sends_new_code(self, temporary_client):
+        """Test a resend after the interval issues and emails a new code."""
+        code = VerificationCode.objects.get()
+        VerificationCode.objects.update(
+            created_at=code.created_at - timedelta(seconds=61)
+        )
+
+        response = temporary_client.post(reverse("accounts:resend-code"))
+
+        assert response.data["data"]["resent"] is True
+        new_code = VerificationCode.objects.get()
+        assert new_code.pk != code.pk
+        assert EmailOutbox.objects.count() == 2  # noqa: PLR2004
+
+    def test_expired_code_is_replaced(self, temporary_client):
+        """Test an expired code is never reused, even within the interval."""
+        VerificationCode.objects.update(
+            expires_at=VerificationCode.objects.get().created_at
+        )
+
+        response = temporary_client.post(reverse("accounts:resend-code"))
+
+        assert response.data["data"]["resent"] is True
@@ -0,0 +1,105 @@
+"""Test module for the shared token revocation filter."""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+from django.urls import reverse
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.auth.revocation_filter import RevocationFilter
+from accounts.auth.revocation_filter import RevocationStatus
+from accounts.auth.revocation_filter import session_key
+from accounts.auth.revocation_filter import token_key
+from accounts.auth.token_cache import token_cache
+
+
+@pytest_mark.django_db
+class TestRevocationFilter:
+    """Test class for the revocation filter."""
+
+    def test_revocation_is_shared_between_workers(self, tmp_path):
+        """Test a key revoked by one process is seen by another one."""
+        path = str(tmp_path / "shared")
+        worker_a = RevocationFilter(path=path, capacity=100)
+        worker_b = RevocationFilter(path=path, capacity=100)
+        assert worker_b.check("token:a") is RevocationStatus.valid
+
+        worker_a.revoke("token:a")
+
+        assert worker_b.check("token:a") is RevocationStatus.revoked
+        assert worker_b.check("token:b") is RevocationStatus.valid
+
+    def test_full_filter_reports_unknown(self, tmp_path):
+        """Test keys beyond capacity are reported as unknown, not valid."""
+        revocation_filter = RevocationFilter(path=str(tmp_path / "full"), capacity=1)
+        revocation_filter.revoke("token:a")
+
+        revocation_filter.revoke("token:b")
+
+        assert revocation_filter.check("token:a") is RevocationStatus.revoked
+        assert revocation_filter.check("token:b") is RevocationStatus.unknown
+
+    def test_rebuild_from_database(
+        self, tmp_path, create_verified_user, create_user_token
+    ):
+        """Test the filter is rebuilt from revoked UserToken rows."""
+        revoked_session = uuid4()
+        rotated_session = uuid4()
+        create_user_token(create_verified_user, digest="a" * 64, is_valid=False)
+        create_user_token(create_verified_user, digest="b" * 64)
+        create_user_token(
+            create_verified_user,
+            digest="c" * 64,
+            is_valid=False,
+            family=revoked_session,
+        )
+        create_user_token(
+            create_verified_user,
+            digest="d" * 64,
+            is_valid=False,
+            family=rotated_session,
+        )
+        create_user_token(create_verified_user, digest="e" * 64, family=rotated_session)
+        path = str(tmp_path / "rebuilt")
+        other_worker = RevocationFilter(path=path, capacity=100)
+        other_worker.check(token_key("a" * 64))
+
+        assert RevocationFilter(path=path, capacity=100).rebuild() == 2  # noqa: PLR2004
+
+        assert other_worker.check(token_key("a" * 64)) is RevocationStatus.revoked
+        assert other_worker.check(token_key("b" * 64)) is RevocationStatus.valid
+        assert (
+            other_worker.check(session_key(revoked_session)) is RevocationStatus.revoked
+        )
+        assert (
+            other_worker.check(session_key(rotated_session)) is RevocationStatus.valid
+        )
+
+    def test_logout_is_seen_by_other_workers(
+        self,
+        api_client,
+        create_verified_user,
+        settings,
+        django_assert_num_queries,
+    ):
+        """Test a stateless access token is rejected everywhere after logout."""
+        settings.JWT_STATELESS_ACCESS_TOKENS = True
+        response = api_client.post(
+            reverse("accounts:login"),
+            {"email": "test@test.com", "password": "test123"},
+            format="json",
+        )
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['data']['token']}"
+        )
+        api_client.get(reverse("accounts:mfa-methods"))
+        api_client.post(reverse("accounts:logout"))
+
+        # Another worker has nothing cached and rejects it without the database
+        token_cache.clear()
+        with django_assert_num_queries(0):
+            response = api_client.get(reverse("accounts:mfa-methods"))
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,124 @@
+"""Test module for batch token introspection."""
+
+from __future__ import annotations
+
+from time import time
+
+from django.conf import settings
+from django.urls import reverse
+from jwt import encode as jwt_encode
+from pytest import fixture
+from pytest import mark as pytest_mark
+from rest_framework import status
+
+from accounts.auth.token_introspection import introspect_tokens
+from accounts.models.custom_user import CustomUser
+
+
+def login(api_client, email):
+    """Log in and return the issued tokens."""
+    response = api_client.post(
+        reverse("accounts:login"),
+        {"email": email, "password": "test123"},
+        format="json",
+    )
+    return response.data["data"]
+
+
+@fixture
+def staff_client(api_client):
+    """Return a client authenticated as a staff service account."""
+    CustomUser.objects.create_user(
+        username="gateway",
+        email="gateway@test.com",
+        password="test123",
+        is_verified=True,
+        is_staff=True,
+    )
+    token = login(api_client, "gateway@test.com")["token"]
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api_client
+
+
+@pytest_mark.django_db
+class TestTokenIntrospection:
+    """Test class for the introspection endpoint."""
+
+    def test_batch_is_resolved_in_one_query(
+        self,
+        api_client,
+        create_verified_user,
+        django_assert_num_queries,
+    ):
+        """Test active, revoked, expired and forged tokens in one batch."""
+        active_token = login(api_client, "test@test.com")["token"]
+        revoked_token = login(api_client, "test@test.com")["token"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {revoked_token}")
+        api_client.post(reverse("accounts:logout"))
+        expired_token = jwt_encode(
+            {"user_id": create_verified_user.id, "exp": time() - 1},
+            settings.SECRET_KEY,
+        )
+
+        with django_assert_num_queries(1):
+            results = introspect_tokens(
+                [active_token, revoked_token, expired_token, "not-a-token"]
+            )
+
+        assert results[0]["active"]
+        assert results[0]["user_id"] == create_verified_user.id
+        assert results[0]["exp"] > time()
+        assert results[1:] == [{"active": False}] * 3
+
+    def test_stateless_sessions_use_the_revocation_filter(
+        self,
+        api_client,
+        create_verified_user,
+        settings,
+        django_assert_num_queries,
+    ):
+        """Test stateless access tokens need no query when the filter answers."""
+        settings.JWT_STATELESS_ACCESS_TOKENS = True
+        active_token = login(api_client, "test@test.com")["token"]
+        revoked_token = login(api_client, "test@test.com")["token"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {revoked_token}")
+        api_client.post(reverse("accounts:logout"))
+
+        with django_assert_num_queries(0):
+            results = introspect_tokens([active_token, revoked_token])
+
+        assert results[0]["active"]
+        assert results[0]["token_type"] == "access"
+        assert results[1] == {"active": False}
+
+    def test_endpoint_requires_staff(self, api_client, create_verified_user):
+        """Test regular users cannot introspect tokens."""
+        token = login(api_client, "test@test.com")["token"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.post(
+            reverse("accounts:token-introspect"),
+            {"tokens": [token]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_endpoint_returns_results_in_order(
+        self,
+        staff_client,
+        create_verified_user,
+        settings,
+    ):
+        """Test the endpoint answers every token of the batch."""
+        token = login(staff_client, "test@test.com")["token"]
+        settings.TOKEN_INTROSPECTION_MAX_BATCH = 2
+        url = reverse("accounts:token-introspect")
+
+        response = staff_client.post(url, {"tokens": ["x", token]}, format="json")
+        too_many = staff_client.post(url, {"tokens": ["x"] * 3}, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["data"]["results"]
+        assert [result["active"] for result in results] == [False, True]
+        assert too_many.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,165 @@
+"""Test module for the cached User-Agent parsing."""
+
+from __future__ import annotations
+
+from django.urls import reverse
+from pytest import fixture
+from pytest import mark as pytest_mark
+
+from accounts.models.device import Device
+from accounts.models.user_token import UserToken
+from accounts.utils.user_agent import UserAgentCache
+from accounts.utils.user_agent import device_resolver
+from accounts.utils.user_agent import parse_user_agent
+from accounts.utils.user_agent import token_device
+from accounts.utils.user_agent import user_agent_cache
+
+CHROME = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0"
+SAFARI = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1"
+)
+
+
+@fixture
+def parses(monkeypatch):
+    """Count the headers actually parsed."""
+    calls = []
+
+    def counting_parse(ua_string):
+        calls.append(ua_string)
+        return parse_user_agent(ua_string)
+
+    monkeypatch.setattr("accounts.utils.user_agent.parse_user_agent", counting_parse)
+    user_agent_cache.clear()
+    return calls
+
+
+def login(api_client, user_agent):
+    """Log in the verified user with the given User-Agent."""
+    return api_client.post(
+        reverse("accounts:login"),
+        {"email": "test@test.com", "password": "test123"},
+        format="json",
+        HTTP_USER_AGENT=user_agent,
+    )
+
+
+@pytest_mark.django_db
+class TestUserAgentCache:
+    """Test class for the User-Agent LRU cache."""
+
+    def test_repeated_header_is_parsed_once(
+        self,
+        api_client,
+        create_verified_user,
+        parses,
+    ):
+        """Test tokens issued to the same browser reuse the parsed header."""
+        login(api_client, CHROME)
+        login(api_client, CHROME)
+
+        assert parses == [CHROME]
+        token = UserToken.objects.first()
+        assert token.user_agent is None
+        assert token.device.user_agent == CHROME
+        assert token.device.device_browser == "Chrome120"
+        assert token.device.device_os == "Windows 10"
+
+    def test_least_recently_used_header_is_evicted(self, parses):
+        """Test the cache keeps at most max_size headers."""
+        cache = UserAgentCache(max_size=2)
+
+        cache.parse(CHROME)
+        cache.parse(FIREFOX)
+        cache.parse(CHROME)
+        cache.parse(SAFARI)
+        cache.parse(CHROME)
+        cache.parse(FIREFOX)
+
+        assert parses == [CHROME, FIREFOX, SAFARI, FIREFOX]
+        assert len(cache) == 2  # noqa: PLR2004
+
+    def test_warm_up_from_recent_tokens(self, api_client, create_verified_user):
+        """Test the cache is warmed with the headers of recent tokens."""
+        login(api_client, CHROME)
+        login(api_client, FIREFOX)
+        login(api_client, FIREFOX)
+        cache = UserAgentCache(max_size=10)
+
+        assert cache.warm_from_tokens() == 2  # noqa: PLR2004
+        assert cache.stats()["size"] == 2  # noqa: PLR2004
+
+    def test_warm_up_reads_only_the_newest_tokens(
+        self,
+        api_client,
+        create_verified_user,
+        django_assert_num_queries,
+    ):
+        """Test the warm-up is bounded by a number of tokens, not by time."""
+        login(api_client, CHROME)
+        login(api_client, FIREFOX)
+        cache = UserAgentCache(max_size=10)
+
+        with django_assert_num_queries(1) as captured:
+            assert cache.warm_from_tokens(tokens=1) == 1
+
+        assert 'ORDER BY "accounts_usertoken"."id" DESC' in captured[0]["sql"]
+
+    def test_lazy_parsing_stores_raw_header(
+        self,
+        api_client,
+        create_verified_user,
+        parses,
+        settings,
+    ):
+        """Test lazy mode parses only when the device is read."""
+        settings.USER_AGENT_PARSE_LAZY = True
+
+        login(api_client, SAFARI)
+
+        token = UserToken.objects.get()
+        assert token.device is None
+        assert parses == []
+        assert token.user_agent == SAFARI
+        assert token_device(token).device_type == "iPhone"
+        assert parses == [SAFARI]
+
+        token.refresh_from_db()
+        assert token.device.device_type == "iPhone"
+        assert token.user_agent is None
+
+
+@pytest_mark.django_db
+class TestDeviceResolver:
+    """Test class for the deduplicated device table."""
+
+    def test_tokens_share_one_device_row(
+        self,
+        api_client,
+        create_verified_user,
+        django_capture_on_commit_callbacks,
+        django_assert_num_queries,
+    ):
+        """Test a known device is resolved without a query."""
+        with django_capture_on_commit_callbacks(execute=True):
+            device_id = device_resolver.resolve(user_agent_cache.parse(CHROME))
+
+        with django_assert_num_queries(0):
+            assert device_resolver.resolve(user_agent_cache.parse(CHROME)) == device_id
+        login(api_client, CHROME)
+        login(api_client, CHROME)
+
+        assert Device.objects.count() == 1
+        assert set(UserToken.objects.values_list("device", flat=True)) == {device_id}
+
+    def test_uncommitted_device_is_not_cached(self, django_assert_num_queries):
+        """Test a device created in a transaction is cached only on commit."""
+        device_resolver.resolve(user_agent_cache.parse(FIREFOX))
+
+        with django_assert_num_queries(1):
+            device_resolver.resolve(user_agent_cache.parse(FIREFOX))
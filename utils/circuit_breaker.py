@@ -0,0 +1,116 @@
+"""Circuit breaker para dependencias externas.
+
+Tras ``failure_threshold`` fallos seguidos el circuito se abre y las llamadas
+fallan de inmediato durante ``reset_timeout`` segundos. Después pasa a
+semiabierto: una sola llamada de prueba decide si vuelve a cerrarse o se
+abre otra vez. El estado se publica en el gauge
+``circuit_breaker.<nombre>.state`` (0 cerrado, 1 semiabierto, 2 abierto).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from threading import Lock
+from time import monotonic
+
+from utils.metrics import metrics
+
+# Valor del gauge para cada estado
+STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto y la llamada no se intenta."""
+
+
+class CircuitBreaker:
+    """Circuit breaker thread-safe con estados cerrado, abierto y semiabierto."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """Inicializa el circuito cerrado."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._publish()
+
+    @property
+    def state(self) -> str:
+        """Estado actual, pasando a semiabierto si ya venció la espera."""
+        with self._lock:
+            self._expire()
+            return self._state
+
+    def before_call(self) -> None:
+        """Reserva una llamada.
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto o ya hay una prueba
+                en curso
+        """
+        with self._lock:
+            self._expire()
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+        metrics.increment(f"circuit_breaker.{self.name}.rejected")
+        raise CircuitOpenError(f"Circuit {self.name} is open")
+
+    def record_success(self) -> None:
+        """Registra una llamada correcta; cierra el circuito."""
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Registra un fallo; abre el circuito al llegar al umbral."""
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+                if self._state != self.OPEN:
+                    metrics.increment(f"circuit_breaker.{self.name}.opened")
+                self._transition(self.OPEN)
+
+    def _expire(self) -> None:
+        """Pasa de abierto a semiabierto cuando vence ``reset_timeout``."""
+        if (
+            self._state == self.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(self.HALF_OPEN)
+
+    def _transition(self, state: str) -> None:
+        """Cambia de estado y lo publica."""
+        self._state = state
+        self._publish()
+
+    def _publish(self) -> None:
+        """Publica el estado en las métricas."""
+        metrics.set_gauge(
+            f"circuit_breaker.{self.name}.state",
+            STATE_VALUES[self._state],
+        )
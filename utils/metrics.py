@@ -0,0 +1,63 @@
+"""Métricas en memoria del proceso.
+
+Cada worker mantiene sus propios contadores, gauges y resúmenes; el endpoint
+``/api/metrics/`` expone la instantánea del worker que atiende la petición.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import Any
+
+
+class Metrics:
+    """Registro thread-safe de contadores, gauges y resúmenes de observaciones."""
+
+    def __init__(self) -> None:
+        """Inicializa el registro vacío."""
+        self._lock = Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Incrementa un contador."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Fija el valor actual de un gauge."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Registra una observación (latencias, tamaños) en un resumen."""
+        with self._lock:
+            summary = self._summaries.setdefault(
+                name,
+                {"count": 0, "sum": 0.0, "max": 0.0},
+            )
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna una copia de todas las métricas."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: dict(summary) for name, summary in self._summaries.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Limpia todas las métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()